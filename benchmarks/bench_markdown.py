@@ -0,0 +1,197 @@
+"""
+Markdown → Notion 블록 변환 벤치마크
+- 기존 방식(markdown → HTML → BeautifulSoup)과 markdown_converter의 직접 변환 방식을 비교
+- 실행: python benchmarks/bench_markdown.py [반복 횟수]
+- 기존 방식 비교에는 markdown, beautifulsoup4 패키지가 필요
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from markdown_converter import convert_markdown_to_notion_blocks
+
+FIXTURE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "baekjoon_readme.md")
+
+
+# 기존 변환 함수 (markdown → HTML → BeautifulSoup)
+def legacy_convert_markdown_to_notion_blocks(markdown_text):
+    """Markdown과 HTML을 Notion 블록 형식으로 변환"""
+    import markdown
+    from bs4 import BeautifulSoup
+
+    # ✅ Markdown을 HTML로 변환
+    html_text = markdown.markdown(markdown_text)
+
+    # ✅ BeautifulSoup으로 HTML 파싱
+    soup = BeautifulSoup(html_text, "html.parser")
+    notion_blocks = []
+
+    for element in soup.children:  # ✅ 모든 최상위 요소만 순회 (중복 방지)
+        if element.name == "h1":  # 제목 (h1)
+            notion_blocks.append({
+                "object": "block",
+                "type": "heading_1",
+                "heading_1": {
+                    "rich_text": [{"text": {"content": element.get_text()}}]
+                }
+            })
+        elif element.name == "h2":  # 제목 (h2)
+            notion_blocks.append({
+                "object": "block",
+                "type": "heading_2",
+                "heading_2": {
+                    "rich_text": [{"text": {"content": element.get_text()}}]
+                }
+            })
+        elif element.name == "h3":  # 제목 (h3)
+            notion_blocks.append({
+                "object": "block",
+                "type": "heading_3",
+                "heading_3": {
+                    "rich_text": [{"text": {"content": element.get_text()}}]
+                }
+            })
+        elif element.name == "p":  # ✅ `<p>` 내부에 `img` 태그가 있는 경우도 포함
+            img_tags = element.find_all("img")
+            text_content = element.get_text(strip=True)
+
+            if img_tags:  # ✅ `<p>` 안에 `img` 태그가 있을 경우
+                if text_content:  # ✅ `<p>` 안에 텍스트가 있는 경우 먼저 텍스트 추가
+                    notion_blocks.append({
+                        "object": "block",
+                        "type": "paragraph",
+                        "paragraph": {
+                            "rich_text": [{"text": {"content": text_content}}]
+                        }
+                    })
+                for img in img_tags:
+                    img_src = img.get("src")
+                    img_alt = img.get("alt", "이미지")  # 대체 텍스트 기본값 설정
+
+                    if img_src.startswith("http"):  # Notion은 URL 이미지만 지원
+                        notion_blocks.append({
+                            "object": "block",
+                            "type": "image",
+                            "image": {
+                                "type": "external",
+                                "external": {"url": img_src}
+                            }
+                        })
+                        if img_alt:
+                            notion_blocks.append({
+                                "object": "block",
+                                "type": "paragraph",
+                                "paragraph": {
+                                    "rich_text": [{"text": {"content": img_alt}}]
+                                }
+                            })
+            else:  # ✅ 일반 단락 처리
+                if text_content:
+                    notion_blocks.append({
+                        "object": "block",
+                        "type": "paragraph",
+                        "paragraph": {
+                            "rich_text": [{"text": {"content": text_content}}]
+                        }
+                    })
+        elif element.name == "ul":  # 불릿 리스트
+            for li in element.find_all("li"):
+                notion_blocks.append({
+                    "object": "block",
+                    "type": "bulleted_list_item",
+                    "bulleted_list_item": {
+                        "rich_text": [{"text": {"content": li.get_text()}}]
+                    }
+                })
+        elif element.name == "ol":  # 번호 매긴 리스트
+            for idx, li in enumerate(element.find_all("li"), start=1):
+                notion_blocks.append({
+                    "object": "block",
+                    "type": "numbered_list_item",
+                    "numbered_list_item": {
+                        "rich_text": [{"text": {"content": f"{idx}. {li.get_text()}"}}]
+                    }
+                })
+        elif element.name == "table":  # 테이블 변환 (Notion API에서 테이블 지원 안 함 → 리스트 형태로 변환)
+            rows = element.find_all("tr")
+            for row in rows:
+                cols = row.find_all("td")
+                row_text = " | ".join([col.get_text() for col in cols])
+                notion_blocks.append({
+                    "object": "block",
+                    "type": "paragraph",
+                    "paragraph": {
+                        "rich_text": [{"text": {"content": row_text}}]
+                    }
+                })
+        elif element.name == "code":  # 코드 블록
+            code_content = element.get_text()
+            notion_blocks.append({
+                "object": "block",
+                "type": "code",
+                "code": {
+                    "rich_text": [{"text": {"content": code_content}}],
+                    "language": "java"  # 언어 감지 추가 가능
+                }
+            })
+        elif element.name == "img":  # ✅ 단독 이미지 변환
+            img_src = element.get("src")
+            img_alt = element.get("alt", "이미지")  # 대체 텍스트 기본값 설정
+
+            if img_src.startswith("http"):  # Notion은 URL 이미지만 지원
+                notion_blocks.append({
+                    "object": "block",
+                    "type": "image",
+                    "image": {
+                        "type": "external",
+                        "external": {"url": img_src}
+                    }
+                })
+                if img_alt:
+                    notion_blocks.append({
+                        "object": "block",
+                        "type": "paragraph",
+                        "paragraph": {
+                            "rich_text": [{"text": {"content": img_alt}}]
+                        }
+                    })
+        elif element.name is None:  # ✅ 일반 텍스트 처리
+            text = element.strip()
+            if text:
+                notion_blocks.append({
+                    "object": "block",
+                    "type": "paragraph",
+                    "paragraph": {
+                        "rich_text": [{"text": {"content": text}}]
+                    }
+                })
+
+    return notion_blocks
+
+
+def measure(func, text, number):
+    """func(text)를 number번 실행했을 때 한 번당 평균 시간(ms)"""
+    return timeit.timeit(lambda: func(text), number=number) / number * 1000
+
+
+def main(number=200):
+    with open(FIXTURE_PATH, "r", encoding="utf-8") as f:
+        text = f.read()
+
+    results = {"markdown_converter": measure(convert_markdown_to_notion_blocks, text, number)}
+    try:
+        results["markdown + BeautifulSoup"] = measure(legacy_convert_markdown_to_notion_blocks, text, number)
+    except ImportError as e:
+        print(f"⚠️ 기존 방식은 측정하지 않습니다 ({e})")
+
+    print(f"📊 README {len(text)}자, {number}회 반복")
+    for name, elapsed in results.items():
+        print(f"  - {name}: {elapsed:.3f} ms/회")
+    if len(results) == 2:
+        print(f"  - 속도 향상: {results['markdown + BeautifulSoup'] / results['markdown_converter']:.1f}배")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
@@ -0,0 +1,144 @@
+"""
+전체 동기화(main.main) 벤치마크
+- benchmarks/mock_server.py의 GitHub / Notion 대역 서버를 띄우고, 합성 문제 N개를 처음부터 동기화
+- 문제 수마다 별도 프로세스에서 실행하여 최대 메모리(RSS)를 따로 측정
+- 출력: 총 소요 시간, API 요청 수(엔드포인트별), 주입된 429 수, 최대 RSS, 단계별 누적 시간
+- 실행: python benchmarks/bench_sync.py [--sizes 100 1000 10000] [--latency-ms 20] [--error-rate 0.01] [--json]
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+SRC_DIR = os.path.join(BENCH_DIR, "..", "src")
+sys.path.insert(0, BENCH_DIR)
+
+from mock_server import MockApi, SyntheticRepo, start_server
+
+
+def run_child(update):
+    """
+    (하위 프로세스) 환경 변수로 대역 서버를 가리키도록 설정된 상태에서 main.main()을 한 번 실행
+    - 단계별 시간은 main이 수집한 지표(metrics)의 단계별 누적 시간을 그대로 사용
+    """
+    sys.path.insert(0, SRC_DIR)
+    import main
+    from metrics import metrics
+
+    main.configure_logging()
+    started_at = time.perf_counter()
+    main.main(update=update)
+    wall_seconds = time.perf_counter() - started_at
+
+    report = metrics.report()
+    print(json.dumps({
+        "wall_seconds": wall_seconds,
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "stage_seconds": {name: stage["seconds"] for name, stage in report["stages"].items()},
+        "stage_calls": {name: stage["calls"] for name, stage in report["stages"].items()},
+        "client_counters": report["counters"],
+    }))
+
+
+def run_size(problems, args):
+    """
+    대역 서버를 띄우고 하위 프로세스에서 동기화를 args.runs번 실행한 뒤 실행별 결과 목록 반환
+    - 같은 작업 디렉터리(캐시, 동기화 상태)와 같은 Notion 상태를 이어서 사용 (두 번째 실행부터는 변경 없는 실행)
+    """
+    api = MockApi(
+        SyntheticRepo(problems, tree_scope=args.tree_scope, extra_files=args.extra_files),
+        latency_ms=args.latency_ms,
+        error_rate=args.error_rate,
+        applied_error_rate=args.applied_error_rate,
+        github_page_size=args.github_page_size,
+    )
+    server = start_server(api)
+    try:
+        with tempfile.TemporaryDirectory() as workdir:
+            env = {
+                **os.environ,
+                "GITHUB_API_URL": f"{api.base_url}/github",
+                "NOTION_API_URL": f"{api.base_url}/notion/v1",
+                "GITHUB_TOKEN": "bench", "GITHUB_OWNER": "bench", "GITHUB_REPO": "algorithm",
+                "NOTION_API_KEY": "bench", "NOTION_DATABASE_ID": "bench-database",
+                "SOURCE_BACKEND": args.source_backend,
+                "CONTENT_BACKEND": args.content_backend,
+                "GITHUB_GRAPHQL_URL": f"{api.base_url}/github/graphql",
+                "SYNC_STATE_PATH": os.path.join(workdir, "sync_state.json"),
+                "TITLE_INDEX_PATH": os.path.join(workdir, "title_index.json"),
+                "BLOB_CACHE_PATH": os.path.join(workdir, "blobs.sqlite3"),
+                "BLOCK_CACHE_PATH": os.path.join(workdir, "blocks.sqlite3"),
+                "NOTION_REQUESTS_PER_SECOND": str(args.notion_rps),
+                "NOTION_BURST": str(max(int(args.notion_rps), 1)),
+                "HTTP_BACKOFF_BASE": "0.01",
+                "LOG_LEVEL": "WARNING",
+                "METRICS_REPORT_PATH": "",
+            }
+            command = [sys.executable, os.path.abspath(__file__), "--child"] + (["--update"] if args.update else [])
+            reports = []
+            for run in range(1, args.runs + 1):
+                api.reset_stats()
+                result = subprocess.run(command, env=env, cwd=workdir, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+                if result.returncode != 0:
+                    raise RuntimeError(f"동기화 실행 실패 (문제 {problems}개):\n{result.stderr}")
+                report = json.loads(result.stdout.strip().splitlines()[-1])
+                report.update({"problems": problems, "run": run, "server": api.stats()})
+                reports.append(report)
+    finally:
+        server.shutdown()
+        server.server_close()
+    return reports
+
+
+def print_report(report):
+    server = report["server"]
+    print(
+        f"\n📊 문제 {report['problems']}개 (실행 {report['run']}): {report['wall_seconds']:.2f}초, 요청 {server['requests']}회 "
+        f"(429 주입 {server['injected_429']}회, 반영 후 502 주입 {server['injected_502']}회, 304 {server['not_modified']}회), "
+        f"최대 RSS {report['peak_rss_mb']:.1f}MB, 생성된 페이지 {server['notion_pages']}개 (블록 {server['notion_blocks']}개)"
+        + (f", GraphQL 비용 {server['graphql_cost']}점" if server["graphql_cost"] else "")
+    )
+    for stage, seconds in sorted(report["stage_seconds"].items(), key=lambda item: -item[1]):
+        print(f"   ⏱️ {stage:<22} {seconds:8.2f}초 ({report['stage_calls'][stage]}회)")
+    for endpoint, count in sorted(server["by_endpoint"].items(), key=lambda item: -item[1]):
+        print(f"   🌐 {count:7d}  {endpoint}")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="GitHub / Notion 대역 서버를 사용한 전체 동기화 벤치마크")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000], help="합성 문제 수 목록")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="대역 서버의 요청당 지연(ms)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="429 응답을 주입할 확률 (0~1)")
+    parser.add_argument("--applied-error-rate", type=float, default=0.0, help="Notion 쓰기 요청을 반영한 뒤 502로 응답할 확률 (0~1)")
+    parser.add_argument("--github-page-size", type=int, default=100, help="커밋 목록 한 페이지의 최대 크기")
+    parser.add_argument("--tree-scope", choices=["full", "commit"], default="commit", help="트리 응답에 포함할 파일 범위")
+    parser.add_argument("--extra-files", type=int, default=0, help="커밋마다 함께 바뀌는 업로드 대상이 아닌 파일 수")
+    parser.add_argument("--source-backend", choices=["github", "graphql"], default="github", help="커밋/파일 조회 백엔드")
+    parser.add_argument("--content-backend", choices=["tree", "tarball"], default="tree", help="파일 내용 조회 방식 (REST 백엔드)")
+    parser.add_argument("--notion-rps", type=float, default=1000.0, help="Notion 초당 요청 수 제한 (실제 API는 3)")
+    parser.add_argument("--runs", type=int, default=1, help="문제 수마다 이어서 실행할 횟수 (2 이상이면 변경 없는 실행도 측정)")
+    parser.add_argument("--update", action="store_true", help="--update 모드로 실행")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.child:
+        run_child(args.update)
+        sys.exit(0)
+
+    reports = []
+    for size in args.sizes:
+        for report in run_size(size, args):
+            reports.append(report)
+            if not args.json:
+                print_report(report)
+    if args.json:
+        print(json.dumps(reports, ensure_ascii=False, indent=2))
@@ -0,0 +1,609 @@
+"""
+GitHub / Notion API 대역(stand-in) 서버
+- 합성 저장소(문제 N개)의 커밋/트리/blob 응답과 Notion 데이터베이스/페이지/블록 응답을 흉내 냄
+- 응답 형식은 기록해 둔 실제 응답(fixtures)과 같은 모양으로 생성
+- 요청 지연, 페이지 크기, 429 응답 주입을 설정할 수 있고, 요청 수는 GET /_stats 로 조회
+- 실행: python benchmarks/mock_server.py --problems 1000 --port 8765 [--latency-ms 20 --error-rate 0.01]
+"""
+import argparse
+import base64
+import hashlib
+import io
+import json
+import os
+import random
+import re
+import tarfile
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlencode, urlparse, unquote
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+# ✅ Notion API 제한 (요청이 제한을 넘으면 실제 API처럼 400 validation_error)
+NOTION_MAX_CHILDREN = 100
+NOTION_MAX_TEXT_LENGTH = 2000
+NOTION_MAX_RICH_TEXT = 100
+NOTION_MAX_PAYLOAD_BYTES = 500 * 1000
+
+TIERS = ["Bronze V", "Silver III", "Gold IV", "Platinum II"]
+JAVA_TEMPLATE = """import java.io.*;
+import java.util.*;
+
+public class Main {{
+    // 문제 {index}
+    public static void main(String[] args) throws IOException {{
+        BufferedReader br = new BufferedReader(new InputStreamReader(System.in));
+        int n = Integer.parseInt(br.readLine().trim());
+        long answer = 0;
+        for (int i = 0; i < n; i++) {{
+            answer += (long) i * {index} % 1000000007;
+        }}
+        System.out.println(answer);
+    }}
+}}
+"""
+
+
+def _sha(text):
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def _blob_sha(content):
+    """git과 같은 blob SHA (tarball로 받은 파일의 SHA를 클라이언트가 직접 계산해도 트리의 SHA와 일치)"""
+    data = content.encode("utf-8")
+    return hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
+
+
+class SyntheticRepo:
+    """
+    문제 N개짜리 합성 알고리즘 풀이 저장소
+    - 커밋 i(오래된 순)는 문제 i의 README.md와 풀이 .java를 추가
+    - tree_scope="full"이면 트리에 커밋 시점의 전체 파일, "commit"이면 해당 커밋 파일만 포함
+    - extra_files: 커밋마다 함께 바뀌는 업로드 대상이 아닌 파일 수 (최상단 README.md, 문제 폴더의 이미지)
+    """
+
+    def __init__(self, problems, tree_scope="full", extra_files=0):
+        with open(os.path.join(FIXTURES_DIR, "baekjoon_readme.md"), "r", encoding="utf-8") as f:
+            readme_template = f.read()
+
+        self.tree_scope = tree_scope
+        self.commits = []  # 오래된 순
+        self.blobs = {}
+        self.tree_entries = []
+        self.path_entries = {}  # 경로 → [(트리 항목 위치, blob SHA)] (오래된 순)
+        self.commit_index = {}
+        started_at = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+        for index in range(problems):
+            tier = TIERS[index % len(TIERS)]
+            problem_id = 1000 + index
+            folder = f"백준/{tier.split()[0]}/{problem_id}. 문제{index}"
+            readme = readme_template.replace("[Gold IV] 최단경로 - 1753", f"[{tier}] 문제{index} - {problem_id}")
+            readme = readme.replace("problem/1753", f"problem/{problem_id}")
+            files = {f"{folder}/README.md": readme, f"{folder}/문제{index}.java": JAVA_TEMPLATE.format(index=index)}
+            for extra in range(extra_files):
+                path = "README.md" if extra == 0 else f"{folder}/figure{extra}.png"
+                files[path] = f"extra file {extra} of problem {index}\n"
+
+            for path, content in files.items():
+                blob_sha = _blob_sha(content)
+                self.blobs[blob_sha] = content
+                self.path_entries.setdefault(path, []).append((len(self.tree_entries), blob_sha))
+                self.tree_entries.append({"path": path, "mode": "100644", "type": "blob", "sha": blob_sha})
+
+            commit_sha = _sha(f"commit-{index}")
+            date = (started_at + timedelta(minutes=10 * index)).strftime("%Y-%m-%dT%H:%M:%SZ")
+            self.commit_index[commit_sha] = index
+            self.commits.append({
+                "sha": commit_sha,
+                "date": date,
+                "message": f"[{tier}] Title: 문제{index}, Time: 100 ms, Memory: 14000 KB -BaekjoonHub",
+                "files": list(files),
+                "tree_end": len(self.tree_entries),
+                "tree_start": len(self.tree_entries) - len(files),
+            })
+
+    def commit_json(self, commit):
+        return {
+            "sha": commit["sha"],
+            "commit": {
+                "message": commit["message"],
+                "author": {"name": "bench", "date": commit["date"]},
+                "committer": {"name": "bench", "date": commit["date"]},
+            },
+        }
+
+    def tree(self, commit_sha):
+        commit = self.commits[self.commit_index[commit_sha]]
+        start = 0 if self.tree_scope == "full" else commit["tree_start"]
+        return self.tree_entries[start:commit["tree_end"]]
+
+    def blob_at(self, path, ref):
+        """ref(커밋 SHA, 그 외는 최신 커밋) 시점의 파일 blob SHA (없으면 None)"""
+        index = self.commit_index.get(ref, len(self.commits) - 1)
+        tree_end = self.commits[index]["tree_end"]
+        blob_sha = None
+        for position, sha in self.path_entries.get(path, []):
+            if position >= tree_end:
+                break
+            blob_sha = sha
+        return blob_sha
+
+    def file_at(self, path, ref):
+        blob_sha = self.blob_at(path, ref)
+        return self.blobs[blob_sha] if blob_sha else None
+
+    def archive(self, ref):
+        """ref 시점의 전체 파일을 GitHub tarball과 같은 모양("{owner}-{repo}-{sha}/" 아래)으로 압축한 bytes"""
+        index = self.commit_index.get(ref, len(self.commits) - 1)
+        files = {}
+        for entry in self.tree_entries[:self.commits[index]["tree_end"]]:
+            files[entry["path"]] = self.blobs[entry["sha"]]
+
+        prefix = f"bench-algorithm-{self.commits[index]['sha'][:7]}"
+        buffer = io.BytesIO()
+        with tarfile.open(fileobj=buffer, mode="w:gz") as archive:
+            for path, content in files.items():
+                data = content.encode("utf-8")
+                info = tarfile.TarInfo(f"{prefix}/{path}")
+                info.size = len(data)
+                archive.addfile(info, io.BytesIO(data))
+        return buffer.getvalue()
+
+
+class NotionState:
+    """Notion 데이터베이스/페이지/블록 상태 (메모리)"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.options = {"난이도": [{"name": "Unknown"}], "사이트": []}
+        self.pages = {}  # id → 페이지
+        self.blocks = {}  # id → 블록 (children 키는 자식 ID 목록)
+        self.clock = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+    def now(self):
+        self.clock += timedelta(seconds=1)
+        return self.clock.strftime("%Y-%m-%dT%H:%M:%S.000Z")
+
+    def add_blocks(self, parent_id, blocks, after=None):
+        """블록(자식 포함)을 저장하고 parent의 자식 목록에 삽입한 뒤 저장된 블록 목록 반환"""
+        created = []
+        for block in blocks:
+            block = json.loads(json.dumps(block))
+            block_id = str(uuid.uuid4())
+            data = block.get(block["type"], {})
+            children = data.pop("children", [])
+            block.update({"object": "block", "id": block_id, "has_children": bool(children), "children": []})
+            self.blocks[block_id] = block
+            self.add_blocks(block_id, children)
+            created.append(block)
+
+        siblings = self.blocks[parent_id]["children"] if parent_id in self.blocks else self.pages[parent_id]["children"]
+        position = siblings.index(after) + 1 if after in siblings else len(siblings)
+        siblings[position:position] = [block["id"] for block in created]
+        if parent_id in self.blocks:
+            self.blocks[parent_id]["has_children"] = True
+        return created
+
+    def block_json(self, block_id):
+        block = self.blocks[block_id]
+        return {key: value for key, value in block.items() if key != "children"}
+
+
+def validate_blocks(blocks, depth=1):
+    """Notion API의 블록 제한 검사 (위반 시 오류 메시지 반환)"""
+    if len(blocks) > NOTION_MAX_CHILDREN:
+        return f"body.children.length should be ≤ {NOTION_MAX_CHILDREN}, instead was {len(blocks)}"
+    for block in blocks:
+        data = block.get(block.get("type"), {})
+        rich_texts = [data.get("rich_text", [])] + data.get("cells", [])
+        for rich_text in rich_texts:
+            if len(rich_text) > NOTION_MAX_RICH_TEXT:
+                return f"rich_text.length should be ≤ {NOTION_MAX_RICH_TEXT}"
+            for segment in rich_text:
+                if len(segment.get("text", {}).get("content", "")) > NOTION_MAX_TEXT_LENGTH:
+                    return f"text.content.length should be ≤ {NOTION_MAX_TEXT_LENGTH}"
+        children = data.get("children", [])
+        if children:
+            if depth >= 2:
+                return "children nesting exceeds 2 levels"
+            error = validate_blocks(children, depth + 1)
+            if error:
+                return error
+    return None
+
+
+class MockApi:
+    """요청 경로를 GitHub / Notion 응답으로 연결하고 요청 수를 집계"""
+
+    def __init__(self, repo, latency_ms=0.0, error_rate=0.0, github_page_size=100, notion_page_size=100, seed=0,
+                 applied_error_rate=0.0):
+        self.repo = repo
+        self.notion = NotionState()
+        self.latency = latency_ms / 1000
+        self.error_rate = error_rate
+        self.applied_error_rate = applied_error_rate
+        self.github_page_size = github_page_size
+        self.notion_page_size = notion_page_size
+        self.random = random.Random(seed)
+        self.counts = Counter()
+        self.injected_429 = Counter()
+        self.injected_502 = Counter()
+        self.bytes_sent = 0
+        self.not_modified = 0
+        self.graphql_cost = 0
+        self.lock = threading.Lock()
+        self.routes = [
+            ("GET", r"/github/repos/[^/]+/[^/]+/commits", self.github_commits),
+            ("GET", r"/github/repos/[^/]+/[^/]+/commits/(?P<sha>\w+)", self.github_commit),
+            ("GET", r"/github/repos/[^/]+/[^/]+/git/trees/(?P<sha>\w+)", self.github_tree),
+            ("GET", r"/github/repos/[^/]+/[^/]+/git/blobs/(?P<sha>\w+)", self.github_blob),
+            ("GET", r"/github/repos/[^/]+/[^/]+/contents/(?P<path>.+)", self.github_contents),
+            ("GET", r"/github/repos/[^/]+/[^/]+/tarball/(?P<ref>[^/]+)", self.github_tarball),
+            ("POST", r"/github/graphql", self.github_graphql),
+            ("POST", r"/notion/v1/databases/[^/]+/query", self.notion_query),
+            ("GET", r"/notion/v1/databases/[^/]+", self.notion_database),
+            ("PATCH", r"/notion/v1/databases/[^/]+", self.notion_update_database),
+            ("POST", r"/notion/v1/pages", self.notion_create_page),
+            ("PATCH", r"/notion/v1/pages/(?P<page_id>[^/]+)", self.notion_update_page),
+            ("GET", r"/notion/v1/blocks/(?P<block_id>[^/]+)/children", self.notion_children),
+            ("PATCH", r"/notion/v1/blocks/(?P<block_id>[^/]+)/children", self.notion_append),
+            ("PATCH", r"/notion/v1/blocks/(?P<block_id>[^/]+)", self.notion_update_block),
+            ("DELETE", r"/notion/v1/blocks/(?P<block_id>[^/]+)", self.notion_delete_block),
+        ]
+
+    def seed_notion(self, count):
+        """앞쪽 문제 count개를 이미 Notion에 있는 페이지로 등록 (증분 동기화 시나리오)"""
+        for index in range(count):
+            page_id = str(uuid.uuid4())
+            self.notion.pages[page_id] = {
+                "object": "page", "id": page_id, "archived": False, "last_edited_time": self.notion.now(),
+                "properties": {"문제 제목": {"id": "title", "title": [{"plain_text": f"{1000 + index}. 문제{index}"}]}},
+                "children": [],
+            }
+
+    # ✅ 요청 처리 (지연 → 429 주입 → 경로 처리)
+    def handle(self, method, raw_path, body):
+        parsed = urlparse(raw_path)
+        path = unquote(parsed.path)
+        query = {key: values[-1] for key, values in parse_qs(parsed.query).items()}
+        query["_multi"] = parse_qs(parsed.query)
+
+        for route_method, pattern, handler in self.routes:
+            match = re.fullmatch(pattern, path)
+            if route_method == method and match:
+                break
+        else:
+            return 404, {}, {"message": f"no route for {method} {path}"}
+
+        endpoint = f"{method} " + re.sub(r"\(\?P<(\w+)>[^)]*\)", r"{\1}", pattern).replace("[^/]+", "*")
+        with self.lock:
+            self.counts[endpoint] += 1
+            inject = self.error_rate and self.random.random() < self.error_rate
+            if inject:
+                self.injected_429[endpoint] += 1
+        if self.latency:
+            time.sleep(self.latency)
+        if inject:
+            return 429, {"Retry-After": "0"}, {"code": "rate_limited", "message": "injected 429"}
+
+        payload = json.loads(body) if body else {}
+        with self.notion.lock:
+            status, headers, result = handler(query=query, payload=payload, **match.groupdict())
+
+        # ✅ Notion 쓰기 요청을 반영한 뒤 502로 응답 (클라이언트가 같은 요청을 다시 보내면 중복 생성/추가)
+        if method != "GET" and path.startswith("/notion/") and status == 200 and not path.endswith("/query"):
+            with self.lock:
+                fail = self.applied_error_rate and self.random.random() < self.applied_error_rate
+                if fail:
+                    self.injected_502[endpoint] += 1
+            if fail:
+                return 502, {}, {"object": "error", "code": "bad_gateway", "message": "injected 502 after apply"}
+        return status, headers, result
+
+    # ---- GitHub ----
+    def github_commits(self, query, payload):
+        commits = self.repo.commits[::-1]
+        if query.get("since"):
+            commits = [commit for commit in commits if commit["date"] >= query["since"]]
+        per_page = min(int(query.get("per_page", 30)), self.github_page_size)
+        page = int(query.get("page", 1))
+        chunk = commits[(page - 1) * per_page:page * per_page]
+        headers = {}
+        if page * per_page < len(commits):
+            next_query = {key: value for key, value in query.items() if not key.startswith("_")}
+            next_query.update({"per_page": per_page, "page": page + 1})
+            headers["Link"] = f'<{self.base_url}/github/repos/o/r/commits?{urlencode(next_query)}>; rel="next"'
+        return 200, headers, [self.repo.commit_json(commit) for commit in chunk]
+
+    def github_commit(self, query, payload, sha):
+        if sha not in self.repo.commit_index:
+            return 404, {}, {"message": "Not Found"}
+        commit = self.repo.commits[self.repo.commit_index[sha]]
+        body = self.repo.commit_json(commit)
+        body["files"] = [{"filename": path, "status": "added"} for path in commit["files"]]
+        return 200, {}, body
+
+    def github_tree(self, query, payload, sha):
+        if sha not in self.repo.commit_index:
+            return 404, {}, {"message": "Not Found"}
+        return 200, {}, {"sha": sha, "tree": self.repo.tree(sha), "truncated": False}
+
+    def github_blob(self, query, payload, sha):
+        content = self.repo.blobs.get(sha)
+        if content is None:
+            return 404, {}, {"message": "Not Found"}
+        return 200, {}, {"sha": sha, "encoding": "base64", "content": base64.b64encode(content.encode("utf-8")).decode("ascii")}
+
+    def github_contents(self, query, payload, path):
+        content = self.repo.file_at(path, query.get("ref"))
+        if content is None:
+            return 404, {}, {"message": "Not Found"}
+        return 200, {}, {"path": path, "encoding": "base64", "content": base64.b64encode(content.encode("utf-8")).decode("ascii")}
+
+    def github_tarball(self, query, payload, ref):
+        """저장소 압축 파일 (본문이 JSON이 아닌 bytes)"""
+        return 200, {}, self.repo.archive(ref)
+
+    def github_graphql(self, query, payload):
+        """
+        GraphQL 백엔드가 보내는 두 종류의 쿼리만 해석하여 실제 API와 같은 모양으로 응답
+        - history(first, since, after): 커밋 기록 한 페이지 (커서는 위치)
+        - 별칭 object(expression: "<커밋>:<경로>" | oid: blob SHA) 필드: Blob oid/text
+        - 모든 응답에 rateLimit(쿼리당 비용 1) 포함
+        """
+        text = payload.get("query", "")
+        variables = payload.get("variables") or {}
+        with self.lock:
+            self.graphql_cost += 1
+            rate_limit = {"cost": 1, "remaining": max(5000 - self.graphql_cost, 0), "resetAt": "2099-01-01T00:00:00Z"}
+
+        if "history(" in text:
+            commits = self.repo.commits[::-1]
+            if variables.get("since"):
+                commits = [commit for commit in commits if commit["date"] >= variables["since"]]
+            start = int(variables.get("after") or 0)
+            first = min(int(variables.get("first", 100)), 100, self.github_page_size)
+            chunk = commits[start:start + first]
+            has_next = start + first < len(commits)
+            history = {
+                "pageInfo": {"hasNextPage": has_next, "endCursor": str(start + first) if has_next else None},
+                "nodes": [{"oid": c["sha"], "committedDate": c["date"], "message": c["message"]} for c in chunk],
+            }
+            return 200, {}, {"data": {"repository": {"object": {"history": history}}, "rateLimit": rate_limit}}
+
+        repository = {}
+        for alias, kind, variable in re.findall(r"(\w+): object\((expression|oid): \$(\w+)\)", text):
+            value = variables[variable]
+            if kind == "oid":
+                blob_sha = value if value in self.repo.blobs else None
+            else:
+                ref, _, path = value.partition(":")
+                blob_sha = self.repo.blob_at(path, ref)
+            repository[alias] = None if blob_sha is None else {
+                "oid": blob_sha, "text": self.repo.blobs[blob_sha], "isBinary": False, "isTruncated": False,
+            }
+        return 200, {}, {"data": {"repository": repository, "rateLimit": rate_limit}}
+
+    # ---- Notion ----
+    def notion_query(self, query, payload):
+        pages = sorted(self.notion.pages.values(), key=lambda page: page["last_edited_time"])
+        edited_after = payload.get("filter", {}).get("last_edited_time", {}).get("on_or_after")
+        if edited_after:
+            pages = [page for page in pages if page["last_edited_time"] >= edited_after]
+        start = int(payload.get("start_cursor") or 0)
+        size = min(payload.get("page_size", 100), self.notion_page_size)
+        chunk = pages[start:start + size]
+        has_more = start + size < len(pages)
+        return 200, {}, {
+            "object": "list",
+            "results": [{key: value for key, value in page.items() if key != "children"} for page in chunk],
+            "has_more": has_more,
+            "next_cursor": str(start + size) if has_more else None,
+        }
+
+    def notion_database(self, query, payload):
+        return 200, {}, {"object": "database", "properties": {
+            name: {"type": "select", "select": {"options": options}} for name, options in self.notion.options.items()
+        }}
+
+    def notion_update_database(self, query, payload):
+        for name, prop in payload.get("properties", {}).items():
+            self.notion.options[name] = prop["select"]["options"]
+        return self.notion_database(query, payload)
+
+    def notion_create_page(self, query, payload):
+        size = len(json.dumps(payload, ensure_ascii=False).encode("utf-8"))
+        error = validate_blocks(payload.get("children", [])) or (size > NOTION_MAX_PAYLOAD_BYTES and "payload too large")
+        if error:
+            return 400, {}, {"object": "error", "code": "validation_error", "message": error}
+
+        page_id = str(uuid.uuid4())
+        title = payload["properties"]["문제 제목"]["title"]
+        self.notion.pages[page_id] = {
+            "object": "page", "id": page_id, "archived": False, "last_edited_time": self.notion.now(),
+            "properties": {**payload["properties"], "문제 제목": {"id": "title", "title": [
+                {"plain_text": part["text"]["content"], **part} for part in title
+            ]}},
+            "children": [],
+        }
+        self.notion.add_blocks(page_id, payload.get("children", []))
+        return 200, {}, {"object": "page", "id": page_id}
+
+    def notion_update_page(self, query, payload, page_id):
+        if page_id not in self.notion.pages:
+            return 404, {}, {"object": "error", "code": "object_not_found"}
+        self.notion.pages[page_id]["last_edited_time"] = self.notion.now()
+        self.notion.pages[page_id]["properties"].update(payload.get("properties", {}))
+        return 200, {}, {"object": "page", "id": page_id}
+
+    def notion_children(self, query, payload, block_id):
+        parent = self.notion.pages.get(block_id) or self.notion.blocks.get(block_id)
+        if parent is None:
+            return 404, {}, {"object": "error", "code": "object_not_found"}
+        start = int(query.get("start_cursor") or 0)
+        size = min(int(query.get("page_size", 100)), self.notion_page_size)
+        ids = parent["children"][start:start + size]
+        has_more = start + size < len(parent["children"])
+        return 200, {}, {
+            "object": "list",
+            "results": [self.notion.block_json(child_id) for child_id in ids],
+            "has_more": has_more,
+            "next_cursor": str(start + size) if has_more else None,
+        }
+
+    def notion_append(self, query, payload, block_id):
+        if block_id not in self.notion.pages and block_id not in self.notion.blocks:
+            return 404, {}, {"object": "error", "code": "object_not_found"}
+        error = validate_blocks(payload.get("children", []))
+        if error:
+            return 400, {}, {"object": "error", "code": "validation_error", "message": error}
+        created = self.notion.add_blocks(block_id, payload["children"], after=payload.get("after"))
+        if block_id in self.notion.pages:
+            self.notion.pages[block_id]["last_edited_time"] = self.notion.now()
+        return 200, {}, {"object": "list", "results": [self.notion.block_json(block["id"]) for block in created]}
+
+    def notion_update_block(self, query, payload, block_id):
+        block = self.notion.blocks.get(block_id)
+        if block is None:
+            return 404, {}, {"object": "error", "code": "object_not_found"}
+        block[block["type"]].update(payload.get(block["type"], {}))
+        return 200, {}, self.notion.block_json(block_id)
+
+    def notion_delete_block(self, query, payload, block_id):
+        if block_id not in self.notion.blocks:
+            return 404, {}, {"object": "error", "code": "object_not_found"}
+        for parent in list(self.notion.pages.values()) + list(self.notion.blocks.values()):
+            if block_id in parent["children"]:
+                parent["children"].remove(block_id)
+        block = self.notion.blocks.pop(block_id)
+        return 200, {}, {**block, "archived": True}
+
+    def reset_stats(self):
+        """요청 집계 초기화 (Notion 상태는 유지, 같은 서버로 여러 번 실행할 때 실행별로 집계)"""
+        with self.lock:
+            self.counts.clear()
+            self.injected_429.clear()
+            self.injected_502.clear()
+            self.bytes_sent = 0
+            self.not_modified = 0
+            self.graphql_cost = 0
+
+    def stats(self):
+        with self.lock:
+            return {
+                "requests": sum(self.counts.values()),
+                "by_endpoint": dict(self.counts),
+                "injected_429": sum(self.injected_429.values()),
+                "injected_502": sum(self.injected_502.values()),
+                "not_modified": self.not_modified,
+                "graphql_cost": self.graphql_cost,
+                "bytes_sent": self.bytes_sent,
+                "notion_pages": len(self.notion.pages),
+                "notion_blocks": len(self.notion.blocks),
+            }
+
+
+def make_handler(api):
+    class MockHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive 지원 (실제 API처럼 커넥션 재사용)
+        disable_nagle_algorithm = True  # 헤더와 본문을 나눠 쓸 때 생기는 지연(Nagle + delayed ACK) 방지
+
+        def _dispatch(self, method):
+            body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            if self.path == "/_stats":
+                status, headers, payload = 200, {}, api.stats()
+            else:
+                status, headers, payload = api.handle(method, self.path, body)
+
+            if isinstance(payload, bytes):
+                data, content_type = payload, "application/x-gzip"
+            else:
+                data, content_type = json.dumps(payload, ensure_ascii=False).encode("utf-8"), "application/json; charset=utf-8"
+            # ✅ GitHub GET 응답은 ETag를 붙이고, 같은 ETag로 재검증하면 본문 없이 304 응답
+            if method == "GET" and status == 200 and self.path.startswith("/github/"):
+                headers["ETag"] = f'"{hashlib.sha1(data).hexdigest()}"'
+                if self.headers.get("If-None-Match") == headers["ETag"]:
+                    status, data = 304, b""
+                    with api.lock:
+                        api.not_modified += 1
+            with api.lock:
+                api.bytes_sent += len(data)
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(data)))
+            for key, value in headers.items():
+                self.send_header(key, value)
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            self._dispatch("GET")
+
+        def do_POST(self):
+            self._dispatch("POST")
+
+        def do_PATCH(self):
+            self._dispatch("PATCH")
+
+        def do_DELETE(self):
+            self._dispatch("DELETE")
+
+        def log_message(self, format, *args):
+            pass
+
+    return MockHandler
+
+
+def start_server(api, host="127.0.0.1", port=0):
+    """대역 서버를 백그라운드 스레드로 시작하고 서버 객체 반환 (port=0이면 빈 포트 사용)"""
+    server = ThreadingHTTPServer((host, port), make_handler(api))
+    server.daemon_threads = True
+    api.base_url = f"http://{host}:{server.server_address[1]}"
+    threading.Thread(target=server.serve_forever, name="mock-api", daemon=True).start()
+    return server
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="GitHub / Notion API 대역 서버")
+    parser.add_argument("--problems", type=int, default=100, help="합성 저장소의 문제(커밋) 수")
+    parser.add_argument("--notion-existing", type=int, default=0, help="이미 Notion에 있는 문제 수")
+    parser.add_argument("--tree-scope", choices=["full", "commit"], default="full", help="트리 응답에 포함할 파일 범위")
+    parser.add_argument("--extra-files", type=int, default=0, help="커밋마다 함께 바뀌는 업로드 대상이 아닌 파일 수")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="요청마다 추가할 지연(ms)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="429 응답을 주입할 확률 (0~1)")
+    parser.add_argument("--applied-error-rate", type=float, default=0.0, help="Notion 쓰기 요청을 반영한 뒤 502로 응답할 확률 (0~1)")
+    parser.add_argument("--github-page-size", type=int, default=100, help="커밋 목록 한 페이지의 최대 크기")
+    parser.add_argument("--notion-page-size", type=int, default=100, help="Notion 조회 한 페이지의 최대 크기")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=0)
+    return parser.parse_args()
+
+
+def build_api(args):
+    api = MockApi(
+        SyntheticRepo(args.problems, tree_scope=args.tree_scope, extra_files=args.extra_files),
+        latency_ms=args.latency_ms,
+        error_rate=args.error_rate,
+        github_page_size=args.github_page_size,
+        notion_page_size=args.notion_page_size,
+        applied_error_rate=args.applied_error_rate,
+    )
+    api.seed_notion(args.notion_existing)
+    return api
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    server = start_server(build_api(args), args.host, args.port)
+    # ✅ 벤치마크 실행기가 읽는 준비 완료 신호 (주소)
+    print(f"READY {server.server_address[0]}:{server.server_address[1]}", flush=True)
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -0,0 +1,99 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from config import BLOB_CACHE_PATH, BLOB_CACHE_MAX_BYTES
+
+
+class BlobCache:
+    """
+    git blob / commit SHA를 키로 하는 디스크 캐시 (SQLite)
+    - SHA로 식별되는 내용은 바뀌지 않으므로 만료 없이 저장
+    - 전체 크기가 max_bytes를 넘으면 가장 오래 사용하지 않은 항목부터 삭제 (LRU)
+    - 블록 변환 결과 캐시(block_cache)의 디스크 단계로도 사용
+    """
+
+    def __init__(self, path=BLOB_CACHE_PATH, max_bytes=BLOB_CACHE_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " key TEXT PRIMARY KEY,"
+            " value TEXT NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " last_access REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_last_access ON entries (last_access)")
+        self._conn.commit()
+        self._total_bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    def lookup(self, key):
+        """(찾음 여부, 값) 반환 - 값이 None으로 저장된 경우(바이너리 파일)도 적중으로 처리"""
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return False, None
+            self.hits += 1
+            self._conn.execute("UPDATE entries SET last_access = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+            return True, json.loads(row[0])
+
+    def store(self, key, value):
+        """값 저장 후 용량 초과 시 LRU 삭제"""
+        data = json.dumps(value, ensure_ascii=False)
+        size = len(data.encode("utf-8"))
+        if size > self.max_bytes:
+            return  # 캐시 전체보다 큰 항목은 저장하지 않음
+
+        with self._lock:
+            row = self._conn.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                self._total_bytes -= row[0]
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, size, last_access) VALUES (?, ?, ?, ?)",
+                (key, data, size, time.time()),
+            )
+            self._total_bytes += size
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        if self._total_bytes <= self.max_bytes:
+            return
+
+        for key, size in self._conn.execute("SELECT key, size FROM entries ORDER BY last_access").fetchall():
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self._total_bytes -= size
+            if self._total_bytes <= self.max_bytes:
+                break
+
+    def stats(self):
+        """적중/실패 횟수와 적중률 반환"""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+# 실행 중 공유하는 캐시 인스턴스 가져오기 (BLOB_CACHE_PATH가 비어 있으면 비활성화)
+def get_blob_cache():
+    global _cache
+    with _cache_lock:
+        if _cache is None and BLOB_CACHE_PATH:
+            _cache = BlobCache()
+    return _cache
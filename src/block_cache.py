@@ -0,0 +1,97 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from blob_cache import BlobCache
+from config import BLOCK_CACHE_MAX_ENTRIES, BLOCK_CACHE_PATH, BLOCK_CACHE_MAX_BYTES
+from markdown_converter import CONVERTER_VERSION, convert_markdown_to_notion_blocks
+from utils import CODE_BLOCKS_VERSION, build_code_blocks
+
+
+class BlockCache:
+    """
+    Notion 블록 변환 결과 캐시 (입력 텍스트 해시 + 변환기 버전을 키로 사용)
+    - 1단계: 프로세스 내 LRU (max_entries개)
+    - 2단계: 디스크 캐시 (disk가 있으면 실행이 바뀌어도 같은 README는 다시 변환하지 않음)
+    - 반환된 블록 목록은 여러 업로드가 공유하므로 수정하지 말 것
+    """
+
+    def __init__(self, max_entries=BLOCK_CACHE_MAX_ENTRIES, disk=None):
+        self.max_entries = max_entries
+        self.disk = disk
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(kind, version, *parts):
+        digest = hashlib.sha256("\0".join(str(part) for part in parts).encode("utf-8")).hexdigest()
+        return f"{kind}:v{version}:{digest}"
+
+    def _remember(self, key, blocks):
+        with self._lock:
+            self._entries[key] = blocks
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_or_convert(self, key, convert):
+        """캐시에 있으면 저장된 블록을, 없으면 convert()로 변환해 양쪽 캐시에 저장한 뒤 반환"""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.memory_hits += 1
+                return self._entries[key]
+
+        if self.disk is not None:
+            found, blocks = self.disk.lookup(key)
+            if found:
+                with self._lock:
+                    self.disk_hits += 1
+                self._remember(key, blocks)
+                return blocks
+
+        blocks = convert()
+        with self._lock:
+            self.misses += 1
+        self._remember(key, blocks)
+        if self.disk is not None:
+            self.disk.store(key, blocks)
+        return blocks
+
+    def stats(self):
+        """메모리/디스크 적중 횟수와 적중률 반환"""
+        hits = self.memory_hits + self.disk_hits
+        total = hits + self.misses
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": hits / total if total else 0.0,
+        }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+# 실행 중 공유하는 변환 캐시 가져오기 (BLOCK_CACHE_PATH가 비어 있으면 메모리 캐시만 사용)
+def get_block_cache():
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            disk = BlobCache(path=BLOCK_CACHE_PATH, max_bytes=BLOCK_CACHE_MAX_BYTES) if BLOCK_CACHE_PATH else None
+            _cache = BlockCache(disk=disk)
+    return _cache
+
+
+# Markdown → Notion 블록 변환 (캐시 사용)
+def cached_markdown_blocks(markdown_text):
+    key = BlockCache.make_key("markdown", CONVERTER_VERSION, markdown_text)
+    return get_block_cache().get_or_convert(key, lambda: convert_markdown_to_notion_blocks(markdown_text))
+
+
+# 코드 → Notion 코드 블록 변환 (캐시 사용)
+def cached_code_blocks(code, language, max_bytes=None):
+    key = BlockCache.make_key("code", CODE_BLOCKS_VERSION, language, max_bytes, code)
+    return get_block_cache().get_or_convert(key, lambda: build_code_blocks(code, language, max_bytes=max_bytes))
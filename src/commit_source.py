@@ -0,0 +1,21 @@
+from config import SOURCE_BACKEND
+
+# ✅ 커밋/파일 조회 백엔드 선택 (두 모듈은 같은 함수 이름과 반환 형식을 제공)
+# - github: GitHub REST API (github_api)
+# - git: 로컬 미러 저장소 (git_backend, git fetch로 갱신 후 git log / cat-file로 읽음)
+# - graphql: GitHub GraphQL API (graphql_backend, 커밋 기록과 여러 파일 내용을 쿼리 하나로 조회, 변경 파일 목록만 REST)
+if SOURCE_BACKEND == "git":
+    from git_backend import (
+        iter_commits, get_all_commits, get_commit_files, get_file_content, get_commit_file_contents,
+        get_commit_file_blobs, get_blob_content, get_directory_files,
+    )
+elif SOURCE_BACKEND == "graphql":
+    from graphql_backend import (
+        iter_commits, get_all_commits, get_commit_files, get_file_content, get_commit_file_contents,
+        get_commit_file_blobs, get_blob_content, get_directory_files,
+    )
+else:
+    from github_api import (
+        iter_commits, get_all_commits, get_commit_files, get_file_content, get_commit_file_contents,
+        get_commit_file_blobs, get_blob_content, get_directory_files,
+    )
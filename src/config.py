@@ -8,6 +8,10 @@ GITHUB_REPO = os.getenv("GITHUB_REPO")
 NOTION_API_KEY = os.getenv("NOTION_API_KEY")
 NOTION_DATABASE_ID = os.getenv("NOTION_DATABASE_ID")
 
+# API 기본 주소 (벤치마크에서는 로컬 대역 서버 주소로 바꿔서 실행)
+GITHUB_API_URL = os.getenv("GITHUB_API_URL", "https://api.github.com")
+NOTION_API_URL = os.getenv("NOTION_API_URL", "https://api.notion.com/v1")
+
 # GitHub API 헤더 설정
 GITHUB_HEADERS = {
     "Authorization": f"token {GITHUB_TOKEN}",
@@ -19,4 +23,89 @@ NOTION_HEADERS = {
     "Authorization": f"Bearer {NOTION_API_KEY}",
     "Content-Type": "application/json",
     "Notion-Version": "2022-06-28",
-}
\ No newline at end of file
+}
+
+# 증분 동기화 상태 파일 경로 (마지막으로 처리한 커밋 SHA 저장)
+SYNC_STATE_PATH = os.getenv("SYNC_STATE_PATH", ".sync_state.json")
+# 커밋 목록을 마지막 동기화 커밋 시각보다 며칠 앞서부터 조회할지 (나중에 push된 과거 날짜의 커밋 포함, 조회는 마지막 커밋 SHA에서 중단)
+SYNC_SINCE_MARGIN_DAYS = float(os.getenv("SYNC_SINCE_MARGIN_DAYS", "30"))
+
+# 파일 내용 가져오기 방식 ("tree": git tree + blob, "tarball": 실행 중 한 번 받은 저장소 압축 파일로 blob 캐시를 채운 뒤 tree + blob)
+CONTENT_BACKEND = os.getenv("CONTENT_BACKEND", "tree")
+
+# blob / 커밋 응답 디스크 캐시 (SHA 기준, 비워두면 비활성화)
+BLOB_CACHE_PATH = os.getenv("BLOB_CACHE_PATH", ".cache/blobs.sqlite3")
+BLOB_CACHE_MAX_BYTES = int(os.getenv("BLOB_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+
+# 프로세스 내에 유지하는 blob 내용 수 (LRU, 나머지는 디스크 캐시에서 다시 읽음)
+BLOB_MEMORY_CACHE_ENTRIES = int(os.getenv("BLOB_MEMORY_CACHE_ENTRIES", "256"))
+
+# GitHub 조건부 요청 캐시 (URL별 ETag/Last-Modified와 응답 본문 저장, 304 응답은 레이트 리밋에 포함되지 않음, 비워두면 비활성화)
+GITHUB_HTTP_CACHE_PATH = os.getenv("GITHUB_HTTP_CACHE_PATH", ".cache/github_http.sqlite3")
+GITHUB_HTTP_CACHE_MAX_BYTES = int(os.getenv("GITHUB_HTTP_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+
+# GitHub 동시 요청 수 (커밋별 파일 조회를 병렬 처리, 1이면 순차 처리)
+GITHUB_MAX_WORKERS = int(os.getenv("GITHUB_MAX_WORKERS", "8"))
+GITHUB_RATE_LIMIT_RETRIES = int(os.getenv("GITHUB_RATE_LIMIT_RETRIES", "3"))
+
+# HTTP 클라이언트 설정 (커넥션 풀 크기, 재시도 횟수, 지수 백오프, 요청 타임아웃)
+HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", str(max(GITHUB_MAX_WORKERS, 10))))
+HTTP_MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", "5"))
+HTTP_BACKOFF_BASE = float(os.getenv("HTTP_BACKOFF_BASE", "0.5"))
+HTTP_BACKOFF_MAX = float(os.getenv("HTTP_BACKOFF_MAX", "30"))
+HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "30"))
+
+# Notion 요청 속도 제한 (통합(integration)당 평균 초당 3회) 및 쓰기 작업 워커 수
+NOTION_REQUESTS_PER_SECOND = float(os.getenv("NOTION_REQUESTS_PER_SECOND", "3"))
+NOTION_BURST = int(os.getenv("NOTION_BURST", "3"))
+NOTION_WRITE_WORKERS = int(os.getenv("NOTION_WRITE_WORKERS", "2"))
+
+# Notion 데이터베이스 스키마 캐시 유지 시간(초)
+NOTION_SCHEMA_TTL = float(os.getenv("NOTION_SCHEMA_TTL", "600"))
+
+# Notion 페이지 제목 인덱스 캐시 파일 경로 (중복 검사용)
+TITLE_INDEX_PATH = os.getenv("TITLE_INDEX_PATH", ".cache/title_index.json")
+# 제목 인덱스를 몇 번 실행마다 전체 페이지와 대조할지 (삭제/보관된 페이지는 변경분 조회에 나오지 않으므로 이때 제거, 0이면 대조하지 않음)
+TITLE_INDEX_FULL_SYNC_EVERY = int(os.getenv("TITLE_INDEX_FULL_SYNC_EVERY", "20"))
+
+# Notion 요청 하나에 담는 블록 수와 본문 크기 상한 (API 제한: children 100개, 요청 본문 500KB)
+NOTION_MAX_BLOCKS_PER_REQUEST = int(os.getenv("NOTION_MAX_BLOCKS_PER_REQUEST", "100"))
+NOTION_MAX_PAYLOAD_BYTES = int(os.getenv("NOTION_MAX_PAYLOAD_BYTES", str(450 * 1000)))
+
+# Notion 블록 변환 결과 캐시 (프로세스 내 LRU 항목 수, 디스크 캐시 경로 - 비워두면 디스크 캐시 비활성화)
+BLOCK_CACHE_MAX_ENTRIES = int(os.getenv("BLOCK_CACHE_MAX_ENTRIES", "512"))
+BLOCK_CACHE_PATH = os.getenv("BLOCK_CACHE_PATH", ".cache/blocks.sqlite3")
+BLOCK_CACHE_MAX_BYTES = int(os.getenv("BLOCK_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+
+# GitHub push 웹훅 수신 서버 (서명 검증 비밀값, 수신 주소, 연속 push를 모아 처리하는 대기 시간(초))
+WEBHOOK_SECRET = os.getenv("WEBHOOK_SECRET", "")
+WEBHOOK_HOST = os.getenv("WEBHOOK_HOST", "127.0.0.1")
+WEBHOOK_PORT = int(os.getenv("WEBHOOK_PORT", "8080"))
+WEBHOOK_BRANCH = os.getenv("WEBHOOK_BRANCH", "main")
+WEBHOOK_DEBOUNCE_SECONDS = float(os.getenv("WEBHOOK_DEBOUNCE_SECONDS", "5"))
+
+# 커밋/파일을 읽어 오는 저장소 백엔드 ("github": REST API, "git": 로컬 미러 저장소, "graphql": GitHub GraphQL API)
+SOURCE_BACKEND = os.getenv("SOURCE_BACKEND", "github")
+GIT_MIRROR_PATH = os.getenv("GIT_MIRROR_PATH", ".cache/repo.git")
+GIT_REMOTE_URL = os.getenv("GIT_REMOTE_URL", f"https://github.com/{GITHUB_OWNER}/{GITHUB_REPO}.git")
+
+# GitHub GraphQL 백엔드 (커밋 목록 페이지 크기(최대 100), 쿼리 하나에 담는 파일 수, 여러 스레드의 파일 요청을 모으는 대기 시간(초))
+GITHUB_GRAPHQL_URL = os.getenv("GITHUB_GRAPHQL_URL", f"{GITHUB_API_URL}/graphql")
+GRAPHQL_HISTORY_PAGE_SIZE = min(int(os.getenv("GRAPHQL_HISTORY_PAGE_SIZE", "100")), 100)
+GRAPHQL_BATCH_SIZE = int(os.getenv("GRAPHQL_BATCH_SIZE", "50"))
+GRAPHQL_BATCH_WAIT = float(os.getenv("GRAPHQL_BATCH_WAIT", "0.02"))
+
+# 로그 레벨 (DEBUG: 커밋/파일 단위 진행 상황까지 출력, INFO: 페이지 단위와 요약, WARNING: 경고와 오류만)
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+
+# 실행 보고서 (단계별 시간, 엔드포인트별 요청 수/지연/전송량, 재시도, 캐시 적중률) 저장 경로 - 비워두면 저장하지 않음
+METRICS_REPORT_PATH = os.getenv("METRICS_REPORT_PATH", ".cache/run_report.json")
+METRICS_PROMETHEUS_PATH = os.getenv("METRICS_PROMETHEUS_PATH", "")
+
+# 새 페이지 생성 작업 저널 (페이지 생성/블록 추가 진행 상황을 기록해 중단된 작업을 이어서 진행, 비워두면 비활성화)
+JOB_JOURNAL_PATH = os.getenv("JOB_JOURNAL_PATH", ".cache/jobs.sqlite3")
+# 페이지 생성 작업을 실패로 두기 전까지 시도하는 횟수 (영구적인 4xx 오류는 한 번에 실패 처리, 실패한 작업은 자동으로 재시도하지 않음)
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "5"))
+
+# 문제 카탈로그 (Notion에 올린 문제의 로컬 SQLite 사본, 통계/조회용 - 비워두면 비활성화)
+PROBLEM_CATALOG_PATH = os.getenv("PROBLEM_CATALOG_PATH", ".cache/problems.sqlite3")
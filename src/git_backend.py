@@ -0,0 +1,277 @@
+import base64
+import logging
+import os
+import subprocess
+import threading
+from records import CommitRef
+from config import GITHUB_TOKEN, GIT_MIRROR_PATH, GIT_REMOTE_URL
+
+logger = logging.getLogger(__name__)
+
+# ✅ git diff --name-status 상태 → GitHub API의 파일 status
+_STATUS_NAMES = {"A": "added", "M": "modified", "D": "removed", "T": "modified"}
+
+_mirror_lock = threading.Lock()
+_mirror_updated = False
+
+# ✅ 미러에 있는 것으로 확인된 커밋 SHA (없는 커밋을 만나면 한 번 fetch)
+_known_commits = set()
+
+
+def _git_env(**extra):
+    """
+    git 명령 실행 환경 (비공개 저장소도 받을 수 있도록 토큰을 요청 헤더로 전달)
+    - 명령줄 인자(-c)는 ps, /proc/*/cmdline으로 다른 사용자에게 보이므로 환경 변수(GIT_CONFIG_*)로만 전달
+    - 설정 파일에는 기록하지 않음
+    """
+    env = {**os.environ, **extra}
+    if GITHUB_TOKEN:
+        credentials = base64.b64encode(f"x-access-token:{GITHUB_TOKEN}".encode("utf-8")).decode("ascii")
+        index = int(env.get("GIT_CONFIG_COUNT") or 0)
+        env.update({
+            "GIT_CONFIG_COUNT": str(index + 1),
+            f"GIT_CONFIG_KEY_{index}": "http.extraHeader",
+            f"GIT_CONFIG_VALUE_{index}": f"Authorization: Basic {credentials}",
+        })
+    return env
+
+
+def _git(*args, input=None):
+    """미러 저장소에서 git 명령 실행 후 stdout(bytes) 반환 (실패 시 None)"""
+    result = subprocess.run(
+        ["git", "--git-dir", GIT_MIRROR_PATH, *args],
+        input=input, stdout=subprocess.PIPE, stderr=subprocess.PIPE, env=_git_env(),
+    )
+    if result.returncode != 0:
+        logger.error("❌ git %s 실패: %s", args[0], result.stderr.decode("utf-8", "replace").strip())
+        return None
+    return result.stdout
+
+
+def update_mirror(force=False):
+    """
+    로컬 미러 저장소를 최신 상태로 맞추는 함수
+    - 없으면 git clone --mirror, 있으면 git fetch --prune (실행 중 한 번, force=True면 다시 fetch)
+    """
+    global _mirror_updated
+    with _mirror_lock:
+        if _mirror_updated and not force:
+            return True
+
+        if not os.path.isdir(GIT_MIRROR_PATH):
+            logger.info("📥 저장소 미러 생성: %s → %s", GIT_REMOTE_URL, GIT_MIRROR_PATH)
+            result = subprocess.run(
+                ["git", "clone", "--mirror", "--quiet", GIT_REMOTE_URL, GIT_MIRROR_PATH],
+                stdout=subprocess.PIPE, stderr=subprocess.PIPE, env=_git_env(),
+            )
+            if result.returncode != 0:
+                logger.error("❌ git clone 실패: %s", result.stderr.decode("utf-8", "replace").strip())
+                return False
+        elif _git("fetch", "--prune", "--quiet", "origin") is None:
+            return False
+
+        _mirror_updated = True
+        return True
+
+
+def _ensure_commit(commit_sha):
+    """커밋이 미러에 없으면 (웹훅으로 받은 최신 커밋 등) 한 번 fetch"""
+    if commit_sha in _known_commits:
+        return
+    check = subprocess.run(
+        ["git", "--git-dir", GIT_MIRROR_PATH, "cat-file", "-e", f"{commit_sha}^{{commit}}"],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    if check.returncode != 0:
+        update_mirror(force=True)
+    _known_commits.add(commit_sha)
+
+
+# 미러에서 커밋을 최신순으로 하나씩 내보내기 (github_api.iter_commits와 같은 형식)
+def iter_commits(since=None, stop_sha=None, branch="main", errors=None):
+    """
+    git log 출력을 읽는 대로 커밋(CommitRef)을 하나씩 내보내는 제너레이터
+    - since: 해당 시각(ISO 8601) 이후의 커밋만, stop_sha: 이미 처리한 커밋을 만나면 중단
+    - errors: 미러 갱신이나 git log가 실패하면 오류 메시지를 추가할 목록
+    """
+    if not update_mirror():
+        if errors is not None:
+            errors.append("미러 저장소 갱신 실패")
+        return
+
+    args = ["log", branch, "-z", "--format=%H%x1f%cd%x1f%B", "--date=format-local:%Y-%m-%dT%H:%M:%SZ"]
+    if since:
+        args.append(f"--since={since}")
+    process = subprocess.Popen(
+        ["git", "--git-dir", GIT_MIRROR_PATH, *args],
+        stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, env=_git_env(TZ="UTC"),
+    )
+    try:
+        buffer = b""
+        while True:
+            chunk = process.stdout.read(65536)
+            buffer += chunk
+            records = buffer.split(b"\0")
+            buffer = records.pop() if chunk else b""
+            for record in records:
+                if not record:
+                    continue
+                commit_sha, commit_date, message = record.decode("utf-8", "replace").split("\x1f", 2)
+                if stop_sha and commit_sha == stop_sha:
+                    return  # ✅ 이미 처리한 커밋에 도달하면 중단
+                _known_commits.add(commit_sha)
+                yield CommitRef(commit_sha, commit_date, message.strip())
+            if not chunk:
+                if process.wait() != 0:
+                    logger.error("❌ git log 실행 실패: 종료 코드 %s", process.returncode)
+                    if errors is not None:
+                        errors.append(f"git log 실패: {process.returncode}")
+                return
+    finally:
+        process.stdout.close()
+        process.kill()
+        process.wait()
+
+
+def get_all_commits(since=None, stop_sha=None, branch="main"):
+    """최신 커밋부터 모든 커밋 목록을 리스트로 반환하는 함수"""
+    return list(iter_commits(since=since, stop_sha=stop_sha, branch=branch))
+
+
+# 특정 커밋에서 변경된 파일 가져오기 (병합 커밋은 첫 번째 부모 기준, GitHub API와 동일, 실패하면 None)
+def get_commit_files(commit_sha):
+    _ensure_commit(commit_sha)
+    output = _git("show", "--format=", "--name-status", "-z", "--no-renames", "--diff-merges=first-parent", commit_sha)
+    if output is None:
+        return None
+
+    fields = output.decode("utf-8", "replace").strip("\0").split("\0")
+    return [
+        (filename, _STATUS_NAMES.get(status[:1], "modified"))
+        for status, filename in zip(fields[::2], fields[1::2])
+    ]
+
+
+# 커밋 시점에 폴더 바로 아래에 있는 파일 목록 가져오기 ({경로: blob SHA}, 실패하면 None)
+def get_directory_files(commit_sha, directory):
+    _ensure_commit(commit_sha)
+    output = _git("ls-tree", "-z", commit_sha, "--", f"{directory}/")
+    if output is None:
+        return None
+
+    files = {}
+    for entry in output.decode("utf-8", "replace").split("\0"):
+        if not entry:
+            continue
+        info, _, path = entry.partition("\t")
+        _, kind, blob_sha = info.split()
+        if kind == "blob":
+            files[path] = blob_sha
+    return files
+
+
+# 특정 파일의 원본 내용 가져오기
+def get_file_content(file_path, branch="main"):
+    if len(branch) == 40:
+        _ensure_commit(branch)
+    else:
+        update_mirror()
+    output = _git("show", f"{branch}:{file_path}")
+    if output is None:
+        return None
+    try:
+        return output.decode("utf-8")
+    except UnicodeDecodeError:
+        return None
+
+
+class _CatFileBatch:
+    """
+    git cat-file --batch 프로세스 하나로 여러 파일 내용을 읽는 도우미
+    - 프로세스는 실행 중 재사용하고, 여러 스레드의 요청은 잠금으로 순서대로 처리
+    """
+
+    def __init__(self):
+        self._process = None
+        self._lock = threading.Lock()
+
+    def _start(self):
+        if self._process is None or self._process.poll() is not None:
+            self._process = subprocess.Popen(
+                ["git", "--git-dir", GIT_MIRROR_PATH, "cat-file", "--batch"],
+                stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+            )
+        return self._process
+
+    def read(self, objects):
+        """objects: ["<커밋>:<경로>" 또는 blob SHA, ...] → {object: (blob SHA, bytes) 또는 None(없음)}"""
+        with self._lock:
+            process = self._start()
+            contents = {}
+            for name in objects:
+                # ✅ 한 번에 하나씩 요청하고 바로 읽어 파이프 버퍼가 가득 차지 않도록 함
+                process.stdin.write(f"{name}\n".encode("utf-8"))
+                process.stdin.flush()
+                header = process.stdout.readline().split()
+                if len(header) != 3 or header[1] != b"blob":
+                    contents[name] = None  # 없는 파일 (missing) 또는 디렉터리
+                    if len(header) == 3:
+                        process.stdout.read(int(header[2]) + 1)
+                    continue
+                contents[name] = (header[0].decode("ascii"), process.stdout.read(int(header[2])))
+                process.stdout.read(1)  # 내용 뒤의 줄바꿈
+            return contents
+
+
+_cat_file = _CatFileBatch()
+
+
+# 특정 커밋 시점의 여러 파일 내용 한 번에 가져오기
+def get_commit_file_contents(commit_sha, file_paths):
+    """커밋 시점(commit_sha)의 파일 내용을 cat-file --batch 한 번으로 읽는 함수 (바이너리 파일 제외)"""
+    if not file_paths:
+        return {}
+
+    _ensure_commit(commit_sha)
+    objects = {f"{commit_sha}:{path}": path for path in file_paths}
+    file_contents = {}
+    for name, blob in _cat_file.read(list(objects)).items():
+        if blob is None:
+            continue  # 커밋 시점에 존재하지 않는 파일
+        try:
+            file_contents[objects[name]] = blob[1].decode("utf-8")
+        except UnicodeDecodeError:
+            continue  # 이미지 등 바이너리 파일
+    return file_contents
+
+
+# 특정 커밋 시점의 여러 파일을 blob SHA로 가져오기 (github_api.get_commit_file_blobs와 같은 형식)
+def get_commit_file_blobs(commit_sha, file_paths):
+    """커밋 시점 파일의 blob SHA를 반환하는 함수 (텍스트 파일만, 내용은 미러에 있으므로 필요할 때 다시 읽음)"""
+    if not file_paths:
+        return {}
+
+    _ensure_commit(commit_sha)
+    objects = {f"{commit_sha}:{path}": path for path in file_paths}
+    file_blobs = {}
+    for name, blob in _cat_file.read(list(objects)).items():
+        if blob is None:
+            continue  # 커밋 시점에 존재하지 않는 파일
+        try:
+            blob[1].decode("utf-8")
+        except UnicodeDecodeError:
+            continue  # 이미지 등 바이너리 파일
+        file_blobs[objects[name]] = blob[0]
+    return file_blobs
+
+
+# blob SHA로 파일 내용 가져오기
+def get_blob_content(blob_sha):
+    """미러에서 blob 내용을 읽는 함수 (없거나 텍스트가 아닌 파일은 None 반환)"""
+    blob = _cat_file.read([blob_sha])[blob_sha]
+    if blob is None:
+        return None
+    try:
+        return blob[1].decode("utf-8")
+    except UnicodeDecodeError:
+        return None
@@ -1,46 +1,365 @@
-import requests
 import base64
-from config import GITHUB_HEADERS, GITHUB_OWNER, GITHUB_REPO
+import hashlib
+import io
+import logging
+import re
+import tarfile
+import threading
+import time
+from collections import OrderedDict
+from blob_cache import get_blob_cache
+from http_client import github_client
+from metrics import metrics
+from records import CommitRef
+from config import GITHUB_API_URL, GITHUB_OWNER, GITHUB_REPO, CONTENT_BACKEND, GITHUB_RATE_LIMIT_RETRIES, BLOB_MEMORY_CACHE_ENTRIES
+
+logger = logging.getLogger(__name__)
+
+# ✅ blob SHA → 파일 내용 (최근에 읽은 BLOB_MEMORY_CACHE_ENTRIES개만 유지, 나머지는 디스크 캐시에서 다시 읽음)
+_blob_contents = OrderedDict()
+_blob_contents_lock = threading.Lock()
+
+# ✅ 40자리 커밋 SHA (브랜치 이름과 달리 가리키는 내용이 바뀌지 않음)
+_COMMIT_SHA_PATTERN = re.compile(r"^[0-9a-f]{40}$")
+
+# ✅ tarball 방식: 저장소 압축 파일은 실행 중 한 번만 받음
+_archive_lock = threading.Lock()
+_archive_loaded = False
+
+# ✅ 레이트 리밋에 걸리면 모든 스레드가 이 시각까지 요청을 멈춤
+_rate_limit_lock = threading.Lock()
+_rate_limited_until = 0.0
+
+
+def _wait_for_rate_limit():
+    delay = _rate_limited_until - time.time()
+    if delay > 0:
+        time.sleep(delay)
+
+# 레이트 리밋이 풀리는 시각까지 모든 스레드의 GitHub 요청을 멈춤 (GraphQL 응답의 남은 한도에도 사용)
+def pause_github_requests(seconds):
+    global _rate_limited_until
+    with _rate_limit_lock:
+        _rate_limited_until = max(_rate_limited_until, time.time() + seconds)
+
+def _rate_limit_delay(response):
+    """
+    GitHub 레이트 리밋 응답이면 기다려야 할 초를, 아니면 None을 반환하는 함수
+    - secondary rate limit: Retry-After 헤더
+    - primary rate limit: X-RateLimit-Remaining == 0 이면 X-RateLimit-Reset 까지 대기
+    """
+    if response.status_code not in (403, 429):
+        return None
+
+    retry_after = response.headers.get("Retry-After")
+    if retry_after:
+        return int(retry_after)
+
+    if response.headers.get("X-RateLimit-Remaining") == "0":
+        reset_at = int(response.headers.get("X-RateLimit-Reset", time.time() + 60))
+        return max(reset_at - time.time(), 1)
+
+    if response.status_code == 429:
+        return 60  # 헤더 없이 429가 오면 GitHub 권장대로 1분 대기
+    return None
+
+# GitHub 요청 (일시적 오류는 github_client가 재시도, 레이트 리밋은 모든 스레드가 함께 대기)
+def _github_request(send, url, **kwargs):
+    for _ in range(GITHUB_RATE_LIMIT_RETRIES):
+        _wait_for_rate_limit()
+        response = send(url, **kwargs)
+
+        delay = _rate_limit_delay(response)
+        if delay is None:
+            # ✅ 남은 요청이 없으면 리셋 시각까지 다른 스레드의 요청도 멈춤
+            if response.headers.get("X-RateLimit-Remaining") == "0":
+                reset_at = int(response.headers.get("X-RateLimit-Reset", time.time() + 60))
+                pause_github_requests(max(reset_at - time.time(), 1))
+            return response
+
+        metrics.count("github_rate_limit_waits")
+        logger.warning("⏳ GitHub 레이트 리밋 도달: %.0f초 후 재시도합니다.", delay)
+        pause_github_requests(delay)
+    return response
+
+# GitHub GET 요청
+# revalidate=True: 저장된 ETag/Last-Modified로 조건부 요청 (304면 저장된 본문 사용, 레이트 리밋 차감 없음)
+def _github_get(url, **kwargs):
+    return _github_request(github_client.get, url, **kwargs)
+
+# GitHub POST 요청 (GraphQL 등, 레이트 리밋 대기는 GET과 공유)
+def github_post(url, **kwargs):
+    return _github_request(github_client.post, url, **kwargs)
+
+
+# 디스크 캐시 조회 (캐시가 비활성화된 경우 항상 실패)
+def _cache_lookup(key):
+    cache = get_blob_cache()
+    if cache is None:
+        return False, None
+    return cache.lookup(key)
+
+# 디스크 캐시 저장
+def _cache_store(key, value):
+    cache = get_blob_cache()
+    if cache is not None:
+        cache.store(key, value)
+
+# blob 내용을 메모리와 디스크 캐시에 저장 (다른 방식으로 받은 파일도 get_blob_content로 다시 읽을 수 있음)
+def store_blob_content(blob_sha, content):
+    _remember_blob(blob_sha, content)
+    _cache_store(f"blob:{blob_sha}", content)
+
+# 캐시된 blob 내용 조회 (메모리 → 디스크 순서, 없으면 (False, None))
+def lookup_blob_content(blob_sha):
+    found, cached = _recent_blob(blob_sha)
+    if found:
+        return found, cached
+    found, cached = _cache_lookup(f"blob:{blob_sha}")
+    if found:
+        _remember_blob(blob_sha, cached)
+    return found, cached
+
+# 메모리 blob 캐시 조회 (최근 사용 순서 갱신)
+def _recent_blob(blob_sha):
+    with _blob_contents_lock:
+        if blob_sha not in _blob_contents:
+            return False, None
+        _blob_contents.move_to_end(blob_sha)
+        return True, _blob_contents[blob_sha]
+
+# 메모리 blob 캐시 저장 (가장 오래 사용하지 않은 내용부터 버림)
+def _remember_blob(blob_sha, content):
+    with _blob_contents_lock:
+        _blob_contents[blob_sha] = content
+        _blob_contents.move_to_end(blob_sha)
+        while len(_blob_contents) > BLOB_MEMORY_CACHE_ENTRIES:
+            _blob_contents.popitem(last=False)
+
+# git이 계산하는 것과 같은 blob SHA (tarball로 받은 파일도 blob SHA로 캐시에 저장)
+def git_blob_sha(content):
+    data = content.encode("utf-8")
+    return hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
+
+# GitHub에서 커밋을 페이지 단위로 하나씩 내보내기 (since / stop_sha 지정 시 증분 조회)
+def iter_commits(since=None, stop_sha=None, branch="main", errors=None):
+    """
+    최신 커밋부터 페이지 단위로 조회하며 커밋(CommitRef)을 하나씩 내보내는 제너레이터
+    - 첫 페이지를 받는 즉시 다음 단계(파일 조회)가 시작되고, 커밋 목록 전체를 메모리에 쌓지 않음
+    - 커밋 JSON에서 SHA, 시각, 메시지만 남기고 나머지(author, verification, parents 등)는 버림
+    - since: 해당 시각(ISO 8601) 이후의 커밋만 조회 (stop_sha가 없을 때만 더 오래된 커밋을 만나면 중단)
+    - stop_sha: 이미 처리한 커밋 SHA를 만나면 중단 (나중에 push된 과거 날짜의 커밋도 놓치지 않도록 시각으로는 중단하지 않음)
+    - errors: 목록을 끝까지 받지 못하면 오류 메시지를 추가할 목록 (호출하는 쪽에서 동기화 기준점 갱신 여부 판단)
+    """
+    url = f"{GITHUB_API_URL}/repos/{GITHUB_OWNER}/{GITHUB_REPO}/commits"
+    params = {"sha": branch, "per_page": 100}
+    if since:
+        params["since"] = since
 
-# GitHub에서 모든 커밋 가져오기
-def get_all_commits():
-    commits = []
-    url = f"https://api.github.com/repos/{GITHUB_OWNER}/{GITHUB_REPO}/commits"
-    
     while url:
-        response = requests.get(url, headers=GITHUB_HEADERS)
-        if response.status_code == 200:
-            commits.extend(response.json())
-            # Pagination 지원 (다음 페이지가 있는 경우)
-            url = response.links.get("next", {}).get("url")
-        else:
-            print(f"❌ GitHub API 에러: {response.status_code}")
-            break
-    
-    return commits  # 모든 커밋 리스트 반환s
+        with metrics.stage("github_commit_list"):
+            response = _github_get(url, params=params, revalidate=True)
+        if response.status_code != 200:
+            logger.error("❌ GitHub API 에러: %s", response.status_code)
+            if errors is not None:
+                errors.append(f"커밋 목록 조회 실패: {response.status_code}")
+            return
+
+        for commit in response.json():
+            if stop_sha and commit["sha"] == stop_sha:
+                return  # ✅ 이미 처리한 커밋에 도달하면 중단
+            if since and not stop_sha and commit["commit"]["committer"]["date"] < since:
+                return  # ✅ 기준 시각보다 오래된 커밋에 도달하면 중단
+            yield CommitRef.from_api(commit)
+        # Pagination 지원 (다음 페이지가 있는 경우, next URL에 쿼리가 포함됨)
+        url = response.links.get("next", {}).get("url")
+        params = None
 
-# 특정 커밋에서 변경된 파일 가져오기
+# GitHub에서 커밋 가져오기 (since / stop_sha 지정 시 증분 조회)
+def get_all_commits(since=None, stop_sha=None, branch="main"):
+    """최신 커밋부터 모든 커밋 목록을 리스트로 반환하는 함수 (iter_commits를 끝까지 읽음)"""
+    return list(iter_commits(since=since, stop_sha=stop_sha, branch=branch))
+
+# 특정 커밋에서 변경된 파일 가져오기 (조회에 실패하면 None, 변경된 파일이 없으면 빈 리스트)
 def get_commit_files(commit_sha):
-    url = f"https://api.github.com/repos/{GITHUB_OWNER}/{GITHUB_REPO}/commits/{commit_sha}"
-    response = requests.get(url, headers=GITHUB_HEADERS)
+    found, cached = _cache_lookup(f"files:{commit_sha}")
+    if found:
+        return [tuple(file) for file in cached]
+
+    url = f"{GITHUB_API_URL}/repos/{GITHUB_OWNER}/{GITHUB_REPO}/commits/{commit_sha}"
+    # ✅ SHA 기준 응답은 blob 캐시가 있으면 그쪽에 저장되므로, 없을 때만 조건부 요청 캐시 사용
+    response = _github_get(url, revalidate=get_blob_cache() is None)
     
     if response.status_code == 200:
         commit_data = response.json()
-        files = commit_data.get("files",[])
-        return [(file["filename"], file["status"]) for file in files]
+        files = [(file["filename"], file["status"]) for file in commit_data.get("files", [])]
+        _cache_store(f"files:{commit_sha}", files)
+        return files
     else:
-        print(f"❌ GitHub API 에러: {response.status_code}")
-        return []
+        logger.error("❌ GitHub API 에러: %s", response.status_code)
+        return None
 
 # 특정 파일의 원본 내용 가져오기
 def get_file_content(file_path, branch="main"):
-    url = f"https://api.github.com/repos/{GITHUB_OWNER}/{GITHUB_REPO}/contents/{file_path}?ref={branch}"
-    response = requests.get(url, headers=GITHUB_HEADERS)
+    # ✅ 커밋 SHA 기준 조회는 내용이 바뀌지 않으므로 캐시 사용 (브랜치 기준은 조건부 요청으로 재검증)
+    cache_key = f"content:{branch}:{file_path}" if _COMMIT_SHA_PATTERN.match(branch) else None
+    if cache_key:
+        found, cached = _cache_lookup(cache_key)
+        if found:
+            return cached
+
+    url = f"{GITHUB_API_URL}/repos/{GITHUB_OWNER}/{GITHUB_REPO}/contents/{file_path}?ref={branch}"
+    response = _github_get(url, revalidate=cache_key is None or get_blob_cache() is None)
     
     if response.status_code == 200:
         file_data = response.json()
         content = base64.b64decode(file_data["content"]).decode("utf-8")
+        if cache_key:
+            _cache_store(cache_key, content)
         return content
     else:
-        print("Error:", response.json())
+        logger.error("❌ GitHub 파일 조회 실패 (%s): %s", file_path, response.status_code)
         return None
+
+
+# 커밋 시점의 전체 파일 트리 가져오기 (path → blob SHA)
+def get_commit_tree(commit_sha):
+    """
+    recursive git trees API로 커밋 시점의 파일 트리를 한 번에 가져오는 함수
+    - 반환값: {파일 경로: blob SHA}
+    """
+    found, cached = _cache_lookup(f"tree:{commit_sha}")
+    if found:
+        return cached
+
+    url = f"{GITHUB_API_URL}/repos/{GITHUB_OWNER}/{GITHUB_REPO}/git/trees/{commit_sha}"
+    response = _github_get(url, params={"recursive": 1})
+
+    if response.status_code == 200:
+        tree_data = response.json()
+        if tree_data.get("truncated"):
+            logger.warning("⚠️ 커밋 %s의 트리가 너무 커서 일부만 반환되었습니다.", commit_sha)
+        tree = {item["path"]: item["sha"] for item in tree_data.get("tree", []) if item["type"] == "blob"}
+        _cache_store(f"tree:{commit_sha}", tree)
+        return tree
+    else:
+        logger.error("❌ GitHub API 에러: %s", response.status_code)
+        return {}
+
+# 커밋 시점에 폴더 바로 아래에 있는 파일 목록 가져오기
+def get_directory_files(commit_sha, directory):
+    """
+    커밋 시점에 directory 바로 아래에 있는 파일의 {경로: blob SHA}를 반환하는 함수 (트리를 가져오지 못하면 None)
+    - 같은 커밋의 파일 조회와 같은 트리(get_commit_tree, 캐시)를 사용하므로 요청이 늘지 않음
+    """
+    tree = get_commit_tree(commit_sha)
+    if not tree:
+        return None
+    prefix = f"{directory}/"
+    return {path: sha for path, sha in tree.items() if path.startswith(prefix) and "/" not in path[len(prefix):]}
+
+# blob SHA로 파일 내용 가져오기
+def get_blob_content(blob_sha):
+    """blob SHA로 파일 내용을 가져오는 함수 (텍스트가 아닌 파일은 None 반환)"""
+    found, cached = lookup_blob_content(blob_sha)
+    if found:
+        return cached
+
+    url = f"{GITHUB_API_URL}/repos/{GITHUB_OWNER}/{GITHUB_REPO}/git/blobs/{blob_sha}"
+    response = _github_get(url)
+
+    if response.status_code == 200:
+        blob_data = response.json()
+        try:
+            content = base64.b64decode(blob_data["content"]).decode("utf-8")
+        except UnicodeDecodeError:
+            content = None  # 이미지 등 바이너리 파일
+        store_blob_content(blob_sha, content)
+        return content
+    else:
+        logger.error("❌ GitHub API 에러: %s", response.status_code)
+        return None
+
+# 저장소 tarball을 실행 중 한 번만 받아 blob 캐시 채우기
+def prefetch_archive(ref):
+    """
+    ref 시점의 저장소 tarball을 한 번 내려받아 모든 텍스트 파일을 blob SHA로 캐시에 저장하는 함수
+    - 실행 중 처음 호출될 때만 다운로드 (백필에서는 가장 먼저 조회하는 최신 커밋 시점, 이후 호출은 요청 없음)
+    - 과거 커밋의 파일은 커밋별 트리의 blob SHA로 찾으므로, 그 뒤로 바뀌지 않은 파일은 캐시에서 바로 읽고
+      바뀐 파일만 blob API로 받음 (커밋마다 저장소 전체를 다시 받지 않음)
+    - 디스크 캐시가 꺼져 있으면 메모리 캐시에 다 담을 수 없으므로 받지 않음
+    """
+    global _archive_loaded
+    with _archive_lock:
+        if _archive_loaded:
+            return
+        _archive_loaded = True
+        if get_blob_cache() is None:
+            logger.warning("⚠️ blob 캐시가 비활성화되어 tarball을 받지 않고 트리 + blob 방식으로 조회합니다.")
+            return
+
+        url = f"{GITHUB_API_URL}/repos/{GITHUB_OWNER}/{GITHUB_REPO}/tarball/{ref}"
+        with metrics.stage("fetch_archive"):
+            response = _github_get(url)
+        if response.status_code != 200:
+            logger.error("❌ GitHub API 에러: %s", response.status_code)
+            return
+
+        stored = 0
+        with tarfile.open(fileobj=io.BytesIO(response.content), mode="r:gz") as archive:
+            for member in archive:
+                if not member.isfile():
+                    continue
+                try:
+                    content = archive.extractfile(member).read().decode("utf-8")
+                except UnicodeDecodeError:
+                    continue  # 바이너리 파일 제외
+                store_blob_content(git_blob_sha(content), content)
+                stored += 1
+        logger.info("📦 저장소 tarball(%s)에서 파일 %d개를 캐시에 저장했습니다.", ref, stored)
+
+
+# 특정 커밋 시점의 여러 파일 내용 한 번에 가져오기
+def get_commit_file_contents(commit_sha, file_paths):
+    """
+    커밋 시점(commit_sha)의 파일 내용을 가져오는 함수
+    - 트리를 한 번 조회한 뒤 필요한 blob만 SHA로 다운로드 (중복 blob 재사용)
+    - tarball: 처음 한 번 받은 저장소 압축 파일로 캐시를 채워 둔 뒤 같은 방식으로 조회
+    """
+    if not file_paths:
+        return {}
+
+    if CONTENT_BACKEND == "tarball":
+        prefetch_archive(commit_sha)
+
+    tree = get_commit_tree(commit_sha)
+    file_contents = {}
+    for path in file_paths:
+        blob_sha = tree.get(path)
+        if blob_sha is None:
+            continue  # 커밋 시점에 존재하지 않는 파일
+        content = get_blob_content(blob_sha)
+        if content is not None:
+            file_contents[path] = content
+    return file_contents
+
+# 특정 커밋 시점의 여러 파일을 blob SHA로 가져오기 (내용은 필요할 때 get_blob_content로 읽음)
+def get_commit_file_blobs(commit_sha, file_paths):
+    """
+    커밋 시점(commit_sha) 파일의 blob SHA를 반환하는 함수 (텍스트 파일만, {경로: blob SHA})
+    - 내용은 이 단계에서 미리 받아 캐시에 저장하고, 업로드 단계에서 get_blob_content로 다시 읽음
+    - tarball: 처음 한 번 받은 저장소 압축 파일로 캐시를 채워 두므로 그 뒤로 바뀌지 않은 파일은 요청 없음
+    """
+    if not file_paths:
+        return {}
+
+    if CONTENT_BACKEND == "tarball":
+        prefetch_archive(commit_sha)
+
+    tree = get_commit_tree(commit_sha)
+    file_blobs = {}
+    for path in file_paths:
+        blob_sha = tree.get(path)
+        if blob_sha is not None and get_blob_content(blob_sha) is not None:
+            file_blobs[path] = blob_sha
+    return file_blobs
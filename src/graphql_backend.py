@@ -0,0 +1,257 @@
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from datetime import datetime
+from github_api import (
+    get_commit_files, get_directory_files, get_blob_content as get_rest_blob_content,
+    github_post, lookup_blob_content, pause_github_requests, store_blob_content,
+)
+from metrics import metrics
+from records import CommitRef
+from config import (
+    GITHUB_OWNER, GITHUB_REPO, GITHUB_GRAPHQL_URL, GRAPHQL_HISTORY_PAGE_SIZE, GRAPHQL_BATCH_SIZE, GRAPHQL_BATCH_WAIT,
+    GITHUB_RATE_LIMIT_RETRIES,
+)
+
+logger = logging.getLogger(__name__)
+
+# ✅ 모든 쿼리에 붙여 이번 쿼리의 비용과 남은 한도를 함께 받음
+_RATE_LIMIT_FIELDS = "rateLimit { cost remaining resetAt }"
+
+# ✅ 커밋 기록 한 페이지 (history는 노드 수 = first 이므로 100개까지 한 쿼리, 비용 1)
+_HISTORY_QUERY = """
+query($owner: String!, $name: String!, $ref: String!, $first: Int!, $since: GitTimestamp, $after: String) {
+  repository(owner: $owner, name: $name) {
+    object(expression: $ref) {
+      ... on Commit {
+        history(first: $first, since: $since, after: $after) {
+          pageInfo { hasNextPage endCursor }
+          nodes { oid committedDate message }
+        }
+      }
+    }
+  }
+  %s
+}
+""" % _RATE_LIMIT_FIELDS
+
+# ✅ 파일 하나를 조회하는 별칭 필드 (연결(connection)이 아니므로 여러 개를 담아도 노드 수/비용이 늘지 않음)
+_BLOB_FIELDS = "... on Blob { oid text isBinary isTruncated }"
+
+
+def _parse_timestamp(value):
+    return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+
+
+def _record_rate_limit(rate_limit):
+    """쿼리 비용을 지표에 누적하고, 한도를 다 쓰면 리셋 시각까지 모든 GitHub 요청을 멈춤"""
+    if not rate_limit:
+        return
+    metrics.count("github_graphql_cost", rate_limit["cost"])
+    metrics.set_gauge("github_graphql_remaining", rate_limit["remaining"])
+    if rate_limit["remaining"] == 0:
+        pause_github_requests(max(_parse_timestamp(rate_limit["resetAt"]) - time.time(), 1))
+
+
+def graphql_query(query, variables):
+    """
+    GraphQL 쿼리 하나를 실행하고 data를 반환하는 함수 (실패 시 None)
+    - RATE_LIMITED 오류는 리셋 시각(모르면 1분)까지 기다린 뒤 다시 요청
+    - 일부 필드만 실패한 경우(NOT_FOUND 등)는 data를 그대로 반환 (해당 필드는 null)
+    """
+    for _ in range(GITHUB_RATE_LIMIT_RETRIES):
+        response = github_post(GITHUB_GRAPHQL_URL, json={"query": query, "variables": variables}, idempotent=True)  # 조회 쿼리
+        metrics.count("github_graphql_queries")
+        if response.status_code != 200:
+            logger.error("❌ GitHub GraphQL 에러: %s", response.status_code)
+            return None
+
+        body = response.json()
+        data = body.get("data") or {}
+        _record_rate_limit(data.get("rateLimit"))
+
+        errors = body.get("errors") or []
+        if any(error.get("type") == "RATE_LIMITED" for error in errors):
+            metrics.count("github_rate_limit_waits")
+            logger.warning("⏳ GitHub GraphQL 한도 도달: 리셋 시각까지 기다린 뒤 재시도합니다.")
+            pause_github_requests(60)
+            continue
+        if errors and not data.get("repository"):
+            logger.error("❌ GitHub GraphQL 에러: %s", "; ".join(error.get("message", "") for error in errors))
+            return None
+        return data
+    return None
+
+
+class _BlobBatcher:
+    """
+    여러 스레드의 파일 내용 요청을 모아 별칭 필드 object(...) 여러 개를 담은 쿼리 하나로 조회하는 도우미
+    - 먼저 요청한 스레드가 batch_wait초 동안(또는 batch_size개가 모일 때까지) 다른 스레드의 요청을 모은 뒤 실행
+    - 요청 하나는 ("expression", "<커밋>:<경로>") 또는 ("oid", blob SHA), 결과는 Blob 필드 dict 또는 None(없는 파일)
+    - 쿼리 하나에 담는 파일 수를 batch_size로 제한하여 응답 크기와 처리 시간을 GitHub 제한 안으로 유지
+    - 쿼리가 실패하면 해당 요청은 모두 None (REST 백엔드에서 파일 조회가 실패한 것과 같이 처리)
+    """
+
+    def __init__(self, batch_size=GRAPHQL_BATCH_SIZE, batch_wait=GRAPHQL_BATCH_WAIT):
+        self.batch_size = max(batch_size, 1)
+        self.batch_wait = batch_wait
+        self._pending = []
+        self._leading = False
+        self._condition = threading.Condition()
+
+    def fetch(self, lookups):
+        """lookups: [(종류, 값)] → 같은 순서의 결과 목록"""
+        futures = [Future() for _ in lookups]
+        with self._condition:
+            self._pending.extend(zip(lookups, futures))
+            self._condition.notify_all()
+            lead = not self._leading
+            self._leading = True
+        if lead:
+            self._lead()
+        return [future.result() for future in futures]
+
+    def _lead(self):
+        while True:
+            with self._condition:
+                deadline = time.monotonic() + self.batch_wait
+                while len(self._pending) < self.batch_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+                batch = self._pending[:self.batch_size]
+                del self._pending[:self.batch_size]
+                if not batch:
+                    self._leading = False
+                    return
+            try:
+                results = self._query([lookup for lookup, _ in batch])
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            for (_, future), result in zip(batch, results):
+                future.set_result(result)
+
+    def _query(self, lookups):
+        variables = {"owner": GITHUB_OWNER, "name": GITHUB_REPO}
+        declarations = []
+        fields = []
+        for index, (kind, value) in enumerate(lookups):
+            variable_type = "String!" if kind == "expression" else "GitObjectID!"
+            declarations.append(f"$v{index}: {variable_type}")
+            fields.append(f"f{index}: object({kind}: $v{index}) {{ {_BLOB_FIELDS} }}")
+            variables[f"v{index}"] = value
+
+        query = (
+            f"query($owner: String!, $name: String!, {', '.join(declarations)}) {{\n"
+            f"  repository(owner: $owner, name: $name) {{\n    " + "\n    ".join(fields) + "\n  }\n"
+            f"  {_RATE_LIMIT_FIELDS}\n}}"
+        )
+        metrics.count("github_graphql_objects", len(lookups))
+        data = graphql_query(query, variables) or {}
+        repository = data.get("repository") or {}
+        return [repository.get(f"f{index}") for index in range(len(lookups))]
+
+
+_batcher = _BlobBatcher()
+
+
+def _blob_text(blob):
+    """
+    조회한 Blob 필드에서 텍스트를 꺼내고 캐시에 저장하는 함수 (바이너리/없는 파일은 None)
+    - 크기 제한으로 text가 잘린 파일은 REST blob API로 다시 받음
+    """
+    if not blob or blob.get("isBinary"):
+        return None
+    if blob.get("isTruncated") or blob.get("text") is None:
+        return get_rest_blob_content(blob["oid"])
+    store_blob_content(blob["oid"], blob["text"])
+    return blob["text"]
+
+
+# GraphQL history로 커밋을 한 페이지(최대 100개)씩 조회하며 하나씩 내보내기 (github_api.iter_commits와 같은 형식)
+def iter_commits(since=None, stop_sha=None, branch="main", errors=None):
+    """
+    최신 커밋부터 GraphQL history를 페이지 단위로 조회하며 커밋(CommitRef)을 하나씩 내보내는 제너레이터
+    - since: history(since:)로 서버에서 먼저 거르고, stop_sha가 없으면 기준 시각보다 오래된 커밋을 만나면 중단
+    - stop_sha: 이미 처리한 커밋 SHA를 만나면 중단
+    - errors: 목록을 끝까지 받지 못하면 오류 메시지를 추가할 목록
+    """
+    variables = {
+        "owner": GITHUB_OWNER, "name": GITHUB_REPO, "ref": branch,
+        "first": GRAPHQL_HISTORY_PAGE_SIZE, "since": since, "after": None,
+    }
+    while True:
+        with metrics.stage("github_commit_list"):
+            data = graphql_query(_HISTORY_QUERY, variables)
+        target = ((data or {}).get("repository") or {}).get("object")
+        if not target:
+            logger.error("❌ GitHub GraphQL로 %s 브랜치의 커밋 기록을 가져오지 못했습니다.", branch)
+            if errors is not None:
+                errors.append("커밋 기록 조회 실패")
+            return
+
+        history = target["history"]
+        for node in history["nodes"]:
+            if stop_sha and node["oid"] == stop_sha:
+                return  # ✅ 이미 처리한 커밋에 도달하면 중단
+            if since and not stop_sha and node["committedDate"] < since:
+                return  # ✅ 기준 시각보다 오래된 커밋에 도달하면 중단
+            yield CommitRef(node["oid"], node["committedDate"], node["message"])
+
+        if not history["pageInfo"]["hasNextPage"]:
+            return
+        variables["after"] = history["pageInfo"]["endCursor"]
+
+
+def get_all_commits(since=None, stop_sha=None, branch="main"):
+    """최신 커밋부터 모든 커밋 목록을 리스트로 반환하는 함수"""
+    return list(iter_commits(since=since, stop_sha=stop_sha, branch=branch))
+
+
+# ✅ GraphQL의 Commit에는 변경 파일 목록 필드가 없으므로 get_commit_files는 REST API(blob 캐시 사용)를 그대로 사용
+# ✅ 폴더 파일 목록(get_directory_files)도 REST 트리 API(캐시 사용)를 그대로 사용
+
+
+# 특정 파일의 원본 내용 가져오기
+def get_file_content(file_path, branch="main"):
+    blob, = _batcher.fetch([("expression", f"{branch}:{file_path}")])
+    return _blob_text(blob)
+
+
+# 특정 커밋 시점의 여러 파일 내용 한 번에 가져오기
+def get_commit_file_contents(commit_sha, file_paths):
+    """커밋 시점 파일 내용을 별칭 필드로 묶어 조회하는 함수 (다른 스레드의 요청과 함께 한 쿼리로 보냄)"""
+    if not file_paths:
+        return {}
+    blobs = _batcher.fetch([("expression", f"{commit_sha}:{path}") for path in file_paths])
+    file_contents = {}
+    for path, blob in zip(file_paths, blobs):
+        content = _blob_text(blob)
+        if content is not None:
+            file_contents[path] = content
+    return file_contents
+
+
+# 특정 커밋 시점의 여러 파일을 blob SHA로 가져오기 (github_api.get_commit_file_blobs와 같은 형식)
+def get_commit_file_blobs(commit_sha, file_paths):
+    """
+    커밋 시점 파일의 blob SHA를 반환하는 함수 (텍스트 파일만, {경로: blob SHA})
+    - 트리 조회 없이 "<커밋>:<경로>" 표현식으로 SHA와 내용을 한 번에 받아 캐시에 저장
+    """
+    if not file_paths:
+        return {}
+    blobs = _batcher.fetch([("expression", f"{commit_sha}:{path}") for path in file_paths])
+    return {path: blob["oid"] for path, blob in zip(file_paths, blobs) if _blob_text(blob) is not None}
+
+
+# blob SHA로 파일 내용 가져오기 (캐시에 없으면 다른 요청과 묶어서 조회)
+def get_blob_content(blob_sha):
+    found, cached = lookup_blob_content(blob_sha)
+    if found:
+        return cached
+    blob, = _batcher.fetch([("oid", blob_sha)])
+    return _blob_text(blob)
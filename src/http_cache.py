@@ -0,0 +1,82 @@
+import threading
+import requests
+from requests.structures import CaseInsensitiveDict
+from blob_cache import BlobCache
+from config import GITHUB_HTTP_CACHE_PATH, GITHUB_HTTP_CACHE_MAX_BYTES
+
+# ✅ 저장된 응답을 다시 사용할 때 필요한 헤더 (페이지네이션 Link 포함)
+_STORED_HEADERS = ("Content-Type", "ETag", "Last-Modified", "Link")
+
+
+class ConditionalCache:
+    """
+    URL별 검증자(ETag / Last-Modified)와 응답 본문을 저장하는 조건부 요청 캐시
+    - 다음 요청에 If-None-Match / If-Modified-Since를 붙이고, 304 Not Modified면 저장된 본문으로 응답을 만듦
+    - 저장소는 BlobCache(SQLite LRU)를 그대로 사용
+    - 검증자가 있는 JSON 응답만 저장 (tarball 등은 제외)
+    """
+
+    def __init__(self, path=GITHUB_HTTP_CACHE_PATH, max_bytes=GITHUB_HTTP_CACHE_MAX_BYTES):
+        self.entries = BlobCache(path=path, max_bytes=max_bytes)
+        self.not_modified = 0
+
+    @staticmethod
+    def cache_key(url, params=None):
+        """쿼리 파라미터까지 포함한 최종 URL"""
+        return requests.Request("GET", url, params=params).prepare().url
+
+    def lookup(self, key):
+        found, entry = self.entries.lookup(f"http:{key}")
+        return entry if found else None
+
+    @staticmethod
+    def conditional_headers(entry):
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def store(self, key, response):
+        """검증자가 있는 200 JSON 응답 저장"""
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if response.status_code != 200 or not (etag or last_modified):
+            return
+        if "json" not in response.headers.get("Content-Type", ""):
+            return
+        self.entries.store(f"http:{key}", {
+            "etag": etag,
+            "last_modified": last_modified,
+            "headers": {name: response.headers[name] for name in _STORED_HEADERS if name in response.headers},
+            "body": response.text,
+        })
+
+    def replay(self, entry, not_modified):
+        """304 응답을 저장된 본문의 200 응답으로 바꿈 (레이트 리밋 등 나머지 헤더는 304 응답의 값 사용)"""
+        self.not_modified += 1
+        response = requests.Response()
+        response.status_code = 200
+        response.headers = CaseInsensitiveDict({**not_modified.headers, **entry["headers"]})
+        response._content = entry["body"].encode("utf-8")
+        response.encoding = "utf-8"
+        response.url = not_modified.url
+        response.request = not_modified.request
+        response.elapsed = not_modified.elapsed
+        return response
+
+    def stats(self):
+        return {**self.entries.stats(), "not_modified": self.not_modified}
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+# 실행 중 공유하는 GitHub 조건부 요청 캐시 가져오기 (GITHUB_HTTP_CACHE_PATH가 비어 있으면 비활성화)
+def get_github_http_cache():
+    global _cache
+    with _cache_lock:
+        if _cache is None and GITHUB_HTTP_CACHE_PATH:
+            _cache = ConditionalCache()
+    return _cache
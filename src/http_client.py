@@ -0,0 +1,145 @@
+import logging
+import random
+import time
+import requests
+from requests.adapters import HTTPAdapter
+from http_cache import get_github_http_cache
+from metrics import metrics
+from rate_limiter import TokenBucket
+from config import (
+    GITHUB_HEADERS, NOTION_HEADERS, NOTION_REQUESTS_PER_SECOND, NOTION_BURST,
+    HTTP_POOL_SIZE, HTTP_MAX_RETRIES, HTTP_BACKOFF_BASE, HTTP_BACKOFF_MAX, HTTP_TIMEOUT,
+)
+
+logger = logging.getLogger(__name__)
+
+# ✅ 일시적인 오류로 보고 재시도하는 상태 코드
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# ✅ 여러 번 보내도 결과가 같은 메서드 (그 외 메서드는 요청마다 idempotent=True로 지정해야 5xx/연결 오류를 재시도)
+IDEMPOTENT_METHODS = {"GET", "HEAD", "PUT", "DELETE", "OPTIONS"}
+
+
+class ApiClient:
+    """
+    서비스(GitHub, Notion)별로 하나씩 사용하는 HTTP 클라이언트
+    - requests.Session 커넥션 풀 재사용 (keep-alive)
+    - 429/5xx, 연결 오류는 지수 백오프 + 지터로 재시도, Retry-After 헤더가 있으면 우선 적용
+    - 다시 보내면 결과가 달라지는 요청(POST/PATCH: 페이지 생성, 블록 추가)은 서버에 반영된 뒤 오류가 났을 수 있으므로
+      요청이 처리되지 않은 것이 확실한 경우(429, 연결 시간 초과)만 재시도 (idempotent=True로 지정한 요청은 모두 재시도)
+    - retry_rate_limited=False 이면 429를 재시도하지 않고 바로 반환 (호출하는 쪽에서 모든 스레드가 함께 대기)
+    - 모든 요청에 timeout 적용
+    - rate_limiter가 있으면 재시도를 포함한 모든 요청 전에 토큰을 받음
+    - 모든 시도를 metrics에 기록 (엔드포인트별 횟수, 상태 코드, 지연, 송수신 바이트, 재시도)
+    - response_cache(조건부 요청 캐시를 반환하는 함수)가 있으면 get(revalidate=True) 요청을 ETag/Last-Modified로 재검증
+    """
+
+    def __init__(self, name, headers, pool_size=HTTP_POOL_SIZE, max_retries=HTTP_MAX_RETRIES,
+                 backoff_base=HTTP_BACKOFF_BASE, backoff_max=HTTP_BACKOFF_MAX, timeout=HTTP_TIMEOUT,
+                 rate_limiter=None, response_cache=None, retry_rate_limited=True):
+        self.name = name
+        self.retry_rate_limited = retry_rate_limited
+        self.rate_limiter = rate_limiter
+        self.response_cache = response_cache
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = timeout
+
+        self.session = requests.Session()
+        self.session.headers.update(headers)
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def _backoff(self, attempt, response=None):
+        """Retry-After가 있으면 그 값을, 없으면 지수 백오프 + full jitter 대기 시간 반환"""
+        if response is not None:
+            retry_after = response.headers.get("Retry-After")
+            if retry_after:
+                try:
+                    return float(retry_after)
+                except ValueError:
+                    pass
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def _retry_status_codes(self, idempotent):
+        codes = RETRY_STATUS_CODES if idempotent else {429}
+        return codes if self.retry_rate_limited else codes - {429}
+
+    def request(self, method, url, idempotent=None, **kwargs):
+        """
+        요청 하나를 보내고 응답을 반환 (재시도 후에도 연결 오류면 예외 발생)
+        - idempotent: 다시 보내도 안전한 요청인지 (None이면 메서드로 판단)
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        if idempotent is None:
+            idempotent = method in IDEMPOTENT_METHODS
+        retry_status_codes = self._retry_status_codes(idempotent)
+
+        for attempt in range(self.max_retries + 1):
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+            started_at = time.perf_counter()
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                metrics.record_request(self.name, method, url, None, time.perf_counter() - started_at)
+                # ✅ 연결 시간 초과는 요청이 전송되지 않은 것이므로 메서드와 상관없이 재시도
+                if attempt == self.max_retries or not (idempotent or isinstance(e, requests.ConnectTimeout)):
+                    raise
+                delay = self._backoff(attempt)
+                metrics.count("http_retries", service=self.name, reason=e.__class__.__name__)
+                logger.warning("⏳ %s 연결 오류(%s): %.1f초 후 재시도합니다.", self.name, e.__class__.__name__, delay)
+                time.sleep(delay)
+                continue
+
+            body = response.request.body
+            metrics.record_request(
+                self.name, method, url, response.status_code, time.perf_counter() - started_at,
+                bytes_sent=len(body) if body else 0, bytes_received=len(response.content),
+            )
+            if response.status_code == 429:
+                metrics.count("rate_limited", service=self.name)
+
+            if response.status_code not in retry_status_codes or attempt == self.max_retries:
+                return response
+
+            delay = self._backoff(attempt, response)
+            metrics.count("http_retries", service=self.name, reason=str(response.status_code))
+            logger.warning("⏳ %s API %s 응답: %.1f초 후 재시도합니다.", self.name, response.status_code, delay)
+            time.sleep(delay)
+
+        return response
+
+    def get(self, url, revalidate=False, **kwargs):
+        """GET 요청 (revalidate=True면 저장된 응답의 검증자로 조건부 요청, 304면 저장된 본문 반환)"""
+        cache = self.response_cache() if revalidate and self.response_cache else None
+        if cache is None:
+            return self.request("GET", url, **kwargs)
+
+        key = cache.cache_key(url, kwargs.get("params"))
+        entry = cache.lookup(key)
+        if entry is not None:
+            kwargs["headers"] = {**(kwargs.get("headers") or {}), **cache.conditional_headers(entry)}
+        response = self.request("GET", url, **kwargs)
+        if response.status_code == 304 and entry is not None:
+            metrics.count("http_not_modified", service=self.name)
+            return cache.replay(entry, response)
+        cache.store(key, response)
+        return response
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def patch(self, url, **kwargs):
+        return self.request("PATCH", url, **kwargs)
+
+    def delete(self, url, **kwargs):
+        return self.request("DELETE", url, **kwargs)
+
+
+# ✅ 실행 중 공유하는 서비스별 클라이언트
+# ✅ GitHub 레이트 리밋(403/429)은 github_api가 모든 스레드의 요청을 함께 멈추고 재시도하므로 여기서는 재시도하지 않음
+github_client = ApiClient("GitHub", GITHUB_HEADERS, response_cache=get_github_http_cache, retry_rate_limited=False)
+notion_client = ApiClient("Notion", NOTION_HEADERS, rate_limiter=TokenBucket(NOTION_REQUESTS_PER_SECOND, NOTION_BURST))
@@ -0,0 +1,250 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from config import JOB_JOURNAL_PATH, JOB_MAX_ATTEMPTS, HTTP_MAX_RETRIES, HTTP_BACKOFF_BASE, HTTP_BACKOFF_MAX
+from metrics import metrics
+from notion_api import append_block_children, create_problem_page, get_block_children, is_permanent_error
+
+logger = logging.getLogger(__name__)
+
+
+class JobJournal:
+    """
+    새 문제 페이지 생성 작업의 선기록(write-ahead) 저널 (SQLite)
+    - fetched: 페이지 생성 요청 본문과 블록 묶음을 먼저 기록 (아직 페이지 없음)
+    - created: 페이지 생성 완료 (페이지 ID, chunks_done = 페이지에 추가된 블록 묶음 수)
+    - done: 모든 블록 추가 완료 (요청 본문과 블록 묶음은 삭제)
+    - failed: 영구적인 오류(4xx 검증 실패 등)가 나거나 max_attempts번 실패한 작업 (시작할 때 자동으로 재시도하지 않음)
+    - 실패할 때마다 시도 횟수(attempts)와 마지막 오류(last_error)를 기록
+    - 각 단계는 Notion 요청이 성공한 직후 커밋하므로, 실행이 중단되어도 다음 실행이 남은 단계부터 이어서 진행
+    """
+
+    def __init__(self, path=JOB_JOURNAL_PATH, max_attempts=JOB_MAX_ATTEMPTS):
+        self.path = path
+        self.max_attempts = max(max_attempts, 1)
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            " title TEXT PRIMARY KEY,"
+            " state TEXT NOT NULL,"
+            " page_id TEXT,"
+            " payload TEXT,"
+            " chunks TEXT,"
+            " chunks_done INTEGER NOT NULL DEFAULT 0,"
+            " content_hash TEXT,"
+            " attempts INTEGER NOT NULL DEFAULT 0,"
+            " last_error TEXT,"
+            " updated_at REAL NOT NULL)"
+        )
+        # ✅ 이전 버전에서 만든 저널에는 시도 횟수/마지막 오류 열이 없으므로 추가
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+        if "attempts" not in columns:
+            self._conn.execute("ALTER TABLE jobs ADD COLUMN attempts INTEGER NOT NULL DEFAULT 0")
+        if "last_error" not in columns:
+            self._conn.execute("ALTER TABLE jobs ADD COLUMN last_error TEXT")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_state ON jobs (state)")
+        self._conn.commit()
+
+    def _execute(self, sql, params):
+        with self._lock:
+            self._conn.execute(sql, params)
+            self._conn.commit()
+
+    def get(self, title):
+        """작업 상태 dict 반환 (없으면 None)"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT state, page_id, payload, chunks, chunks_done, content_hash, attempts, last_error FROM jobs WHERE title = ?",
+                (title,),
+            ).fetchone()
+        if row is None:
+            return None
+        state, page_id, payload, chunks, chunks_done, content_hash, attempts, last_error = row
+        return {
+            "title": title,
+            "state": state,
+            "page_id": page_id,
+            "payload": json.loads(payload) if payload else None,
+            "chunks": json.loads(chunks) if chunks else [],
+            "chunks_done": chunks_done,
+            "content_hash": json.loads(content_hash) if content_hash else None,
+            "attempts": attempts,
+            "last_error": last_error,
+        }
+
+    def record_fetched(self, title, payload, chunks, content_hash):
+        """페이지 생성 전에 요청 본문(블록 제외)과 블록 묶음 기록"""
+        payload = {key: value for key, value in payload.items() if key != "children"}
+        self._execute(
+            "INSERT OR REPLACE INTO jobs (title, state, page_id, payload, chunks, chunks_done, content_hash, attempts, last_error, updated_at)"
+            " VALUES (?, 'fetched', NULL, ?, ?, 0, ?, 0, NULL, ?)",
+            (title, json.dumps(payload, ensure_ascii=False), json.dumps(chunks, ensure_ascii=False),
+             json.dumps(content_hash), time.time()),
+        )
+
+    def record_created(self, title, page_id, chunks_done):
+        self._execute(
+            "UPDATE jobs SET state = 'created', page_id = ?, chunks_done = ?, updated_at = ? WHERE title = ?",
+            (page_id, chunks_done, time.time(), title),
+        )
+
+    def record_appended(self, title, chunks_done):
+        self._execute("UPDATE jobs SET chunks_done = ?, updated_at = ? WHERE title = ?", (chunks_done, time.time(), title))
+
+    def record_done(self, title):
+        self._execute(
+            "UPDATE jobs SET state = 'done', payload = NULL, chunks = NULL, updated_at = ? WHERE title = ?",
+            (time.time(), title),
+        )
+
+    def record_failure(self, title, error, permanent=False):
+        """
+        실패한 시도 기록 (시도 횟수 + 1, 마지막 오류)
+        - permanent=True 이거나 시도 횟수가 max_attempts에 도달하면 failed 상태로 바꿈 (반환값: failed 여부)
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT attempts FROM jobs WHERE title = ?", (title,)).fetchone()
+            if row is None:
+                return False
+            attempts = row[0] + 1
+            failed = permanent or attempts >= self.max_attempts
+            self._conn.execute(
+                "UPDATE jobs SET attempts = ?, last_error = ?, state = CASE WHEN ? THEN 'failed' ELSE state END,"
+                " updated_at = ? WHERE title = ?",
+                (attempts, error, failed, time.time(), title),
+            )
+            self._conn.commit()
+        return failed
+
+    def unfinished(self):
+        """다시 시도할 작업(완료/실패가 아닌 작업)의 제목 목록 (오래된 순)"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT title FROM jobs WHERE state NOT IN ('done', 'failed') ORDER BY updated_at"
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def failed(self):
+        """실패한 작업 목록 [(제목, 시도 횟수, 마지막 오류)] (오래된 순)"""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT title, attempts, last_error FROM jobs WHERE state = 'failed' ORDER BY updated_at"
+            ).fetchall()
+
+
+def _applied_chunks(page_id, chunks):
+    """
+    페이지에 실제로 추가된 블록 묶음 수를 확인하는 함수 (확인할 수 없으면 None)
+    - 블록 묶음은 요청 하나로 한 번에 추가되므로, 최상위 블록 수가 앞에서부터 k개 묶음의 합과 같으면 k개가 반영된 것
+    """
+    children = get_block_children(page_id)
+    if children is None:
+        return None
+
+    applied = 0
+    for index, chunk in enumerate(chunks):
+        if applied == len(children):
+            return index
+        applied += len(chunk)
+    return len(chunks) if applied == len(children) else None
+
+
+def _fail(journal, title, errors, permanent=False):
+    """마지막 오류를 저널에 기록하고 None 반환 (4xx 등 다시 보내도 같은 결과인 오류는 바로 failed 처리)"""
+    status, message = errors[-1] if errors else (None, "알 수 없는 오류")
+    permanent = permanent or is_permanent_error(status)
+    error = (f"{status}: {message}" if status is not None else message)[:500]
+    if journal.record_failure(title, error, permanent=permanent):
+        metrics.count("journal_failed_jobs")
+        logger.error("❌ %s 페이지 생성 작업을 실패로 기록했습니다 (다시 시도하지 않음): %s", title, error)
+    return None
+
+
+def run_create_job(journal, title_index, title, resumed=False):
+    """
+    저널에 기록된 페이지 생성 작업을 남은 단계부터 실행하는 함수 (성공 시 페이지 ID, 실패 시 None)
+    - resumed=True: 이전 실행에서 중단된 작업 (마지막 기록 이후의 요청이 반영되었는지 페이지를 조회해 확인한 뒤 이어서 진행)
+    - 블록 추가가 일시적인 오류로 실패하면 같은 방법으로 페이지를 확인한 뒤 다시 시도 (같은 묶음을 두 번 추가하지 않음)
+    - 완료되면 제목 인덱스에 페이지 ID와 (저널에 기록된 내용의) 해시를 기록
+    - 실패하면 시도 횟수와 오류를 저널에 기록 (영구적인 오류이거나 시도 횟수를 모두 쓰면 failed 상태가 되어 다시 시도하지 않음)
+    """
+    job = journal.get(title)
+    chunks = job["chunks"]
+    page_id = job["page_id"]
+    chunks_done = job["chunks_done"]
+    requests = 0
+
+    # ✅ 생성 요청 후 응답을 기록하기 전에 중단되었다면, 같은 제목으로 생성된 페이지를 이어서 사용
+    if page_id is None and resumed:
+        entry = title_index.get(title)
+        if entry is not None:
+            page_id = entry["id"]
+
+    if page_id is None:
+        payload = {**job["payload"], "children": chunks[0]} if chunks else job["payload"]
+        errors = []
+        page_id = create_problem_page(payload, errors=errors)
+        if page_id is None:
+            return _fail(journal, title, errors)
+        requests += 1
+        chunks_done = 1 if chunks else 0
+        journal.record_created(title, page_id, chunks_done)
+    elif resumed:
+        chunks_done = _applied_chunks(page_id, chunks)
+        if chunks_done is None:
+            logger.warning("⚠️ %s 페이지의 블록이 저널 기록과 맞지 않아 이어서 추가할 수 없습니다.", title)
+            return _fail(journal, title, [(None, "블록이 저널 기록과 맞지 않음")], permanent=True)
+        journal.record_created(title, page_id, chunks_done)
+        metrics.count("journal_resumed_jobs")
+        logger.info("♻️ %s 페이지 이어서 진행: 블록 묶음 %d/%d개 반영됨", title, chunks_done, len(chunks))
+
+    index = chunks_done
+    rechecks = 0
+    while index < len(chunks):
+        errors = []
+        if append_block_children(page_id, chunks[index], errors=errors) is not None:
+            requests += 1
+            index += 1
+            journal.record_appended(title, index)
+            continue
+
+        # ✅ 5xx/연결 오류는 요청이 반영된 뒤 실패했을 수 있으므로, 페이지의 블록을 확인해 실제로 추가된 묶음 다음부터 다시 진행
+        if is_permanent_error(errors[-1][0]) or rechecks >= HTTP_MAX_RETRIES:
+            return _fail(journal, title, errors)
+        rechecks += 1
+        time.sleep(min(HTTP_BACKOFF_MAX, HTTP_BACKOFF_BASE * (2 ** rechecks)))
+        applied = _applied_chunks(page_id, chunks)
+        if applied is None or applied < index:
+            logger.warning("⚠️ %s 페이지의 블록이 저널 기록과 맞지 않아 이어서 추가할 수 없습니다.", title)
+            return _fail(journal, title, [(None, "블록이 저널 기록과 맞지 않음")], permanent=True)
+        if applied > index:
+            logger.info("♻️ %s 페이지: 실패로 응답한 블록 묶음이 반영되어 있어 다음 묶음부터 진행합니다.", title)
+            metrics.count("journal_recovered_appends")
+            index = applied
+            journal.record_appended(title, index)
+
+    journal.record_done(title)
+    title_index.record(title, page_id, job["content_hash"])
+    logger.info("✅ Notion에 문제의 설명 및 코드 추가 완료: %s (요청 %d회)", title, requests)
+    return page_id
+
+
+_journal = None
+_journal_lock = threading.Lock()
+
+# 실행 중 공유하는 작업 저널 가져오기 (JOB_JOURNAL_PATH가 비어 있으면 비활성화)
+def get_job_journal():
+    global _journal
+    with _journal_lock:
+        if _journal is None and JOB_JOURNAL_PATH:
+            _journal = JobJournal()
+    return _journal
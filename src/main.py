@@ -1,8 +1,26 @@
-from github_api import get_all_commits, get_commit_files, get_file_content
-from notion_api import fetch_notion_database, add_problem_to_notion
+from commit_source import iter_commits, get_commit_files, get_commit_file_blobs, get_blob_content, get_directory_files
+from notion_api import schema_cache
+from page_updater import sync_problem_page
+from records import FileRef, ProblemFiles, ProblemRecord
+from title_index import load_title_index
 from utils import extract_difficulty, extract_site_name_from_path, extract_problem_link, extract_submission_date
-from config import GITHUB_OWNER, GITHUB_REPO
-import os
+from blob_cache import get_blob_cache
+from http_cache import get_github_http_cache
+from job_journal import get_job_journal, run_create_job
+from block_cache import get_block_cache
+from notion_scheduler import NotionWriteQueue
+from http_client import notion_client
+from metrics import metrics
+from sync_state import load_sync_state, save_sync_state, reset_sync_state, since_with_margin
+from config import GITHUB_OWNER, GITHUB_REPO, GITHUB_MAX_WORKERS, LOG_LEVEL, METRICS_REPORT_PATH, METRICS_PROMETHEUS_PATH
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import argparse
+import functools
+import itertools
+import logging
+
+logger = logging.getLogger("main")
 
 # ✅ Notion API에서 지원하는 언어 매핑
 NOTION_LANGUAGE_MAP = {
@@ -20,153 +38,479 @@ NOTION_LANGUAGE_MAP = {
     "rs": "rust"
 }
 
-def extract_problem_info(file_contents, existing_titles, difficulty, latest_commit_per_problem):
+def classify_commit_files(files, skip_titles=(), keep_code_only=False):
     """
-    `.md` 파일에서 문제 정보를 추출하여 문제별 데이터를 저장하는 함수
+    커밋의 변경 파일 목록 [(경로, status)]을 한 번만 훑어 문제 폴더별로 묶는 함수 (파일 내용 요청 전에 실행)
+    - 삭제된 파일, 최상단 README.md, 지원하지 않는 확장자(이미지 등), 이미 Notion에 있는 문제는 제외
+    - 설명(.md) 파일이 바뀐 문제만 남김 (코드 파일만 바뀐 문제는 업로드 대상이 아님)
+    - keep_code_only=True 이면 코드 파일만 바뀐 문제 폴더도 남김 (업데이트 모드, 설명 파일은 폴더 목록에서 찾음)
+    - 반환값: {(사이트명, 문제 이름): {"directory": 문제 폴더, "readme": 설명 파일 경로 또는 None, "code_files": [(경로, 언어)]}}
     """
-    problem_dict = {}
+    groups = {}
+    for filename, status in files:
+        if status == "removed":
+            continue
+
+        directory, _, basename = filename.rpartition("/")
+        ext = basename.rpartition(".")[2]
+        if ext != "md" and ext not in NOTION_LANGUAGE_MAP:
+            continue
+        if ext == "md" and filename.count("/") < 2:  # ✅ 최상단 README.md 파일 제외
+            logger.debug("⚠️ 최상단의 %s 파일은 제외합니다.", filename)
+            continue
+
+        # ✅ 폴더명 = 문제 제목, 기존 Notion 데이터베이스에 존재하는 문제는 건너뜀 (중복 방지)
+        problem_name = directory.rpartition("/")[2]
+        if problem_name in skip_titles:
+            if ext == "md":
+                logger.debug("✅ %s 문제는 이미 Notion에 존재하므로 건너뜀.", problem_name)
+            continue
+
+        group = groups.setdefault(
+            (extract_site_name_from_path(filename), problem_name), {"directory": directory, "readme": None, "code_files": []},
+        )
+        if ext == "md":
+            group["readme"] = filename
+        else:
+            group["code_files"].append((filename, NOTION_LANGUAGE_MAP[ext]))
 
-    for filename, content in file_contents.items():
-        if filename.endswith(".md"):  # ✅ 문제 설명 파일 (README.md)
-            if filename.count("/") < 2:  # ✅ 최상단 README.md 파일 제외
-                print(f"⚠️ 최상단의 {filename} 파일은 제외합니다.")
-                continue
-
-            # ✅ 문제 링크, 제출 일자 추출
-            problem_link = extract_problem_link(content)
-            submission_date = extract_submission_date(content)
-
-            # ✅ 문제 이름과 사이트명 추출
-            site_name = extract_site_name_from_path(filename)
-            problem_name = os.path.basename(os.path.dirname(filename))  # 폴더명 = 문제 제목
-
-            # ✅ 기존 Notion 데이터베이스에 존재하는 경우 최신 커밋인지 확인
-            if problem_name in existing_titles:
-                print(f"✅ {problem_name} 문제는 이미 Notion에 존재하므로 건너뜀.")
-                continue  # 중복 방지
-
-            # ✅ 동일 문제의 기존 코드 블록 유지 (과거 풀이 보존)
-            previous_code_blocks = latest_commit_per_problem.get(problem_name, {}).get("code_blocks", [])
-
-            # ✅ 문제 정보 저장 (기존 코드 블록 유지)
-            problem_dict[problem_name] = {
-                "description": content,  # 최신 설명 유지
-                "code_blocks": previous_code_blocks,  # 기존 코드 유지
-                "difficulty": difficulty,
-                "site_name": site_name,
-                "problem_link": problem_link,
-                "submission_date": submission_date
-            }
+    # ✅ 코드 파일만 바뀐 폴더는 최상단(사이트 폴더 바깥)이 아닐 때만 문제 폴더로 봄
+    return {
+        key: group for key, group in groups.items()
+        if group["readme"] or (keep_code_only and "/" in group["directory"])
+    }
 
-    return problem_dict
 
-
-def match_code_files(file_contents, problem_dict):
+def list_problem_folders(commit_sha, problem_files, errors=None):
+    """
+    문제 폴더별로 커밋 시점 폴더의 모든 설명/코드 파일을 채우는 함수 (업데이트 모드)
+    - 페이지의 풀이 코드 구역은 기록된 코드 파일로 통째로 다시 만들어지므로, 커밋에서 바뀐 파일만 쓰면 다른 풀이가 지워짐
+    - 설명 파일이 바뀌지 않은 폴더는 폴더의 README.md(없으면 첫 .md 파일)를 설명으로 사용
+    - 폴더 목록을 가져오지 못한 문제는 제외하고 errors에 추가 (일부 풀이만으로 페이지를 덮어쓰지 않음)
     """
-    문제별 코드 파일을 찾아 해당 문제에 연결하는 함수 (여러 풀이 유지)
+    listed = {}
+    for key, group in problem_files.items():
+        folder_files = get_directory_files(commit_sha, group["directory"])
+        if folder_files is None:
+            logger.error("❌ 커밋 %s의 %s 폴더 목록을 가져오지 못했습니다.", commit_sha, group["directory"])
+            if errors is not None:
+                errors.append(f"커밋 {commit_sha}의 {group['directory']} 폴더 목록 조회 실패")
+            continue
+
+        readmes = sorted(path for path in folder_files if path.endswith(".md"))
+        readme = group["readme"] or next((path for path in readmes if path.endswith("/README.md")), readmes[0] if readmes else None)
+        if readme is None:
+            continue  # 설명 파일이 없는 폴더는 문제 폴더가 아님
+        code_files = [
+            (path, NOTION_LANGUAGE_MAP[path.rpartition(".")[2]])
+            for path in sorted(folder_files) if path.rpartition(".")[2] in NOTION_LANGUAGE_MAP
+        ]
+        listed[key] = {**group, "readme": readme, "code_files": code_files}
+    return listed
+
+
+def fetch_problem_files(commit_sha, files, skip_titles=(), errors=None, whole_folder=False):
     """
-    for filename, content in file_contents.items():
-        ext = filename.split(".")[-1]  # 확장자 추출
-        problem_name = os.path.basename(os.path.dirname(filename))  # 폴더명 = 문제 제목
+    변경 파일 중 업로드할 문제의 설명/코드 파일만 커밋 시점 기준으로 가져오는 함수
+    - 내용은 캐시에 받아 두고 blob SHA만 반환 (업로드 단계에서 load_problem_data로 다시 읽음)
+    - 커밋에서 바뀐(삭제되지 않은) 파일은 커밋 시점에 있어야 하므로, 읽지 못한 파일이 있으면 errors에 추가
+    - whole_folder=True 이면 바뀐 파일이 있는 문제 폴더의 모든 설명/코드 파일을 가져옴 (업데이트 모드)
+    - 반환값: [ProblemFiles]
+    """
+    problem_files = classify_commit_files(files, skip_titles, keep_code_only=whole_folder)
+    if whole_folder and problem_files:
+        with metrics.stage("fetch_file_contents"):
+            problem_files = list_problem_folders(commit_sha, problem_files, errors)
+    file_paths = [path for group in problem_files.values() for path in [group["readme"], *(path for path, _ in group["code_files"])]]
+    metrics.count("commit_files", len(file_paths), result="fetched")
+    metrics.count("commit_files", max(len(files) - len(file_paths), 0), result="skipped")
+    if not file_paths:
+        return []
+
+    with metrics.stage("fetch_file_contents"):
+        file_blobs = get_commit_file_blobs(commit_sha, file_paths)
+    missing = [path for path in file_paths if path not in file_blobs]
+    if missing:
+        logger.error("❌ 커밋 %s의 파일 %d개를 읽지 못했습니다: %s", commit_sha, len(missing), ", ".join(missing[:5]))
+        if errors is not None:
+            errors.append(f"커밋 {commit_sha}의 파일 {len(missing)}개 조회 실패")
+
+    problems = []
+    for (site_name, problem_name), group in problem_files.items():
+        readme_sha = file_blobs.get(group["readme"])
+        if readme_sha is None:
+            continue  # 커밋 시점에 없거나 텍스트가 아닌 설명 파일
+        code_files = tuple(
+            FileRef(path, file_blobs[path], language) for path, language in group["code_files"] if path in file_blobs
+        )
+        problems.append(ProblemFiles(site_name, problem_name, FileRef(group["readme"], readme_sha), code_files))
+    return problems
 
-        if problem_name in problem_dict and ext in NOTION_LANGUAGE_MAP:
-            # ✅ 기존 코드 블록 유지 + 새로운 코드 추가
-            problem_dict[problem_name]["code_blocks"].append({
-                "language": NOTION_LANGUAGE_MAP[ext],
-                "content": content
-            })
-            print(f"✅ {problem_name}의 {ext.upper()} 코드 추가 완료.")
 
-    return problem_dict
+def fetch_commit_files(commit, skip_titles=(), errors=None, whole_folder=False):
+    """
+    커밋의 변경 파일 목록을 가져와 업로드할 문제의 파일만 한 번 가져오는 함수
+    - errors: 파일 목록이나 내용을 가져오지 못하면 오류 메시지를 추가할 목록 (여러 스레드에서 함께 사용)
+    - whole_folder: 바뀐 파일 대신 문제 폴더의 모든 파일 사용 (fetch_problem_files 참고)
+    """
+    # ✅ 커밋 내 변경된 파일 목록 가져오기 (웹훅 페이로드처럼 이미 알고 있으면 요청하지 않음)
+    files = commit.files
+    if files is None:
+        with metrics.stage("fetch_commit_files"):
+            files = get_commit_files(commit.sha)
+    if files is None:
+        if errors is not None:
+            errors.append(f"커밋 {commit.sha}의 변경 파일 목록 조회 실패")
+        return []
+    if not files:
+        logger.warning("⚠️ 커밋 %s에 변경된 파일이 없습니다.", commit.sha)
+        return []
 
+    # ✅ 경로만으로 문제별로 묶고 필요 없는 파일을 걸러낸 뒤 남은 파일만 다운로드
+    return fetch_problem_files(commit.sha, files, skip_titles, errors, whole_folder)
 
-def process_commit(commit, existing_titles, latest_commit_per_problem):
-    """GitHub 커밋을 처리하여 Notion에 추가하는 함수"""
-    commit_sha = commit["sha"]
-    commit_message = commit["commit"]["message"]
 
-    print(f"\n🔍 최근 커밋 SHA: {commit_sha}")
-    print(f"📌 커밋 메시지: {commit_message}")
+@metrics.timed("extract")
+def process_commit(commit, problem_files):
+    """커밋에서 바뀐 문제 폴더별로 문제 기록(ProblemRecord)을 만드는 함수"""
+    logger.debug("🔍 최근 커밋 SHA: %s", commit.sha)
+    logger.debug("📌 커밋 메시지: %s", commit.message)
 
     # ✅ 난이도 추출
-    difficulty = extract_difficulty(commit_message)
+    difficulty = extract_difficulty(commit.message)
 
-    # ✅ 커밋 내 변경된 파일 목록 가져오기
-    files = get_commit_files(commit_sha)
-    if not files:
-        print(f"⚠️ 커밋 {commit_sha}에 변경된 파일이 없습니다.")
-        return {}
+    # ✅ 문제 기록 저장 (코드 파일은 여러 풀이 유지)
+    problem_dict = {}
+    for files in problem_files:
+        problem_dict[files.problem_name] = ProblemRecord.from_files(files, difficulty, commit.date)
+        logger.debug("✅ %s 문제 추출 완료 (코드 %d개).", files.problem_name, len(files.code_files))
+
+    return problem_dict
 
-    # ✅ 모든 파일 내용 가져오기
-    file_contents = {filename: get_file_content(filename) for filename, _ in files}
 
-    # ✅ 문제 정보 추출 (기존 코드 유지)
-    problem_dict = extract_problem_info(file_contents, existing_titles, difficulty, latest_commit_per_problem)
+def merge_problem(latest_commit_per_problem, problem_name, record):
+    """
+    문제별로 가장 최신 커밋의 설명을 남기고, 과거 커밋의 풀이 코드는 파일 단위로 보존하는 함수
+    """
+    previous = latest_commit_per_problem.get(problem_name)
+    if previous is None:
+        latest_commit_per_problem[problem_name] = record
+        return
 
-    # ✅ 코드 파일 매칭 (여러 풀이 유지)
-    problem_dict = match_code_files(file_contents, problem_dict)
+    if record.commit_date > previous.commit_date:
+        newer, older = record, previous
+    else:
+        logger.debug("✅ %s 문제의 최신 커밋(%s)이 이미 존재함. 과거 풀이만 보존.", problem_name, previous.commit_date)
+        newer, older = previous, record
 
-    return problem_dict
+    # ✅ 같은 파일은 최신 커밋의 내용만 유지 (중복 추가 방지)
+    latest_commit_per_problem[problem_name] = newer.merge_older(older)
 
 
-def filter_latest_commits(commits, latest_commit_per_problem):
+def iter_commit_files(commits, max_workers=GITHUB_MAX_WORKERS, fetch_files=fetch_commit_files):
+    """
+    커밋을 받는 대로 파일 조회를 시작하고 (커밋, 문제별 파일)을 커밋 순서대로 내보내는 제너레이터
+    - 파일 조회는 max_workers개의 스레드로 병렬 처리 (fetch_files: CommitRef → [ProblemFiles])
+    - 미리 조회하는 커밋은 max_workers * 2개까지만 유지 (커밋 목록 전체를 기다리거나 쌓아 두지 않음)
     """
-    기존에 존재하는 문제라면 최신 커밋인지 확인하고 최신 것만 남기는 함수
+    max_workers = max(max_workers, 1)
+    pending = deque()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for commit in commits:
+            pending.append((commit, executor.submit(fetch_files, commit)))
+            if len(pending) >= max_workers * 2:
+                commit, future = pending.popleft()
+                yield commit, future.result()
+        while pending:
+            commit, future = pending.popleft()
+            yield commit, future.result()
+
+
+def iter_latest_problems(commits, existing_titles, max_workers=GITHUB_MAX_WORKERS, fetch_files=fetch_commit_files,
+                         errors=None, whole_folder=False):
     """
-    filtered_commits = []
-    for commit in commits:
-        commit_date = commit["commit"]["committer"]["date"]
+    커밋을 최신순으로 처리하며 (문제 이름, 지금까지 병합된 ProblemRecord)를 내보내는 제너레이터
+    - 문제는 가장 최신 커밋에서 처음 나오므로 바로 업로드를 시작할 수 있음
+    - 과거 커밋에서 같은 문제가 다시 나오면 과거 풀이를 병합한 기록을 다시 내보냄
+    - fetch_files(커밋, skip_titles)는 existing_titles에 있는 문제의 파일을 내려받지 않음
+      (업로드와 동시에 실행되므로 existing_titles는 바뀌지 않는 제목 목록이어야 함, TitleIndex.snapshot())
+    - errors: 커밋의 파일을 가져오지 못하면 오류 메시지를 추가할 목록
+    - whole_folder=True 이면 커밋에서 바뀐 파일 대신 문제 폴더의 모든 파일을 기록 (업데이트 모드: 코드만 바뀐 문제도 포함)
+    """
+    latest_commit_per_problem = {}
+    fetch_files = functools.partial(fetch_files, skip_titles=existing_titles, errors=errors, whole_folder=whole_folder)
+    for commit, problem_files in iter_commit_files(commits, max_workers, fetch_files):
+        if not problem_files:
+            continue
 
-        problem_dict = process_commit(commit, {}, latest_commit_per_problem)
-        for problem_name in problem_dict.keys():
-            if problem_name in latest_commit_per_problem:
-                prev_commit_date = latest_commit_per_problem[problem_name]["commit"]["committer"]["date"]
-                if commit_date <= prev_commit_date:
-                    print(f"✅ {problem_name} 문제의 최신 커밋({commit_date})이 이미 존재함. 건너뜀.")
-                    continue
+        problem_dict = process_commit(commit, problem_files)
+        for problem_name, record in problem_dict.items():
+            merge_problem(latest_commit_per_problem, problem_name, record)
+            # ✅ 기록은 바뀌지 않는(frozen) 값이므로 이후 병합과 상관없이 그대로 내보냄
+            yield problem_name, latest_commit_per_problem[problem_name]
 
-            latest_commit_per_problem[problem_name] = commit
-            filtered_commits.append(commit)
 
-    return filtered_commits
+def collect_latest_problems(commits, existing_titles, max_workers=GITHUB_MAX_WORKERS):
+    """
+    모든 커밋을 한 번씩만 가져와 문제별 최신 기록을 모으는 함수
+    - 커밋별 파일 목록은 한 번만 요청하고, 파일 내용은 업로드 단계에서 캐시에서 읽음
+    """
+    latest_commit_per_problem = {}
+    for problem_name, record in iter_latest_problems(commits, existing_titles, max_workers):
+        latest_commit_per_problem[problem_name] = record
+    return latest_commit_per_problem
 
 
-def upload_to_notion(problem_dict):
+def load_problem_data(record):
+    """
+    문제 기록의 설명/코드 내용을 blob SHA로 읽어 업로드용 데이터로 만드는 함수 (읽지 못하면 None)
+    - 업로드 작업 하나가 실행되는 동안에만 내용을 메모리에 유지
+    """
+    with metrics.stage("load_contents"):
+        description = get_blob_content(record.readme.blob_sha)
+        if description is None:
+            logger.error("❌ %s 문제의 설명 파일을 읽지 못했습니다: %s", record.name, record.readme.path)
+            return None
+
+        code_blocks = []
+        for file in record.code_files:
+            content = get_blob_content(file.blob_sha)
+            if content is None:
+                logger.error("❌ %s 문제의 코드 파일을 읽지 못했습니다: %s", record.name, file.path)
+                return None
+            code_blocks.append({"filename": file.path, "language": file.language, "content": content})
+
+    return {
+        "description": description,
+        "code_blocks": code_blocks,
+        "difficulty": record.difficulty,
+        "site_name": record.site_name,
+        "problem_link": extract_problem_link(description),
+        "submission_date": extract_submission_date(description)
+    }
+
+
+def sync_problem_record(title_index, problem_name, record, update=False):
+    """쓰기 큐 작업 단위: 업로드 직전에 내용을 읽어 Notion 페이지에 반영"""
+    data = load_problem_data(record)
+    if data is None:
+        return False
+    return sync_problem_page(title_index, problem_name, data, update)
+
+
+def print_upload_stats(write_queue, label="Notion 업로드"):
+    stats = write_queue.stats()
+    bucket = notion_client.rate_limiter
+    logger.info(
+        "📤 %s: 성공 %d건, 실패 %d건, 최대 대기열 %d건, %.1f 페이지/분, 요청 %d회 (속도 제한 대기 %.1f초)",
+        label, stats["completed"], stats["failed"], stats["max_queue_depth"], stats["pages_per_second"] * 60,
+        bucket.acquired, bucket.waited_seconds,
+    )
+    logger.info(
+        "⏱️ 페이지별 소요 시간: p50 %.2f초, p95 %.2f초, 최대 %.2f초 (동시 업로드 %d개)",
+        stats["latency_p50"], stats["latency_p95"], stats["latency_max"], write_queue.workers,
+    )
+    return stats
+
+
+def upload_to_notion(problems, title_index, update=False):
+    """
+    추출된 문제 기록을 Notion에 업로드하는 함수
+    - problems: (문제 이름, ProblemRecord) 이터러블 (iter_latest_problems의 결과를 그대로 받아 처음 나온 문제부터 바로 업로드)
+    - 대기 중인 작업은 blob SHA만 가지고 있고, 내용은 작업이 실행될 때 읽음
+    - 페이지별 업로드 작업을 쓰기 큐에 넣고, Notion 요청 속도는 토큰 버킷이 제한
+    - update=True 이면 이미 있는 문제는 바뀐 속성/블록만 수정
+    - 업로드 후 과거 커밋의 풀이가 병합된 문제는 첫 업로드가 끝난 뒤 바뀐 부분만 다시 수정 (페이지 내 순서 보장)
+    - 반환값: 쓰기 큐 통계 (failed에는 추가 수정의 실패도 포함)
+    """
+    if isinstance(problems, dict):
+        problems = problems.items()
+
+    write_queue = NotionWriteQueue()
+    write_queue.start()
+    submitted = {}
+    follow_ups = {}
+    for problem_name, record in problems:
+        fingerprint = record.fingerprint()
+        if problem_name in submitted:
+            if fingerprint != submitted[problem_name]:
+                follow_ups[problem_name] = record
+            continue
+
+        # ✅ 필요한 select 옵션(난이도, 사이트)이 없으면 업로드 전에 추가 (이미 있으면 요청 없음)
+        schema_cache.ensure_select_options({"난이도": {record.difficulty}, "사이트": {record.site_name}})
+
+        if problem_name in title_index:
+            logger.debug("🔄 기존 문제 %s의 변경 사항을 확인합니다.", problem_name)
+        else:
+            logger.debug("🆕 새로운 문제 발견! %s을(를) Notion에 업로드합니다.", problem_name)
+        write_queue.submit(sync_problem_record, title_index, problem_name, record, update)
+        submitted[problem_name] = fingerprint
+    write_queue.join()
+    stats = print_upload_stats(write_queue)
+
+    # ✅ 첫 업로드 이후 과거 풀이가 병합된 문제는 같은 페이지를 바뀐 부분만 수정
+    if follow_ups:
+        logger.info("🔄 과거 커밋의 풀이가 추가된 문제 %d개를 수정합니다.", len(follow_ups))
+        follow_up_queue = NotionWriteQueue()
+        follow_up_queue.start()
+        for problem_name, record in follow_ups.items():
+            follow_up_queue.submit(sync_problem_record, title_index, problem_name, record, True)
+        follow_up_queue.join()
+        stats["failed"] += print_upload_stats(follow_up_queue, label="Notion 추가 수정")["failed"]
+
+    # ✅ 업로드/수정한 페이지의 ID와 내용 해시를 인덱스에 저장
+    title_index.save()
+    return stats
+
+
+def resume_unfinished_jobs(title_index):
+    """
+    이전 실행에서 중단된 페이지 생성 작업을 저널에 기록된 내용으로 마저 진행하는 함수
+    - 커밋을 다시 조회하지 않으므로 동기화 기준점이 이미 지나간 문제도 이어서 완료됨
+    - 완료된 단계(페이지 생성, 추가된 블록 묶음)는 다시 요청하지 않음
+    - 실패로 기록된 작업(영구적인 오류, 시도 횟수 초과)은 개수만 알리고 건너뜀 (문제가 다시 동기화되면 새 작업으로 진행)
     """
-    추출된 문제 데이터를 Notion에 업로드하는 함수
+    journal = get_job_journal()
+    if journal is None:
+        return None
+    failed = journal.failed()
+    if failed:
+        logger.warning("⚠️ 실패로 기록된 페이지 생성 작업 %d개는 자동으로 다시 시도하지 않습니다.", len(failed))
+        for title, attempts, last_error in failed:
+            logger.debug("  - %s (시도 %d회): %s", title, attempts, last_error)
+    titles = journal.unfinished()
+    if not titles:
+        return None
+
+    logger.info("♻️ 중단된 페이지 생성 작업 %d개를 이어서 진행합니다.", len(titles))
+    write_queue = NotionWriteQueue()
+    write_queue.start()
+    for title in titles:
+        write_queue.submit(lambda title: run_create_job(journal, title_index, title, resumed=True) is not None, title)
+    write_queue.join()
+    stats = print_upload_stats(write_queue, label="중단된 작업 재개")
+    title_index.save()
+    return stats
+
+
+def write_run_report():
     """
-    for problem_name, data in problem_dict.items():
-        print(f"🆕 새로운 문제 발견! {problem_name}을(를) Notion에 업로드합니다.")
-        add_problem_to_notion(
-            problem_name,
-            data["description"],
-            data["code_blocks"],
-            data["difficulty"],
-            data["site_name"],
-            data["problem_link"],
-            data["submission_date"]
+    캐시 적중률, Notion 속도 제한 대기 시간을 지표에 기록하고 실행 보고서를 저장하는 함수
+    - JSON: METRICS_REPORT_PATH, Prometheus 텍스트: METRICS_PROMETHEUS_PATH (비어 있으면 저장하지 않음)
+    """
+    cache = get_blob_cache()
+    if cache is not None:
+        stats = cache.stats()
+        metrics.set_gauge("cache_hits", stats["hits"], cache="blob")
+        metrics.set_gauge("cache_misses", stats["misses"], cache="blob")
+        metrics.set_gauge("cache_hit_rate", round(stats["hit_rate"], 4), cache="blob")
+        logger.info("📦 blob 캐시: 적중 %d회, 실패 %d회 (적중률 %.0f%%)", stats["hits"], stats["misses"], stats["hit_rate"] * 100)
+
+    stats = get_block_cache().stats()
+    metrics.set_gauge("cache_hits", stats["memory_hits"] + stats["disk_hits"], cache="block")
+    metrics.set_gauge("cache_misses", stats["misses"], cache="block")
+    metrics.set_gauge("cache_hit_rate", round(stats["hit_rate"], 4), cache="block")
+    logger.info(
+        "🧱 블록 변환 캐시: 메모리 적중 %d회, 디스크 적중 %d회, 변환 %d회 (적중률 %.0f%%)",
+        stats["memory_hits"], stats["disk_hits"], stats["misses"], stats["hit_rate"] * 100,
+    )
+    http_cache = get_github_http_cache()
+    if http_cache is not None:
+        stats = http_cache.stats()
+        metrics.set_gauge("cache_hits", stats["not_modified"], cache="github_http")
+        logger.info("🔁 GitHub 조건부 요청: 저장된 응답 %d개 중 %d개 재사용 (304)", stats["hits"], stats["not_modified"])
+
+    metrics.set_gauge("rate_limit_wait_seconds", round(notion_client.rate_limiter.waited_seconds, 3), service="Notion")
+
+    report = metrics.write_report(METRICS_REPORT_PATH, METRICS_PROMETHEUS_PATH)
+    stages = sorted(report["stages"].items(), key=lambda item: -item[1]["seconds"])
+    logger.info(
+        "📊 총 %.1f초, 요청 %d회 (수신 %.1fMB) | 단계별 누적: %s",
+        report["wall_seconds"], report["totals"]["requests"], report["totals"]["bytes_received"] / 1024 / 1024,
+        ", ".join(f"{name} {stage['seconds']:.1f}초" for name, stage in stages) or "-",
+    )
+    counters = {counter["name"]: counter["value"] for counter in report["counters"] if not counter["labels"]}
+    if counters.get("github_graphql_queries"):
+        logger.info(
+            "🧮 GitHub GraphQL: 쿼리 %d회 (파일 %d개), 사용한 비용 %d점",
+            counters["github_graphql_queries"], counters.get("github_graphql_objects", 0), counters.get("github_graphql_cost", 0),
         )
+    if METRICS_REPORT_PATH:
+        logger.debug("📊 실행 보고서 저장: %s", METRICS_REPORT_PATH)
+    return report
 
 
-def main():
-    """Notion에서 기존 문제 목록을 가져와 GitHub의 최신 커밋을 처리"""
-    existing_titles = {page["properties"]["문제 제목"]["title"][0]["text"]["content"] for page in fetch_notion_database()}
-    print(f"📌 Notion에 저장된 문제 개수: {len(existing_titles)}")
+def configure_logging(level=LOG_LEVEL):
+    """진행 상황 출력 설정 (메시지만 출력, level 미만의 로그는 포맷팅 없이 버려짐)"""
+    logging.basicConfig(level=level, format="%(message)s")
 
-    commits = get_all_commits()
-    if not commits:
-        print("⚠️ GitHub에서 가져올 커밋이 없습니다.")
-        return
 
-    latest_commit_per_problem = {}
+def parse_args():
+    parser = argparse.ArgumentParser(description="GitHub 알고리즘 풀이를 Notion에 동기화")
+    parser.add_argument("--full", action="store_true", help="동기화 상태를 무시하고 전체 커밋 기록을 다시 처리")
+    parser.add_argument("--update", action="store_true", help="이미 있는 문제도 내용이 바뀌었으면 해당 부분만 수정")
+    parser.add_argument("--log-level", default=LOG_LEVEL, choices=["DEBUG", "INFO", "WARNING", "ERROR"], help="출력할 로그 레벨")
+    return parser.parse_args()
+
 
-    # ✅ 최신 커밋만 필터링
-    filtered_commits = filter_latest_commits(commits, latest_commit_per_problem)
+def main(full=False, update=False):
+    """Notion에서 기존 문제 목록을 가져와 GitHub의 최신 커밋을 처리"""
+    # ✅ 로컬 제목 인덱스를 변경분만 갱신하여 중복 검사에 사용 (--full 이면 전체 재구축)
+    with metrics.stage("title_index"):
+        existing_titles = load_title_index(full=full)
+    if existing_titles is None:
+        logger.error("❌ Notion 문제 목록을 가져오지 못해 중복 업로드 방지를 위해 종료합니다.")
+        return
+    logger.info("📌 Notion에 저장된 문제 개수: %d", len(existing_titles))
+
+    # ✅ 이전 실행에서 중단된 페이지 생성 작업부터 마무리
+    resume_unfinished_jobs(existing_titles)
+
+    # ✅ 마지막으로 처리한 커밋 이후만 조회 (--full 이면 상태 초기화 후 전체 조회)
+    if full:
+        reset_sync_state()
+    sync_state = load_sync_state()
+    if sync_state:
+        logger.info("📌 마지막 동기화 커밋: %s (%s)", sync_state["last_commit_sha"], sync_state["last_commit_date"])
+
+    # ✅ 커밋 목록/파일 조회 중 실패한 내용 (하나라도 있으면 기준점을 옮기지 않음)
+    errors = []
+    commits = iter_commits(
+        since=since_with_margin(sync_state.get("last_commit_date")),
+        stop_sha=sync_state.get("last_commit_sha"),
+        errors=errors,
+    )
+    newest_commit = next(commits, None)
+    if newest_commit is None:
+        if errors:
+            logger.error("❌ GitHub에서 커밋 목록을 가져오지 못했습니다.")
+        else:
+            logger.info("⚠️ GitHub에서 가져올 커밋이 없습니다.")
+        write_run_report()
+        return
+
+    # ✅ 커밋 조회 → 파일 조회 → 문제 추출 → 업로드를 스트리밍으로 연결 (업데이트 모드에서는 기존 문제도 수집)
+    # ✅ 업로드 중에 인덱스에 추가되는 제목이 과거 커밋의 풀이 병합에 영향을 주지 않도록 실행 시작 시점의 제목 목록 사용
+    skip_titles = frozenset() if update else existing_titles.snapshot()
+    problems = iter_latest_problems(
+        itertools.chain([newest_commit], commits), skip_titles, errors=errors, whole_folder=update,
+    )
+    stats = upload_to_notion(problems, existing_titles, update=update)
+
+    # ✅ 모든 커밋을 가져오고 업로드까지 성공했을 때만 가장 최근 커밋을 다음 실행의 기준점으로 저장
+    if errors or stats["failed"]:
+        logger.warning(
+            "⚠️ 조회 실패 %d건, 업로드 실패 %d건이 있어 동기화 기준점을 옮기지 않습니다 (다음 실행에서 다시 처리).",
+            len(errors), stats["failed"],
+        )
+    else:
+        save_sync_state(newest_commit.sha, newest_commit.date)
 
-    # ✅ 최신 커밋들만 처리하여 Notion에 업로드
-    for commit in filtered_commits:
-        problem_dict = process_commit(commit, existing_titles, latest_commit_per_problem)
-        upload_to_notion(problem_dict)
+    # ✅ 캐시 적중률, 단계별 시간, 요청 수 등 실행 보고서 저장
+    write_run_report()
 
 if __name__ == "__main__":
-    main()
+    args = parse_args()
+    configure_logging(args.log_level)
+    main(full=args.full, update=args.update)
@@ -0,0 +1,359 @@
+import html
+import re
+from config import NOTION_MAX_PAYLOAD_BYTES
+from metrics import metrics
+from utils import build_code_blocks, split_text_into_blocks
+
+# ✅ 변환 결과가 달라지는 수정을 하면 올려야 하는 버전 (변환 결과 캐시 키에 포함)
+CONVERTER_VERSION = 2
+
+# ✅ Notion 블록 하나에 담을 수 있는 자식 블록(표의 행) 수
+MAX_CHILDREN = 100
+
+# ✅ Notion이 링크로 받는 URL (상대 경로, #앵커 링크는 validation_error가 나므로 일반 텍스트로 유지)
+_ABSOLUTE_URL = re.compile(r"^https?://", re.IGNORECASE)
+
+# ✅ Notion API가 한 번에 허용하는 중첩 깊이 (최상위 블록 + 자식 블록)
+MAX_NESTING_DEPTH = 2
+
+# ✅ 코드 펜스 언어 표기 → Notion 코드 블록 언어
+CODE_LANGUAGE_ALIASES = {
+    "py": "python", "python": "python", "python3": "python",
+    "java": "java", "kt": "kotlin", "kotlin": "kotlin",
+    "c": "c", "cpp": "c++", "c++": "c++", "cc": "c++", "cs": "c#", "csharp": "c#",
+    "js": "javascript", "javascript": "javascript", "ts": "typescript", "typescript": "typescript",
+    "go": "go", "swift": "swift", "rb": "ruby", "ruby": "ruby", "php": "php", "rs": "rust", "rust": "rust",
+    "sql": "sql", "sh": "shell", "bash": "bash", "shell": "shell", "json": "json", "yaml": "yaml",
+    "html": "html", "css": "css", "md": "markdown", "markdown": "markdown",
+}
+
+_FENCE = re.compile(r"^ {0,3}(`{3,}|~{3,})\s*([^\s`]*)")
+_HEADING = re.compile(r"^ {0,3}(#{1,6})\s+(.*?)\s*#*\s*$")
+_DIVIDER = re.compile(r"^ {0,3}([-*_])(\s*\1){2,}\s*$")
+_LIST_ITEM = re.compile(r"^(\s*)([-*+]|\d+[.)])\s+(.*)$")
+_QUOTE = re.compile(r"^ {0,3}>\s?(.*)$")
+_TABLE_SEPARATOR = re.compile(r"^\s*\|?\s*:?-+:?\s*(\|\s*:?-+:?\s*)*\|?\s*$")
+_HTML_BLOCK = re.compile(r"^ {0,3}</?([a-zA-Z][a-zA-Z0-9]*)[\s/>]")
+
+_INLINE = re.compile(
+    r"(?P<code_fence>`+)(?P<code>.+?)(?P=code_fence)"
+    r"|!\[(?P<img_alt>[^\]]*)\]\((?P<img_src>[^)\s]+)(?:\s+\"[^\"]*\")?\)"
+    r"|\[(?P<link_text>[^\]]+)\]\((?P<link_url>[^)\s]+)(?:\s+\"[^\"]*\")?\)"
+    r"|<(?P<autolink>https?://[^>\s]+)>"
+    r"|(?P<strong_mark>\*\*|__)(?P<strong>.+?)(?P=strong_mark)"
+    r"|~~(?P<strike>.+?)~~"
+    r"|(?P<em_mark>\*|\b_)(?P<em>[^*_\s](?:.*?[^*_\s])?)(?P=em_mark)"
+)
+
+# ✅ 인라인 HTML 태그 → Markdown 표기 (README 문제 설명에 섞여 있는 HTML 처리)
+_HTML_IMG = re.compile(r"<img\b[^>]*>", re.IGNORECASE)
+_HTML_ATTR = re.compile(r"""(\w+)\s*=\s*("[^"]*"|'[^']*'|[^\s>]+)""")
+_HTML_BREAK = re.compile(r"<br\s*/?>", re.IGNORECASE)
+_HTML_INLINE_TAGS = [
+    (re.compile(r"</?(?:strong|b)>", re.IGNORECASE), "**"),
+    (re.compile(r"</?(?:em|i)>", re.IGNORECASE), "*"),
+    (re.compile(r"</?code>", re.IGNORECASE), "`"),
+]
+_HTML_TAG = re.compile(r"<[^>]+>")
+_HTML_PARAGRAPH_END = re.compile(r"</(?:p|div|li|h[1-6]|pre|blockquote)>", re.IGNORECASE)
+_HTML_TABLE_ROW = re.compile(r"<tr\b[^>]*>(.*?)</tr>", re.IGNORECASE | re.DOTALL)
+_HTML_TABLE_CELL = re.compile(r"<t[dh]\b[^>]*>(.*?)</t[dh]>", re.IGNORECASE | re.DOTALL)
+
+
+def _text_segment(content, annotations=None, link=None):
+    text = {"content": content}
+    if link:
+        text["link"] = {"url": link}
+    segment = {"type": "text", "text": text}
+    if annotations:
+        segment["annotations"] = dict(annotations)
+    return segment
+
+
+def _html_to_markdown(text):
+    """인라인 HTML 태그를 Markdown 표기로 바꾸고 <img>는 Markdown 이미지로 변환"""
+    def replace_img(match):
+        attrs = {key.lower(): value.strip("\"'") for key, value in _HTML_ATTR.findall(match.group(0))}
+        return f"![{attrs.get('alt', '')}]({attrs['src']})" if attrs.get("src") else ""
+
+    text = _HTML_IMG.sub(replace_img, text)
+    text = _HTML_BREAK.sub("\n", text)
+    for pattern, replacement in _HTML_INLINE_TAGS:
+        text = pattern.sub(replacement, text)
+    return html.unescape(_HTML_TAG.sub("", text))
+
+
+def parse_inline(text, annotations=None, link=None, images=None):
+    """
+    인라인 Markdown(굵게, 기울임, 취소선, 코드, 링크)을 Notion rich_text 목록으로 변환하는 함수
+    - 이미지(![alt](src))는 인라인으로 넣을 수 없으므로 images 목록에 (src, alt)로 모음
+    """
+    annotations = annotations or {}
+    rich_text = []
+    position = 0
+
+    for match in _INLINE.finditer(text):
+        if match.start() > position:
+            rich_text.append(_text_segment(text[position:match.start()], annotations, link))
+        position = match.end()
+
+        if match.group("code") is not None:
+            rich_text.append(_text_segment(match.group("code"), {**annotations, "code": True}, link))
+        elif match.group("img_src") is not None:
+            if images is not None:
+                images.append((match.group("img_src"), match.group("img_alt")))
+        elif match.group("link_url") is not None:
+            url = match.group("link_url")
+            rich_text.extend(parse_inline(match.group("link_text"), annotations, url if _ABSOLUTE_URL.match(url) else link, images))
+        elif match.group("autolink") is not None:
+            rich_text.append(_text_segment(match.group("autolink"), annotations, match.group("autolink")))
+        elif match.group("strong") is not None:
+            rich_text.extend(parse_inline(match.group("strong"), {**annotations, "bold": True}, link, images))
+        elif match.group("strike") is not None:
+            rich_text.extend(parse_inline(match.group("strike"), {**annotations, "strikethrough": True}, link, images))
+        else:
+            rich_text.extend(parse_inline(match.group("em"), {**annotations, "italic": True}, link, images))
+
+    if position < len(text):
+        rich_text.append(_text_segment(text[position:], annotations, link))
+
+    # ✅ rich_text 조각 하나는 2000자 이하
+    segments = []
+    for segment in rich_text:
+        content = segment["text"]["content"]
+        if len(content) <= 2000:
+            segments.append(segment)
+            continue
+        for chunk in split_text_into_blocks(content):
+            segments.append({**segment, "text": {**segment["text"], "content": chunk}})
+    return segments
+
+
+def _image_block(src, alt):
+    block = {"object": "block", "type": "image", "image": {"type": "external", "external": {"url": src}}}
+    if alt:
+        block["image"]["caption"] = [_text_segment(alt)]
+    return block
+
+
+def _rich_text_blocks(block_type, text, extra=None):
+    """
+    인라인 텍스트를 block_type 블록으로 변환 (이미지는 뒤에 별도 이미지 블록으로 추가)
+    - rich_text 조각이 100개를 넘으면 같은 종류의 블록으로 나눔
+    """
+    images = []
+    rich_text = parse_inline(text.strip(), images=images)
+    blocks = []
+    for i in range(0, len(rich_text), 100):
+        blocks.append({"object": "block", "type": block_type, block_type: {"rich_text": rich_text[i:i + 100], **(extra or {})}})
+    for src, alt in images:
+        if src.startswith("http"):  # Notion은 URL 이미지만 지원
+            blocks.append(_image_block(src, alt))
+    return blocks
+
+
+def _code_blocks(code, language):
+    """코드 펜스를 코드 블록으로 변환 (rich_text 조각 100개를 넘는 긴 코드는 잘라내지 않고 여러 블록으로 나눔)"""
+    language = CODE_LANGUAGE_ALIASES.get(language.lower(), "plain text") if language else "plain text"
+    if not code:
+        return [{"object": "block", "type": "code", "code": {"rich_text": [_text_segment("")], "language": language}}]
+    return build_code_blocks(code, language, max_bytes=NOTION_MAX_PAYLOAD_BYTES // 2)
+
+
+def _split_table_row(line):
+    line = line.strip()
+    if line.startswith("|"):
+        line = line[1:]
+    if line.endswith("|") and not line.endswith("\\|"):
+        line = line[:-1]
+    return [cell.strip().replace("\\|", "|") for cell in re.split(r"(?<!\\)\|", line)]
+
+
+def _table_blocks(rows, has_column_header):
+    """
+    표를 table 블록으로 변환하는 함수
+    - 행이 100개를 넘으면 잘라내지 않고 이어지는 표 블록으로 나눔 (제목 행이 있으면 각 표에 반복)
+    """
+    width = max(len(row) for row in rows)
+    table_rows = [
+        {
+            "object": "block",
+            "type": "table_row",
+            "table_row": {"cells": [parse_inline(cell) for cell in row + [""] * (width - len(row))]},
+        }
+        for row in rows
+    ]
+    header = table_rows[:1] if has_column_header else []
+    body = table_rows[len(header):]
+    per_table = MAX_CHILDREN - len(header)
+    return [
+        {
+            "object": "block",
+            "type": "table",
+            "table": {
+                "table_width": width,
+                "has_column_header": has_column_header,
+                "has_row_header": False,
+                "children": header + body[i:i + per_table],
+            },
+        }
+        for i in range(0, max(len(body), 1), per_table)
+    ]
+
+
+def _html_blocks(source):
+    """HTML 블록(문제 설명 등)을 단락/이미지/표 블록으로 변환"""
+    blocks = []
+    position = 0
+    for table in re.finditer(r"<table\b.*?</table>", source, re.IGNORECASE | re.DOTALL):
+        blocks.extend(_html_blocks(source[position:table.start()]))
+        rows = [
+            [_html_to_markdown(cell).strip() for cell in _HTML_TABLE_CELL.findall(row)]
+            for row in _HTML_TABLE_ROW.findall(table.group(0))
+        ]
+        rows = [row for row in rows if row]
+        if rows:
+            blocks.extend(_table_blocks(rows, has_column_header="<th" in table.group(0).lower()))
+        position = table.end()
+    if position:
+        blocks.extend(_html_blocks(source[position:]))
+        return blocks
+
+    for paragraph in _HTML_PARAGRAPH_END.split(source):
+        text = _html_to_markdown(paragraph).strip()
+        if text:
+            blocks.extend(_rich_text_blocks("paragraph", text))
+    return blocks
+
+
+class _ListBuilder:
+    """들여쓰기로 중첩된 리스트 항목을 Notion 블록 트리로 만드는 도우미"""
+
+    def __init__(self, output):
+        self.output = output
+        self.stack = []  # (들여쓰기, 블록)
+
+    def add(self, indent, ordered, text):
+        while self.stack and self.stack[-1][0] >= indent:
+            self.stack.pop()
+        # ✅ Notion은 한 요청에 2단계 중첩까지만 허용하므로 더 깊은 항목은 2단계에 붙임
+        while len(self.stack) >= MAX_NESTING_DEPTH:
+            self.stack.pop()
+
+        block_type = "numbered_list_item" if ordered else "bulleted_list_item"
+        blocks = _rich_text_blocks(block_type, text)
+        parent = self.output if not self.stack else self.stack[-1][1][self.stack[-1][1]["type"]].setdefault("children", [])
+        parent.extend(blocks)
+        if blocks and blocks[0]["type"] == block_type:
+            self.stack.append((indent, blocks[0]))
+
+    def continue_item(self, text):
+        """들여쓰기된 이어지는 줄은 마지막 항목의 텍스트에 붙임"""
+        item = self.stack[-1][1]
+        item[item["type"]]["rich_text"].extend(parse_inline(" " + text.strip()))
+
+    def close(self):
+        self.stack = []
+
+
+@metrics.timed("markdown_convert")
+def convert_markdown_to_notion_blocks(markdown_text):
+    """
+    Markdown을 HTML로 렌더링하지 않고 줄 단위로 바로 Notion 블록으로 변환하는 함수
+    - 제목, 단락, 인용, 구분선, 언어가 지정된 코드 펜스, 중첩 리스트, 표(table 블록)
+    - 굵게/기울임/취소선/코드/링크는 rich_text annotations로 유지
+    - README에 섞인 HTML(<p>, <img>, <table> 등)도 처리
+    """
+    blocks = []
+    lists = _ListBuilder(blocks)
+    paragraph = []
+    lines = markdown_text.splitlines()
+    i = 0
+
+    def flush_paragraph():
+        if paragraph:
+            text = "".join(line[:-2] + "\n" if line.endswith("  ") else line + " " for line in paragraph)
+            blocks.extend(_rich_text_blocks("paragraph", text))
+            paragraph.clear()
+
+    while i < len(lines):
+        line = lines[i]
+
+        if not line.strip():
+            flush_paragraph()
+            i += 1
+            continue
+
+        fence = _FENCE.match(line)
+        if fence:
+            flush_paragraph()
+            lists.close()
+            marker = fence.group(1)
+            code_lines = []
+            i += 1
+            while i < len(lines) and not lines[i].strip().startswith(marker):
+                code_lines.append(lines[i])
+                i += 1
+            blocks.extend(_code_blocks("\n".join(code_lines), fence.group(2)))
+            i += 1
+            continue
+
+        list_item = _LIST_ITEM.match(line)
+        if list_item and not _DIVIDER.match(line):
+            flush_paragraph()
+            indent = len(list_item.group(1).expandtabs(4))
+            lists.add(indent, list_item.group(2)[0].isdigit(), list_item.group(3))
+            i += 1
+            continue
+        if lists.stack and line[:1] in (" ", "\t") and not paragraph:
+            lists.continue_item(line)
+            i += 1
+            continue
+        lists.close()
+
+        heading = _HEADING.match(line)
+        if heading:
+            flush_paragraph()
+            level = min(len(heading.group(1)), 3)
+            blocks.extend(_rich_text_blocks(f"heading_{level}", heading.group(2)))
+            i += 1
+            continue
+
+        if _DIVIDER.match(line):
+            flush_paragraph()
+            blocks.append({"object": "block", "type": "divider", "divider": {}})
+            i += 1
+            continue
+
+        if _QUOTE.match(line):
+            flush_paragraph()
+            quote_lines = []
+            while i < len(lines) and _QUOTE.match(lines[i]):
+                quote_lines.append(_QUOTE.match(lines[i]).group(1))
+                i += 1
+            blocks.extend(_rich_text_blocks("quote", "\n".join(quote_lines)))
+            continue
+
+        if "|" in line and i + 1 < len(lines) and _TABLE_SEPARATOR.match(lines[i + 1]) and "-" in lines[i + 1]:
+            flush_paragraph()
+            rows = [_split_table_row(line)]
+            i += 2
+            while i < len(lines) and "|" in lines[i] and lines[i].strip():
+                rows.append(_split_table_row(lines[i]))
+                i += 1
+            blocks.extend(_table_blocks(rows, has_column_header=True))
+            continue
+
+        if not paragraph and _HTML_BLOCK.match(line):
+            html_lines = []
+            while i < len(lines) and lines[i].strip():
+                html_lines.append(lines[i])
+                i += 1
+            blocks.extend(_html_blocks("\n".join(html_lines)))
+            continue
+
+        paragraph.append(line.strip() if not line.endswith("  ") else line.lstrip())
+        i += 1
+
+    flush_paragraph()
+    return blocks
@@ -0,0 +1,239 @@
+import json
+import os
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from functools import wraps
+from urllib.parse import urlparse
+
+# ✅ 요청 지연 히스토그램 구간(초, 상한) - Prometheus 기본 구간과 동일
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# ✅ URL 경로의 가변 부분 → 이름 (엔드포인트별로 묶어서 집계)
+_ENDPOINT_PATTERNS = [
+    (re.compile(r"/repos/[^/]+/[^/]+"), "/repos/{owner}/{repo}"),
+    (re.compile(r"/(contents|tarball)/.*"), r"/\1/{path}"),
+    (re.compile(r"/[0-9a-f]{40}(?=/|$)"), "/{sha}"),
+    (re.compile(r"/[0-9a-f]{8}-?[0-9a-f]{4}-?[0-9a-f]{4}-?[0-9a-f]{4}-?[0-9a-f]{12}(?=/|$)"), "/{id}"),
+]
+
+
+def endpoint_template(url):
+    """요청 URL을 집계용 엔드포인트 이름으로 변환 (예: /repos/{owner}/{repo}/git/blobs/{sha})"""
+    path = urlparse(url).path
+    for pattern, replacement in _ENDPOINT_PATTERNS:
+        path = pattern.sub(replacement, path)
+    return path
+
+
+class Histogram:
+    """누적 구간 히스토그램 (Prometheus histogram과 같은 형식)"""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value):
+        for i, upper in enumerate(self.buckets):
+            if value <= upper:
+                self.counts[i] += 1
+                break
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def percentile(self, percentile):
+        """구간 상한 기준 근사 백분위수 (마지막 구간을 넘으면 최댓값)"""
+        if not self.count:
+            return 0.0
+        rank = self.count * percentile / 100
+        seen = 0
+        for upper, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return min(upper, self.max)
+        return self.max
+
+    def cumulative(self):
+        """(상한, 누적 개수) 목록 (+Inf 포함)"""
+        total = 0
+        result = []
+        for upper, count in zip(self.buckets, self.counts):
+            total += count
+            result.append((upper, total))
+        result.append(("+Inf", self.count))
+        return result
+
+
+class Metrics:
+    """
+    실행 한 번의 지표 수집기 (모든 모듈이 공유하는 metrics 인스턴스 사용)
+    - 단계별 시간: stage() / timed()로 감싼 구간의 누적 시간과 호출 횟수
+      (여러 스레드에서 실행되는 단계는 스레드별 시간의 합이므로 전체 소요 시간보다 클 수 있음)
+    - 요청: 서비스/메서드/엔드포인트별 횟수, 상태 코드, 지연 히스토그램, 송수신 바이트
+    - 카운터(재시도, 429 등)와 게이지(캐시 적중률 등)
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.started_at = time.time()
+            self._started = time.perf_counter()
+            self.stages = {}
+            self.requests = {}
+            self.counters = Counter()
+            self.gauges = {}
+
+    @contextmanager
+    def stage(self, name):
+        started_at = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started_at
+            with self._lock:
+                stage = self.stages.setdefault(name, {"seconds": 0.0, "calls": 0})
+                stage["seconds"] += elapsed
+                stage["calls"] += 1
+
+    def timed(self, name):
+        """함수 호출 시간을 단계 name으로 기록하는 데코레이터"""
+        def decorator(function):
+            @wraps(function)
+            def wrapper(*args, **kwargs):
+                with self.stage(name):
+                    return function(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def count(self, name, value=1, **labels):
+        with self._lock:
+            self.counters[(name, tuple(sorted(labels.items())))] += value
+
+    def set_gauge(self, name, value, **labels):
+        with self._lock:
+            self.gauges[(name, tuple(sorted(labels.items())))] = value
+
+    def record_request(self, service, method, url, status, seconds, bytes_sent=0, bytes_received=0):
+        """HTTP 요청 하나(재시도 포함 각 시도)를 기록 (status=None이면 연결 오류)"""
+        key = (service, method, endpoint_template(url))
+        with self._lock:
+            entry = self.requests.get(key)
+            if entry is None:
+                entry = self.requests[key] = {
+                    "count": 0, "statuses": Counter(), "latency": Histogram(), "bytes_sent": 0, "bytes_received": 0,
+                }
+            entry["count"] += 1
+            entry["statuses"][str(status) if status is not None else "error"] += 1
+            entry["latency"].observe(seconds)
+            entry["bytes_sent"] += bytes_sent
+            entry["bytes_received"] += bytes_received
+
+    def report(self):
+        """JSON으로 저장할 수 있는 실행 보고서"""
+        with self._lock:
+            requests = []
+            for (service, method, endpoint), entry in sorted(self.requests.items()):
+                latency = entry["latency"]
+                requests.append({
+                    "service": service,
+                    "method": method,
+                    "endpoint": endpoint,
+                    "count": entry["count"],
+                    "statuses": dict(entry["statuses"]),
+                    "bytes_sent": entry["bytes_sent"],
+                    "bytes_received": entry["bytes_received"],
+                    "latency_seconds": {
+                        "sum": latency.sum,
+                        "p50": latency.percentile(50),
+                        "p95": latency.percentile(95),
+                        "max": latency.max,
+                    },
+                })
+            return {
+                "started_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(self.started_at)),
+                "wall_seconds": time.perf_counter() - self._started,
+                "stages": {name: dict(stage) for name, stage in sorted(self.stages.items())},
+                "requests": requests,
+                "totals": {
+                    "requests": sum(entry["count"] for entry in requests),
+                    "bytes_sent": sum(entry["bytes_sent"] for entry in requests),
+                    "bytes_received": sum(entry["bytes_received"] for entry in requests),
+                },
+                "counters": [{"name": name, "labels": dict(labels), "value": value} for (name, labels), value in sorted(self.counters.items())],
+                "gauges": [{"name": name, "labels": dict(labels), "value": value} for (name, labels), value in sorted(self.gauges.items())],
+            }
+
+    def to_prometheus(self, prefix="algorithm_notion"):
+        """Prometheus 텍스트 형식 (node_exporter textfile collector 등으로 수집)"""
+        families = {}  # 지표 이름 → (종류, [(이름, 레이블, 값)])
+
+        def add(name, kind, labels, value, sample_name=None):
+            families.setdefault(name, (kind, []))[1].append((sample_name or name, labels, value))
+
+        with self._lock:
+            for name, stage in sorted(self.stages.items()):
+                add("stage_seconds_total", "counter", [("stage", name)], f"{stage['seconds']:.6f}")
+                add("stage_calls_total", "counter", [("stage", name)], stage["calls"])
+
+            for (service, method, endpoint), entry in sorted(self.requests.items()):
+                labels = [("service", service), ("method", method), ("endpoint", endpoint)]
+                for status, count in sorted(entry["statuses"].items()):
+                    add("http_requests_total", "counter", labels + [("status", status)], count)
+                add("http_request_bytes_total", "counter", labels, entry["bytes_sent"])
+                add("http_response_bytes_total", "counter", labels, entry["bytes_received"])
+                latency = entry["latency"]
+                family = "http_request_duration_seconds"
+                for upper, count in latency.cumulative():
+                    add(family, "histogram", labels + [("le", upper)], count, f"{family}_bucket")
+                add(family, "histogram", labels, f"{latency.sum:.6f}", f"{family}_sum")
+                add(family, "histogram", labels, latency.count, f"{family}_count")
+
+            for (name, labels), value in sorted(self.counters.items()):
+                add(f"{name}_total", "counter", list(labels), value)
+            for (name, labels), value in sorted(self.gauges.items()):
+                add(name, "gauge", list(labels), value)
+
+        lines = []
+        for name, (kind, samples) in families.items():
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+            for sample_name, labels, value in samples:
+                label_text = ",".join(f'{key}="{_escape_label(label)}"' for key, label in labels)
+                lines.append(f"{prefix}_{sample_name}{{{label_text}}} {value}" if labels else f"{prefix}_{sample_name} {value}")
+        return "\n".join(lines) + "\n"
+
+    def write_report(self, json_path=None, prometheus_path=None):
+        """보고서를 JSON / Prometheus 텍스트 파일로 저장 (경로가 비어 있으면 건너뜀), 보고서 반환"""
+        report = self.report()
+        if json_path:
+            _atomic_write(json_path, json.dumps(report, ensure_ascii=False, indent=2))
+        if prometheus_path:
+            _atomic_write(prometheus_path, self.to_prometheus())
+        return report
+
+
+def _escape_label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _atomic_write(path, text):
+    """수집기가 쓰다 만 파일을 읽지 않도록 임시 파일에 쓴 뒤 교체"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(temp_path, path)
+
+
+# ✅ 실행 중 공유하는 지표 수집기
+metrics = Metrics()
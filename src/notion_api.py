@@ -1,23 +1,37 @@
+import json
+import logging
+import threading
+import time
 import requests
-from config import NOTION_HEADERS, NOTION_DATABASE_ID
-from utils import split_text_into_blocks, convert_markdown_to_notion_blocks
+from http_client import notion_client
+from config import NOTION_API_URL, NOTION_DATABASE_ID, NOTION_SCHEMA_TTL, NOTION_MAX_BLOCKS_PER_REQUEST, NOTION_MAX_PAYLOAD_BYTES
+from block_cache import cached_markdown_blocks, cached_code_blocks
+
+logger = logging.getLogger(__name__)
 
 # 노션 데이터베이스의 목록 가져오기 
-def fetch_notion_database():
-    url = f"https://api.notion.com/v1/databases/{NOTION_DATABASE_ID}/query"
+def fetch_notion_database(query_filter=None, sorts=None, filter_properties=None):
+    """
+    데이터베이스 페이지를 100개씩 모두 가져오는 함수 (에러 시 None 반환)
+    - query_filter / sorts: Notion query의 filter, sorts
+    - filter_properties: 응답에 포함할 속성 ID 목록 (예: ["title"])
+    """
+    url = f"{NOTION_API_URL}/databases/{NOTION_DATABASE_ID}/query"
+    params = [("filter_properties", property_id) for property_id in filter_properties or []]
     has_more = True
     next_cursor = None
     all_pages = []
 
     while has_more:
         payload = {"page_size": 100}
+        if query_filter:
+            payload["filter"] = query_filter
+        if sorts:
+            payload["sorts"] = sorts
         if next_cursor:
             payload["start_cursor"] = next_cursor  # 페이지네이션 처리
 
-        response = requests.post(url, headers=NOTION_HEADERS, json=payload)
-
-        # 디버깅
-        # print(response.json())
+        response = notion_client.post(url, params=params, json=payload, idempotent=True)  # 조회 요청
 
         if response.status_code == 200:
             data = response.json()
@@ -25,91 +39,168 @@ def fetch_notion_database():
             has_more = data.get("has_more", False)
             next_cursor = data.get("next_cursor", None)
         else:
-            print(f"❌ Notion API 에러: {response.status_code}, {response.json()}")
-            return []
+            logger.error("❌ Notion API 에러: %s, %s", response.status_code, response.text)
+            return None
 
     return all_pages
 
 
 def get_notion_database_properties():
-    """ Notion 데이터베이스 속성(난이도, 태그 등) 가져오기 """
-    url = f"https://api.notion.com/v1/databases/{NOTION_DATABASE_ID}"
-    response = requests.get(url, headers=NOTION_HEADERS)
+    """ Notion 데이터베이스 속성(난이도, 태그 등) 가져오기 (실패 시 빈 dict) """
+    url = f"{NOTION_API_URL}/databases/{NOTION_DATABASE_ID}"
+    response = notion_client.get(url)
 
     if response.status_code == 200:
-        data = response.json()
-        properties = data.get("properties", {})
+        return response.json().get("properties", {})
+    else:
+        logger.error("❌ Notion API 에러: %s, %s", response.status_code, response.text)
+        return {}
 
-        # ✅ "난이도" 선택 옵션 가져오기
-        difficulty_options = [option["name"] for option in properties.get("난이도", {}).get("select", {}).get("options", [])]
 
-        return difficulty_options
-    else:
-        print(f"❌ Notion API 에러: {response.status_code}, {response.json()}")
-        return [], []
+class NotionSchemaCache:
+    """
+    Notion 데이터베이스 속성(schema) 캐시
+    - 실행 중 한 번만 조회해 모든 업로드가 공유하고, ttl초가 지나거나 invalidate() 되면 다시 조회
+    - select 속성(난이도, 사이트)에 없는 옵션은 한 번의 PATCH로 미리 추가
+    """
 
+    def __init__(self, ttl=NOTION_SCHEMA_TTL):
+        self.ttl = ttl
+        self._properties = None
+        self._fetched_at = 0.0
+        self._lock = threading.Lock()
 
-def chunk_list(lst, chunk_size):
-    """리스트를 chunk_size 크기만큼 나누는 함수"""
-    for i in range(0, len(lst), chunk_size):
-        yield lst[i:i + chunk_size]
+    def invalidate(self):
+        with self._lock:
+            self._properties = None
 
-def add_problem_to_notion(title, description, code_blocks, difficulty, site_name, problem_link, submission_date):
-    """Notion에 문제 추가 (다양한 언어 지원 + 100개 제한 해결 + 상세 예외 처리)"""
-    url = "https://api.notion.com/v1/pages"
+    def properties(self):
+        with self._lock:
+            if self._properties is None or time.monotonic() - self._fetched_at > self.ttl:
+                self._properties = get_notion_database_properties()
+                self._fetched_at = time.monotonic()
+            return self._properties
 
-    # ✅ 기존 옵션 가져오기 (난이도 select 옵션 확인)
-    existing_difficulties = get_notion_database_properties()
+    def select_options(self, property_name):
+        """select 속성의 옵션 이름 목록"""
+        return [option["name"] for option in self.properties().get(property_name, {}).get("select", {}).get("options", [])]
 
-    # ✅ 새로운 난이도 값이 기존에 없으면 기본값 "Unknown" 설정
-    difficulty_value = difficulty if difficulty in existing_difficulties else "Unknown"
+    def ensure_select_options(self, values_by_property):
+        """
+        select 속성에 없는 옵션을 한 번의 데이터베이스 PATCH로 추가하는 함수
+        - values_by_property: {"난이도": {"Gold", ...}, "사이트": {"백준", ...}}
+        - 기존 옵션을 함께 보내야 삭제되지 않으므로 기존 옵션 + 새 옵션을 전송
+        """
+        patch_properties = {}
+        added = {}
+        for property_name, values in values_by_property.items():
+            existing = self.properties().get(property_name, {}).get("select", {}).get("options", [])
+            existing_names = {option["name"] for option in existing}
+            missing = sorted(value for value in values if value and value not in existing_names)
+            if missing:
+                added[property_name] = missing
+                patch_properties[property_name] = {
+                    "select": {"options": existing + [{"name": value} for value in missing]}
+                }
 
-    # ✅ Markdown을 Notion 블록으로 변환 (문제 설명)
-    description_blocks = convert_markdown_to_notion_blocks(description)
+        if not patch_properties:
+            return True
 
-    # ✅ 코드 블록 생성 (다양한 언어 지원)
+        url = f"{NOTION_API_URL}/databases/{NOTION_DATABASE_ID}"
+        response = notion_client.patch(url, json={"properties": patch_properties}, idempotent=True)
+        if response.status_code != 200:
+            logger.error("❌ Notion 데이터베이스 옵션 추가 실패: %s, %s", response.status_code, response.text)
+            return False
+
+        with self._lock:
+            self._properties = response.json().get("properties", {})
+            self._fetched_at = time.monotonic()
+        logger.info("✅ Notion select 옵션 추가 완료: %s", added)
+        return True
+
+
+# ✅ 실행 중 모든 업로드가 공유하는 스키마 캐시
+schema_cache = NotionSchemaCache()
+
+
+def payload_size(payload):
+    """요청 본문(JSON)의 UTF-8 바이트 수"""
+    return len(json.dumps(payload, ensure_ascii=False).encode("utf-8"))
+
+
+def pack_blocks(blocks, max_blocks=NOTION_MAX_BLOCKS_PER_REQUEST, max_bytes=NOTION_MAX_PAYLOAD_BYTES, first_reserved_bytes=0):
+    """
+    블록을 요청 하나에 최대한 많이 담도록 나누는 함수
+    - 요청마다 블록 max_blocks개, 본문 max_bytes 이하 (블록 순서 유지)
+    - first_reserved_bytes: 첫 요청(페이지 생성)에서 속성 등 블록 외 본문이 차지하는 크기
+    """
+    chunk = []
+    size = first_reserved_bytes
+    for block in blocks:
+        block_size = payload_size(block) + 1  # 구분자 ","
+        if chunk and (len(chunk) >= max_blocks or size + block_size > max_bytes):
+            yield chunk
+            chunk = []
+            size = 0
+        chunk.append(block)
+        size += block_size
+    if chunk:
+        yield chunk
+
+# ✅ 페이지 본문에서 "풀이" 구역의 시작을 나타내는 제목
+SOLUTION_HEADING = "나의 풀이"
+
+
+def resolve_difficulty(difficulty):
+    """스키마에 없는 난이도는 기본값 "Unknown"으로 바꾸는 함수 (실행 중 한 번만 조회한 스키마 캐시 사용)"""
+    return difficulty if difficulty in schema_cache.select_options("난이도") else "Unknown"
+
+
+def build_problem_properties(difficulty_value, site_name, problem_link, submission_date):
+    """문제 페이지 속성(제목 제외)"""
+    return {
+        "문제 링크": {"url": problem_link},
+        "난이도": {"select": {"name": difficulty_value}},
+        "사이트": {"select": {"name": site_name}},
+        "제출 일자": {"date": {"start": submission_date}}
+    }
+
+
+def build_solution_blocks(code_blocks):
+    """
+    풀이 코드 목록을 Notion 코드 블록으로 변환하는 함수
+    - 반환값: (코드 블록 목록, 마지막 풀이의 언어)
+    """
     notion_code_blocks = []
+    language = "plain text"  # 풀이 코드가 없을 때 "참고 코드" 블록의 기본 언어
     for code_block in code_blocks:
         language = code_block["language"]  # ✅ 해당 코드의 언어 추출
         code_content = code_block["content"]
 
-        # ✅ 긴 코드 자동 분할 (2000자 제한 해결)
-        for chunk in split_text_into_blocks(code_content):
-            notion_code_blocks.append({
-                "object": "block",
-                "type": "code",
-                "code": {
-                    "rich_text": [{"text": {"content": chunk}}],
-                    "language": language
-                }
-            })
+        # ✅ 긴 코드는 2000자 rich_text 조각 여러 개를 블록 하나에 담음 (블록당 최대 100조각)
+        notion_code_blocks.extend(cached_code_blocks(code_content, language, max_bytes=NOTION_MAX_PAYLOAD_BYTES // 2))
+    return notion_code_blocks, language
 
-    # ✅ Notion Page 생성 (기본 정보)
-    payload = {
-        "parent": {"database_id": NOTION_DATABASE_ID},
-        "properties": {
-            "문제 제목": {"title": [{"text": {"content": title}}]},
-            "문제 링크": {"url": problem_link},
-            "난이도": {"select": {"name": difficulty_value}},
-            "사이트": {"select": {"name": site_name}},
-            "제출 일자": {"date": {"start": submission_date}}
-        },
-    }
 
-    # ✅ 페이지 생성 요청
-    response = requests.post(url, headers=NOTION_HEADERS, json=payload)
-    if response.status_code == 200:
-        notion_page_id = response.json()["id"]
-        print(f"✅ Notion에 문제 추가 성공: {title}")
-    else:
-        print(f"❌ Notion API 에러: {response.status_code}, {response.json()}")
-        return
+def build_problem_page(title, description, code_blocks, difficulty, site_name, problem_link, submission_date):
+    """
+    문제 페이지 생성 요청 본문과 블록 묶음을 만드는 함수
+    - 반환값: (페이지 생성 요청 본문 - 첫 블록 묶음 포함, 전체 블록 묶음 목록)
+    """
+    # ✅ 새로운 난이도 값이 기존에 없으면 기본값 "Unknown" 설정
+    difficulty_value = resolve_difficulty(difficulty)
+
+    # ✅ Markdown을 Notion 블록으로 변환 (문제 설명, 같은 내용은 캐시된 변환 결과 재사용)
+    description_blocks = cached_markdown_blocks(description)
 
-    # ✅ 생성된 페이지에 `children` 블록을 100개씩 나누어 추가
+    # ✅ 코드 블록 생성 (다양한 언어 지원)
+    notion_code_blocks, language = build_solution_blocks(code_blocks)
+
+    # ✅ 페이지 본문 블록 구성
     all_blocks = []
     all_blocks.extend(description_blocks)  # ✅ description_blocks 추가
     all_blocks.append({"object": "block", "type": "divider", "divider": {}})
-    all_blocks.append({"object": "block", "type": "heading_1", "heading_1": {"rich_text": [{"text": {"content": "나의 풀이"}}]}})
+    all_blocks.append({"object": "block", "type": "heading_1", "heading_1": {"rich_text": [{"text": {"content": SOLUTION_HEADING}}]}})
     all_blocks.extend(notion_code_blocks)  # ✅ notion_code_blocks 추가
     all_blocks.append({"object": "block", "type": "divider", "divider": {}})
     all_blocks.append({"object": "block", "type": "heading_2", "heading_2": {"rich_text": [{"text": {"content": "📌 학습 인사이트"}}]}})
@@ -125,14 +216,149 @@ def add_problem_to_notion(title, description, code_blocks, difficulty, site_name
         }
     })
 
-    # ✅ 블록 개수 제한 해결 (100개씩 나누어 전송)
-    for block_chunk in chunk_list(all_blocks, 100):
-        update_url = f"https://api.notion.com/v1/blocks/{notion_page_id}/children"
-        update_payload = {"children": block_chunk}
-        response = requests.patch(update_url, headers=NOTION_HEADERS, json=update_payload)
+    # ✅ Notion Page 생성 (기본 정보)
+    payload = {
+        "parent": {"database_id": NOTION_DATABASE_ID},
+        "properties": {
+            "문제 제목": {"title": [{"text": {"content": title}}]},
+            **build_problem_properties(difficulty_value, site_name, problem_link, submission_date),
+        },
+    }
+
+    # ✅ 블록을 요청당 최대 개수/크기로 묶고, 첫 묶음은 페이지 생성 요청에 함께 전송
+    reserved_bytes = payload_size(payload) + len(',"children":[]')
+    block_chunks = list(pack_blocks(all_blocks, first_reserved_bytes=reserved_bytes))
+    if block_chunks:
+        payload["children"] = block_chunks[0]
+
+    return payload, block_chunks
+
+
+def is_permanent_error(status_code):
+    """다시 보내도 같은 결과가 나오는 오류인지 (요청 본문 검증 실패, 권한 없음 등 4xx, 연결 오류는 None)"""
+    return status_code is not None and 400 <= status_code < 500 and status_code not in (408, 409, 429)
+
+
+def _record_error(errors, status_code, message):
+    if errors is not None:
+        errors.append((status_code, message))
 
+
+def create_problem_page(payload, errors=None):
+    """
+    페이지 생성 요청 (스키마가 바뀌어 검증 오류가 나면 스키마를 다시 읽고 한 번 재시도)
+    - 성공 시 생성된 페이지 ID, 실패 시 None 반환
+    - errors: 실패하면 (상태 코드, 메시지)를 추가할 목록 (연결 오류는 상태 코드 None)
+    - 같은 요청을 다시 보내면 페이지가 중복 생성될 수 있으므로 5xx/연결 오류는 재시도하지 않음 (작업 저널이 다음 실행에서 확인 후 이어서 진행)
+    """
+    url = f"{NOTION_API_URL}/pages"
+    try:
+        response = notion_client.post(url, json=payload)
+        if response.status_code == 400 and response.json().get("code") == "validation_error":
+            schema_cache.invalidate()
+            difficulty_value = payload["properties"]["난이도"]["select"]["name"]
+            if difficulty_value not in schema_cache.select_options("난이도"):
+                payload["properties"]["난이도"] = {"select": {"name": "Unknown"}}
+            response = notion_client.post(url, json=payload)
+    except requests.RequestException as e:
+        logger.error("❌ Notion 페이지 생성 요청 실패: %s", e)
+        _record_error(errors, None, str(e))
+        return None
+    if response.status_code != 200:
+        logger.error("❌ Notion API 에러: %s, %s", response.status_code, response.text)
+        _record_error(errors, response.status_code, response.text)
+        return None
+    return response.json()["id"]
+
+
+def add_problem_to_notion(title, description, code_blocks, difficulty, site_name, problem_link, submission_date):
+    """
+    Notion에 문제 추가 (다양한 언어 지원 + 블록을 요청당 최대한 묶어 전송 + 상세 예외 처리)
+    - 성공 시 생성된 페이지 ID, 실패 시 None 반환
+    - 중간에 실패하면 일부만 채워진 페이지가 남으므로, 재시작이 필요한 경우 job_journal을 통해 실행
+    """
+    payload, block_chunks = build_problem_page(
+        title, description, code_blocks, difficulty, site_name, problem_link, submission_date
+    )
+    notion_page_id = create_problem_page(payload)
+    if notion_page_id is None:
+        return None
+    logger.debug("✅ Notion에 문제 추가 성공: %s", title)
+
+    # ✅ 나머지 묶음은 생성된 페이지에 순서대로 추가
+    for block_chunk in block_chunks[1:]:
+        if append_block_children(notion_page_id, block_chunk) is None:
+            return None
+
+    logger.info("✅ Notion에 문제의 설명 및 코드 추가 완료: %s (요청 %d회)", title, len(block_chunks) or 1)
+    return notion_page_id
+
+
+def update_page_properties(page_id, properties):
+    """페이지 속성 수정 (성공 여부 반환)"""
+    response = notion_client.patch(f"{NOTION_API_URL}/pages/{page_id}", json={"properties": properties}, idempotent=True)
+    if response.status_code != 200:
+        logger.error("❌ Notion 페이지 속성 수정 실패: %s, %s", response.status_code, response.text)
+        return False
+    return True
+
+
+def get_block_children(block_id):
+    """블록(페이지)의 자식 블록을 100개씩 모두 가져오는 함수 (에러 시 None 반환)"""
+    url = f"{NOTION_API_URL}/blocks/{block_id}/children"
+    params = {"page_size": 100}
+    children = []
+
+    while True:
+        response = notion_client.get(url, params=params)
         if response.status_code != 200:
-            print(f"❌ Notion API 추가 블록 전송 실패: {response.status_code}, {response.json()}")
-            return
+            logger.error("❌ Notion 블록 조회 실패: %s, %s", response.status_code, response.text)
+            return None
+        data = response.json()
+        children.extend(data.get("results", []))
+        if not data.get("has_more"):
+            return children
+        params = {"page_size": 100, "start_cursor": data["next_cursor"]}
+
+
+def append_block_children(block_id, children, after=None, errors=None):
+    """
+    블록(페이지)에 자식 블록 추가 (after가 있으면 해당 블록 바로 뒤에 삽입)
+    - 성공 시 추가된 블록 목록, 실패 시 None 반환
+    - errors: 실패하면 (상태 코드, 메시지)를 추가할 목록 (연결 오류는 상태 코드 None)
+    - 다시 보내면 블록이 두 번 추가될 수 있으므로 5xx/연결 오류는 재시도하지 않음 (호출하는 쪽에서 페이지를 확인한 뒤 결정)
+    """
+    payload = {"children": children}
+    if after:
+        payload["after"] = after
+    try:
+        response = notion_client.patch(f"{NOTION_API_URL}/blocks/{block_id}/children", json=payload)
+    except requests.RequestException as e:
+        logger.error("❌ Notion API 추가 블록 전송 실패: %s", e)
+        _record_error(errors, None, str(e))
+        return None
+    if response.status_code != 200:
+        logger.error("❌ Notion API 추가 블록 전송 실패: %s, %s", response.status_code, response.text)
+        _record_error(errors, response.status_code, response.text)
+        return None
+    return response.json().get("results", [])
+
+
+def update_block(block_id, block):
+    """블록 내용 수정 (종류는 그대로, 자식 블록은 제외)"""
+    block_type = block["type"]
+    content = {key: value for key, value in block[block_type].items() if key != "children"}
+    response = notion_client.patch(f"{NOTION_API_URL}/blocks/{block_id}", json={block_type: content}, idempotent=True)
+    if response.status_code != 200:
+        logger.error("❌ Notion 블록 수정 실패: %s, %s", response.status_code, response.text)
+        return False
+    return True
+
 
-    print(f"✅ Notion에 문제의 설명 및 코드 추가 완료: {title}")
\ No newline at end of file
+def delete_block(block_id):
+    """블록 삭제 (Notion에서는 보관 처리)"""
+    response = notion_client.delete(f"{NOTION_API_URL}/blocks/{block_id}")
+    if response.status_code != 200:
+        logger.error("❌ Notion 블록 삭제 실패: %s, %s", response.status_code, response.text)
+        return False
+    return True
@@ -0,0 +1,100 @@
+import logging
+import queue
+import threading
+import time
+from config import NOTION_WRITE_WORKERS
+
+logger = logging.getLogger(__name__)
+
+
+class NotionWriteQueue:
+    """
+    Notion 쓰기 작업(페이지 생성 + 블록 추가) 작업 큐
+    - 작업 하나는 페이지 하나의 전체 요청 흐름이므로 페이지 내 요청 순서는 유지됨
+    - 실제 요청 속도는 notion_client의 토큰 버킷이 제한하므로 큐는 버킷이 허용하는 만큼 빠르게 소비
+    - 처리량, 대기열 길이, 페이지별 소요 시간(작업 시작~완료) 등 지표 제공
+    """
+
+    def __init__(self, workers=NOTION_WRITE_WORKERS):
+        self.workers = max(workers, 1)
+        self._queue = queue.Queue()
+        self._threads = []
+        self._lock = threading.Lock()
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.max_depth = 0
+        self.started_at = None
+        self.latencies = []
+
+    def start(self):
+        self.started_at = time.monotonic()
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._worker, name=f"notion-writer-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def submit(self, func, *args, **kwargs):
+        """쓰기 작업 추가"""
+        self._queue.put((func, args, kwargs))
+        with self._lock:
+            self.submitted += 1
+            self.max_depth = max(self.max_depth, self._queue.qsize())
+
+    def _worker(self):
+        while True:
+            job = self._queue.get()
+            if job is None:
+                self._queue.task_done()
+                return
+
+            func, args, kwargs = job
+            job_started_at = time.monotonic()
+            try:
+                ok = func(*args, **kwargs)
+            except Exception as e:  # 작업 하나의 실패가 다른 페이지 업로드를 막지 않도록 함
+                logger.exception("❌ Notion 쓰기 작업 실패: %s", e)
+                ok = False
+            latency = time.monotonic() - job_started_at
+
+            with self._lock:
+                self.latencies.append(latency)
+                if ok is False:
+                    self.failed += 1
+                else:
+                    self.completed += 1
+            self._queue.task_done()
+
+    def join(self):
+        """대기 중인 작업을 모두 처리한 뒤 워커 종료"""
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    def depth(self):
+        return self._queue.qsize()
+
+    def latency_percentile(self, percentile):
+        """페이지별 소요 시간의 백분위수(초), 완료된 작업이 없으면 0"""
+        with self._lock:
+            latencies = sorted(self.latencies)
+        if not latencies:
+            return 0.0
+        return latencies[min(len(latencies) - 1, int(len(latencies) * percentile / 100))]
+
+    def stats(self):
+        elapsed = time.monotonic() - self.started_at if self.started_at else 0.0
+        return {
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "queue_depth": self.depth(),
+            "max_queue_depth": self.max_depth,
+            "elapsed_seconds": elapsed,
+            "pages_per_second": self.completed / elapsed if elapsed else 0.0,
+            "latency_p50": self.latency_percentile(50),
+            "latency_p95": self.latency_percentile(95),
+            "latency_max": max(self.latencies, default=0.0),
+        }
@@ -0,0 +1,314 @@
+import difflib
+import hashlib
+import json
+import logging
+from block_cache import cached_markdown_blocks
+from job_journal import get_job_journal, run_create_job
+from markdown_converter import CONVERTER_VERSION
+from problem_catalog import get_problem_catalog
+from notion_api import (
+    SOLUTION_HEADING, add_problem_to_notion, append_block_children, build_problem_page, build_problem_properties, build_solution_blocks,
+    delete_block, get_block_children, pack_blocks, resolve_difficulty, update_block, update_page_properties,
+)
+from metrics import metrics
+from utils import CODE_BLOCKS_VERSION
+
+logger = logging.getLogger(__name__)
+
+# ✅ 내용만 바꿔서 그대로 수정할 수 있는 블록 종류 (나머지는 삭제 후 다시 추가)
+UPDATABLE_BLOCK_TYPES = {
+    "paragraph", "heading_1", "heading_2", "heading_3", "quote",
+    "bulleted_list_item", "numbered_list_item", "code",
+}
+
+
+def _hash(value):
+    return hashlib.sha256(json.dumps(value, ensure_ascii=False, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def compute_content_hash(data):
+    """
+    문제 데이터의 구역별 해시 (속성 / 문제 설명 / 풀이 코드)
+    - 변환기 버전을 포함하므로 변환 결과가 바뀌면 해당 구역도 변경된 것으로 처리
+    """
+    return {
+        "properties": _hash([data["difficulty"], data["site_name"], data["problem_link"], data["submission_date"]]),
+        "description": _hash([CONVERTER_VERSION, data["description"]]),
+        "code": _hash([CODE_BLOCKS_VERSION] + [
+            [block["filename"], block["language"], block["content"]] for block in data["code_blocks"]
+        ]),
+    }
+
+
+def _plain_text(rich_text):
+    return "".join(segment.get("plain_text") or (segment.get("text") or {}).get("content", "") for segment in rich_text)
+
+
+def _rich_text_signature(rich_text):
+    """rich_text를 비교용 값으로 변환 (같은 서식의 인접 조각은 합쳐서 비교)"""
+    runs = []
+    for segment in rich_text:
+        text = segment.get("text") or {}
+        content = text.get("content", segment.get("plain_text", ""))
+        link = (text.get("link") or {}).get("url")
+        annotations = tuple(sorted(key for key, value in segment.get("annotations", {}).items() if value is True))
+        if runs and runs[-1][1:] == (link, annotations):
+            runs[-1] = (runs[-1][0] + content, link, annotations)
+        else:
+            runs.append((content, link, annotations))
+    return tuple(runs)
+
+
+def block_signature(block):
+    """
+    블록을 비교용 값으로 변환하는 함수
+    - 새로 만든 블록과 Notion에서 조회한 블록(children은 block["children"]에 채워 둠)을 같은 기준으로 비교
+    """
+    block_type = block["type"]
+    data = block.get(block_type, {})
+    signature = [block_type, _rich_text_signature(data.get("rich_text", []))]
+    if block_type == "code":
+        signature.append(data.get("language"))
+    elif block_type == "image":
+        signature.append(data.get("external", {}).get("url"))
+        signature.append(_rich_text_signature(data.get("caption", [])))
+    elif block_type == "table":
+        signature.append((data.get("table_width"), data.get("has_column_header")))
+    elif block_type == "table_row":
+        signature.append(tuple(_rich_text_signature(cell) for cell in data.get("cells", [])))
+    children = data.get("children", block.get("children", []))
+    signature.append(tuple(block_signature(child) for child in children))
+    return tuple(signature)
+
+
+def _has_children(block):
+    return bool(block.get("has_children") or block.get(block["type"], {}).get("children"))
+
+
+def _load_children(blocks):
+    """자식이 있는 블록(중첩 리스트, 표)의 자식을 조회하여 block["children"]에 채움"""
+    for block in blocks:
+        if block.get("has_children"):
+            children = get_block_children(block["id"])
+            if children is None:
+                return False
+            if not _load_children(children):
+                return False
+            block["children"] = children
+    return True
+
+
+def _split_sections(page_blocks):
+    """
+    페이지 본문을 (문제 설명 블록, 풀이 제목 블록, 풀이 코드 블록)으로 나누는 함수
+    - 문제 설명: "나의 풀이" 제목 앞의 구분선 이전까지
+    - 풀이 코드: "나의 풀이" 제목 다음부터 다음 구분선 이전까지
+    - 구조를 찾을 수 없으면 None 반환
+    """
+    for index, block in enumerate(page_blocks):
+        if block["type"] == "heading_1" and _plain_text(block["heading_1"]["rich_text"]).strip() == SOLUTION_HEADING:
+            break
+    else:
+        return None
+    if index == 0 or page_blocks[index - 1]["type"] != "divider":
+        return None
+
+    end = index + 1
+    while end < len(page_blocks) and page_blocks[end]["type"] != "divider":
+        end += 1
+    return page_blocks[:index - 1], page_blocks[index], page_blocks[index + 1:end]
+
+
+def _diff_opcodes(old_blocks, new_blocks, anchor_id):
+    """
+    이전/새 블록 목록의 차이를 difflib opcode로 계산
+    - 앞에 기준 블록(anchor)이 없으면 맨 앞에 삽입할 수 없으므로, 맨 앞 삽입은 첫 블록을 교체하는 것으로 바꿈
+    """
+    opcodes = difflib.SequenceMatcher(
+        a=[block_signature(block) for block in old_blocks],
+        b=[block_signature(block) for block in new_blocks],
+        autojunk=False,
+    ).get_opcodes()
+
+    if anchor_id is None and opcodes and opcodes[0][0] == "insert" and len(opcodes) > 1 and opcodes[1][0] == "equal":
+        _, _, _, j1, j2 = opcodes[0]
+        _, i1, i2, k1, k2 = opcodes[1]
+        opcodes = [("replace", 0, 1, j1, j2 + 1)] + ([("equal", 1, i2, k1 + 1, k2)] if i2 > 1 else []) + opcodes[2:]
+    return opcodes
+
+
+def sync_section(page_id, old_blocks, new_blocks, anchor_id, counts):
+    """
+    한 구역의 블록을 변경된 부분만 수정하는 함수
+    - 같은 종류의 텍스트 블록은 내용만 수정, 나머지는 기준 블록 뒤에 새로 추가한 뒤 이전 블록 삭제
+    - anchor_id: 구역 바로 앞 블록 ID (구역이 페이지 맨 앞이면 None)
+    - counts: 수정/추가/삭제한 블록 수를 누적할 dict
+    """
+    for tag, i1, i2, j1, j2 in _diff_opcodes(old_blocks, new_blocks, anchor_id):
+        old_group = old_blocks[i1:i2]
+        new_group = new_blocks[j1:j2]
+        if tag == "equal":
+            anchor_id = old_group[-1]["id"]
+            continue
+
+        # ✅ 같은 위치, 같은 종류의 텍스트 블록은 그대로 두고 내용만 수정
+        updated = 0
+        if tag == "replace":
+            for old, new in zip(old_group, new_group):
+                if old["type"] != new["type"] or old["type"] not in UPDATABLE_BLOCK_TYPES or _has_children(old) or _has_children(new):
+                    break
+                if not update_block(old["id"], new):
+                    return False
+                anchor_id = old["id"]
+                updated += 1
+            counts["updated"] += updated
+        old_group = old_group[updated:]
+        new_group = new_group[updated:]
+
+        # ✅ 새 블록은 기준 블록 뒤에 삽입 (기준이 없으면 교체될 이전 블록 뒤에 삽입한 뒤 이전 블록 삭제)
+        if new_group:
+            insert_after = anchor_id or (old_group[-1]["id"] if old_group else None)
+            if insert_after is None:
+                logger.warning("⚠️ 페이지 맨 앞에 블록을 삽입할 수 없어 수정을 건너뜁니다.")
+                return False
+            for chunk in pack_blocks(new_group):
+                inserted = append_block_children(page_id, chunk, after=insert_after)
+                if not inserted:
+                    return False
+                insert_after = inserted[-1]["id"]
+                counts["inserted"] += len(chunk)
+            anchor_id = insert_after
+
+        for old in old_group:
+            if not delete_block(old["id"]):
+                return False
+            counts["deleted"] += 1
+    return True
+
+
+def update_problem_page(page_id, title, data, previous_hash, content_hash):
+    """
+    기존 Notion 페이지를 변경된 구역만 수정하는 함수
+    - 속성이 바뀌면 속성만 PATCH
+    - 문제 설명 / 풀이 코드가 바뀌면 페이지 본문을 한 번 조회한 뒤 바뀐 블록만 수정
+    - "학습 인사이트" 등 사용자가 작성한 나머지 본문은 그대로 유지
+    """
+    previous_hash = previous_hash or {}
+    changed = [section for section, value in content_hash.items() if previous_hash.get(section) != value]
+    if not changed:
+        logger.debug("✅ %s 문제는 변경 사항이 없어 건너뜀.", title)
+        return True
+
+    counts = {"properties": 0, "updated": 0, "inserted": 0, "deleted": 0}
+    if "properties" in changed:
+        difficulty_value = resolve_difficulty(data["difficulty"])
+        properties = build_problem_properties(difficulty_value, data["site_name"], data["problem_link"], data["submission_date"])
+        if not update_page_properties(page_id, properties):
+            return False
+        counts["properties"] += 1
+
+    if "description" in changed or "code" in changed:
+        page_blocks = get_block_children(page_id)
+        if page_blocks is None:
+            return False
+        sections = _split_sections(page_blocks)
+        if sections is None:
+            logger.warning("⚠️ %s 페이지에서 '%s' 구역을 찾을 수 없어 본문 수정을 건너뜁니다.", title, SOLUTION_HEADING)
+            return False
+        description_blocks, solution_heading, code_blocks = sections
+
+        if "description" in changed:
+            if not _load_children(description_blocks):
+                return False
+            if not sync_section(page_id, description_blocks, cached_markdown_blocks(data["description"]), None, counts):
+                return False
+        if "code" in changed:
+            new_code_blocks, _ = build_solution_blocks(data["code_blocks"])
+            if not sync_section(page_id, code_blocks, new_code_blocks, solution_heading["id"], counts):
+                return False
+
+    logger.info(
+        "✏️ %s 문제 수정 완료: 속성 %d회, 블록 수정 %d개, 추가 %d개, 삭제 %d개",
+        title, counts["properties"], counts["updated"], counts["inserted"], counts["deleted"],
+    )
+    return True
+
+
+def record_catalog(title, page_id, data, content_hash, only_missing=False):
+    """Notion에 반영한 문제를 문제 카탈로그에 기록 (only_missing=True 이면 풀이 정보가 아직 없는 문제만)"""
+    catalog = get_problem_catalog()
+    if catalog is None or (only_missing and not catalog.needs_details(title)):
+        return
+    catalog.record(title, page_id, data, content_hash, difficulty=resolve_difficulty(data["difficulty"]))
+
+
+@metrics.timed("notion_write")
+def sync_problem_page(title_index, title, data, update=False):
+    """
+    문제 하나를 Notion에 반영하는 함수 (쓰기 큐 작업 단위)
+    - 인덱스에 없는 문제는 새 페이지 생성 (작업 저널에 단계별로 기록하여 중단되어도 이어서 진행)
+    - 이전 실행에서 생성이 끝나지 않은 페이지는 저널에 기록된 내용으로 남은 블록부터 이어서 추가
+    - 실패로 기록된 생성 작업은 이어서 진행하지 않음 (페이지가 없으면 새로 생성, 있으면 기존 페이지로 취급)
+    - update=True 이면 기존 페이지는 저장된 해시와 비교해 바뀐 부분만 수정
+    - 성공하면 페이지 ID와 해시를 제목 인덱스에, 문제 정보를 문제 카탈로그에 기록
+    """
+    content_hash = compute_content_hash(data)
+    entry = title_index.get(title)
+    journal = get_job_journal()
+    job = journal.get(title) if journal is not None else None
+
+    if job is not None and job["state"] == "failed":
+        if job["page_id"] is None:
+            # ✅ 페이지가 만들어지지 않은 실패 작업은 아래에서 새 작업으로 다시 기록하여 처음부터 진행
+            job = None
+        elif entry is None:
+            # ✅ 일부만 채워진 페이지가 있으므로 새로 만들지 않고 기존 페이지로 취급 (해시가 없어 업데이트 모드에서 전체 비교)
+            logger.warning("⚠️ %s 페이지는 생성 작업이 실패해 일부만 채워져 있습니다: %s", title, job["last_error"])
+            title_index.record(title, job["page_id"], None)
+            entry = title_index.get(title)
+
+    if job is not None and job["state"] not in ("done", "failed"):
+        page_id = run_create_job(journal, title_index, title, resumed=True)
+        if page_id is None:
+            return False
+        record_catalog(title, page_id, data, job["content_hash"])
+        metrics.count("notion_pages", action="resumed")
+        return True
+
+    if entry is None:
+        fields = (
+            data["description"],
+            data["code_blocks"],
+            data["difficulty"],
+            data["site_name"],
+            data["problem_link"],
+            data["submission_date"]
+        )
+        if journal is None:
+            page_id = add_problem_to_notion(title, *fields)
+            if page_id is None:
+                return False
+            title_index.record(title, page_id, content_hash)
+        else:
+            # ✅ 요청 본문과 블록 묶음을 먼저 기록한 뒤 단계별로 실행
+            payload, block_chunks = build_problem_page(title, *fields)
+            journal.record_fetched(title, payload, block_chunks, content_hash)
+            page_id = run_create_job(journal, title_index, title)
+            if page_id is None:
+                return False
+        record_catalog(title, page_id, data, content_hash)
+        metrics.count("notion_pages", action="created")
+        return True
+
+    if not update:
+        logger.debug("✅ %s 문제는 이미 Notion에 존재하므로 건너뜀.", title)
+        record_catalog(title, entry["id"], data, entry.get("content_hash"), only_missing=True)
+        metrics.count("notion_pages", action="skipped")
+        return True
+
+    if not update_problem_page(entry["id"], title, data, entry.get("content_hash"), content_hash):
+        return False
+    title_index.record(title, entry["id"], content_hash)
+    record_catalog(title, entry["id"], data, content_hash)
+    metrics.count("notion_pages", action="updated")
+    return True
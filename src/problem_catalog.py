@@ -0,0 +1,310 @@
+import argparse
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from config import PROBLEM_CATALOG_PATH, LOG_LEVEL
+from notion_api import fetch_notion_database
+
+logger = logging.getLogger(__name__)
+
+# ✅ 집계 기준 → SQL 식 (제출 일자는 README와 같은 한국 시간 기준 월)
+_GROUP_COLUMNS = {
+    "site": "p.site",
+    "difficulty": "p.difficulty",
+    "month": "strftime('%Y-%m', p.submission_date, '+9 hours')",
+    "language": "s.language",
+}
+
+
+def _property_values(properties):
+    """Notion 페이지 속성(조회 결과 또는 생성 요청 본문)에서 카탈로그 열 값 추출"""
+    def select_name(name):
+        return ((properties.get(name) or {}).get("select") or {}).get("name")
+
+    return {
+        "site": select_name("사이트"),
+        "difficulty": select_name("난이도"),
+        "problem_link": (properties.get("문제 링크") or {}).get("url"),
+        "submission_date": ((properties.get("제출 일자") or {}).get("date") or {}).get("start"),
+    }
+
+
+class ProblemCatalog:
+    """
+    Notion에 올린 문제 목록의 로컬 SQLite 사본 (통계/대시보드용, Notion을 조회하지 않음)
+    - problems: 제목, 사이트, 난이도, 문제 링크, 제출 일자, 언어, 코드 크기, 페이지 ID, 내용 해시
+    - solutions: 문제별 풀이 파일 (언어, 크기)
+    - 동기화가 페이지를 만들거나 수정할 때마다 갱신하고, 제목 인덱스와 페이지 ID 기준으로 맞춤 (이름 변경, 삭제 반영)
+    - 제목으로 `in` 검사를 할 수 있으므로 중복 검사용 목록으로도 사용 가능
+    """
+
+    def __init__(self, path=PROBLEM_CATALOG_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")  # 언제든 다시 만들 수 있는 사본이므로 커밋마다 fsync하지 않음
+        self._conn.executescript(
+            "CREATE TABLE IF NOT EXISTS problems ("
+            " title TEXT PRIMARY KEY,"
+            " page_id TEXT,"
+            " site TEXT,"
+            " difficulty TEXT,"
+            " problem_link TEXT,"
+            " submission_date TEXT,"
+            " languages TEXT,"
+            " code_files INTEGER NOT NULL DEFAULT 0,"
+            " code_bytes INTEGER NOT NULL DEFAULT 0,"
+            " content_hash TEXT,"
+            " updated_at REAL NOT NULL);"
+            "CREATE INDEX IF NOT EXISTS idx_problems_page_id ON problems (page_id);"
+            "CREATE INDEX IF NOT EXISTS idx_problems_site ON problems (site);"
+            "CREATE INDEX IF NOT EXISTS idx_problems_difficulty ON problems (difficulty);"
+            "CREATE INDEX IF NOT EXISTS idx_problems_submission_date ON problems (submission_date);"
+            "CREATE TABLE IF NOT EXISTS solutions ("
+            " title TEXT NOT NULL,"
+            " filename TEXT NOT NULL,"
+            " language TEXT NOT NULL,"
+            " bytes INTEGER NOT NULL,"
+            " PRIMARY KEY (title, filename));"
+            "CREATE INDEX IF NOT EXISTS idx_solutions_language ON solutions (language);"
+        )
+        self._conn.commit()
+
+    def __contains__(self, title):
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM problems WHERE title = ?", (title,)).fetchone() is not None
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM problems").fetchone()[0]
+
+    def needs_details(self, title):
+        """속성이나 풀이 파일 정보가 아직 없는 문제인지 (인덱스로만 추가된 행 등)"""
+        with self._lock:
+            row = self._conn.execute("SELECT site, code_files FROM problems WHERE title = ?", (title,)).fetchone()
+        return row is None or row["site"] is None or row["code_files"] == 0
+
+    def get(self, title):
+        """문제 하나의 dict (풀이 파일 목록 포함, 없으면 None)"""
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM problems WHERE title = ?", (title,)).fetchone()
+            solutions = self._conn.execute(
+                "SELECT filename, language, bytes FROM solutions WHERE title = ? ORDER BY filename", (title,)
+            ).fetchall()
+        if row is None:
+            return None
+        return {**self._row_dict(row), "solutions": [dict(solution) for solution in solutions]}
+
+    @staticmethod
+    def _row_dict(row):
+        problem = dict(row)
+        problem["languages"] = problem["languages"].split(",") if problem["languages"] else []
+        problem["content_hash"] = json.loads(problem["content_hash"]) if problem["content_hash"] else None
+        return problem
+
+    def record(self, title, page_id, data, content_hash, difficulty=None):
+        """
+        동기화한 문제 데이터(main.load_problem_data 형식)로 문제와 풀이 파일 기록
+        - difficulty: Notion에 실제로 저장된 난이도 (스키마에 없어 "Unknown"으로 바뀐 경우), 없으면 data의 값
+        """
+        solutions = [
+            (title, block["filename"], block["language"], len(block["content"].encode("utf-8")))
+            for block in data["code_blocks"]
+        ]
+        languages = ",".join(sorted({solution[2] for solution in solutions}))
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO problems (title, page_id, site, difficulty, problem_link, submission_date,"
+                " languages, code_files, code_bytes, content_hash, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (title, page_id, data["site_name"], difficulty or data["difficulty"], data["problem_link"],
+                 data["submission_date"], languages, len(solutions), sum(solution[3] for solution in solutions),
+                 json.dumps(content_hash) if content_hash else None, time.time()),
+            )
+            self._conn.execute("DELETE FROM solutions WHERE title = ?", (title,))
+            self._conn.executemany("INSERT INTO solutions (title, filename, language, bytes) VALUES (?, ?, ?, ?)", solutions)
+            self._conn.commit()
+
+    def record_properties(self, title, page_id, properties):
+        """Notion 페이지 속성만으로 문제 기록 (풀이 파일 정보는 기존 값 유지)"""
+        values = _property_values(properties)
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO problems (title, page_id, site, difficulty, problem_link, submission_date, updated_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)"
+                " ON CONFLICT (title) DO UPDATE SET page_id = excluded.page_id, site = excluded.site,"
+                " difficulty = excluded.difficulty, problem_link = excluded.problem_link,"
+                " submission_date = excluded.submission_date, updated_at = excluded.updated_at",
+                (title, page_id, values["site"], values["difficulty"], values["problem_link"], values["submission_date"], time.time()),
+            )
+            self._conn.commit()
+
+    def sync_with_index(self, title_index):
+        """
+        제목 인덱스(Notion 페이지 목록)에 맞춰 카탈로그를 정리하는 함수
+        - 제목이 바뀐 페이지는 같은 페이지 ID의 행 이름 변경, 인덱스에 없는 페이지(삭제/보관)는 제거
+        - 카탈로그에 없는 페이지는 제목과 페이지 ID만 추가 (속성은 rebuild로 채움)
+        - 반환값: (추가, 이름 변경, 삭제) 수
+        """
+        pages = {entry["id"]: title for title, entry in title_index.pages.items()}
+        added = renamed = removed = 0
+        with self._lock:
+            titles_by_id = {row[0]: row[1] for row in self._conn.execute("SELECT page_id, title FROM problems")}
+            for page_id, title in titles_by_id.items():
+                new_title = pages.get(page_id)
+                if new_title is None:
+                    self._conn.execute("DELETE FROM problems WHERE title = ?", (title,))
+                    self._conn.execute("DELETE FROM solutions WHERE title = ?", (title,))
+                    removed += 1
+                elif new_title != title:
+                    self._conn.execute("DELETE FROM problems WHERE title = ?", (new_title,))
+                    self._conn.execute("DELETE FROM solutions WHERE title = ?", (new_title,))
+                    self._conn.execute("UPDATE problems SET title = ? WHERE title = ?", (new_title, title))
+                    self._conn.execute("UPDATE solutions SET title = ? WHERE title = ?", (new_title, title))
+                    renamed += 1
+            for page_id, title in pages.items():
+                if page_id not in titles_by_id:
+                    cursor = self._conn.execute(
+                        "INSERT INTO problems (title, page_id, updated_at) VALUES (?, ?, ?)"
+                        " ON CONFLICT (title) DO UPDATE SET page_id = excluded.page_id",
+                        (title, page_id, time.time()),
+                    )
+                    added += cursor.rowcount
+            self._conn.commit()
+        if added or renamed or removed:
+            logger.info("🗂️ 문제 카탈로그 정리: 추가 %d개, 이름 변경 %d개, 삭제 %d개", added, renamed, removed)
+        return added, renamed, removed
+
+    def rebuild(self):
+        """
+        Notion 데이터베이스를 한 번 전체 조회하여 모든 페이지의 속성을 채우는 함수 (처음 만들 때 등, 성공 여부 반환)
+        - 풀이 파일 정보는 Notion 속성에 없으므로 동기화(--update 등)로 다시 올린 문제만 채워짐
+        """
+        pages = fetch_notion_database()
+        if pages is None:
+            return False
+        from title_index import get_page_title
+
+        seen = set()
+        for page in pages:
+            title = get_page_title(page)
+            if title is None or page.get("archived") or page.get("in_trash"):
+                continue
+            self.record_properties(title, page["id"], page.get("properties", {}))
+            seen.add(title)
+        with self._lock:
+            stale = [row[0] for row in self._conn.execute("SELECT title FROM problems") if row[0] not in seen]
+            self._conn.executemany("DELETE FROM problems WHERE title = ?", [(title,) for title in stale])
+            self._conn.executemany("DELETE FROM solutions WHERE title = ?", [(title,) for title in stale])
+            self._conn.commit()
+        logger.info("🗂️ 문제 카탈로그 재구축: %d개 (삭제 %d개)", len(seen), len(stale))
+        return True
+
+    def count_by(self, group):
+        """
+        기준별 문제 수 [(값, 문제 수)] (group: site / difficulty / month / language)
+        - language는 해당 언어의 풀이가 있는 문제 수, month는 오래된 달부터
+        """
+        column = _GROUP_COLUMNS[group]
+        source = "problems p JOIN solutions s ON s.title = p.title" if group == "language" else "problems p"
+        order = "value" if group == "month" else "count DESC, value"
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {column} AS value, COUNT(DISTINCT p.title) AS count FROM {source} GROUP BY value ORDER BY {order}"
+            ).fetchall()
+        return [(row["value"], row["count"]) for row in rows]
+
+    def find(self, site=None, difficulty=None, month=None, language=None, limit=None):
+        """조건에 맞는 문제 목록 (제출 일자 최신순)"""
+        conditions = []
+        params = []
+        for group, value in (("site", site), ("difficulty", difficulty), ("month", month)):
+            if value is not None:
+                conditions.append(f"{_GROUP_COLUMNS[group]} = ?")
+                params.append(value)
+        if language is not None:
+            conditions.append("p.title IN (SELECT title FROM solutions WHERE language = ?)")
+            params.append(language)
+        sql = "SELECT p.* FROM problems p"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY p.submission_date DESC"
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [self._row_dict(row) for row in rows]
+
+    def summary(self):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COUNT(*) AS problems, COUNT(site) AS with_properties, COALESCE(SUM(code_files), 0) AS code_files,"
+                " COALESCE(SUM(code_bytes), 0) AS code_bytes, MIN(submission_date) AS first_submission,"
+                " MAX(submission_date) AS last_submission FROM problems"
+            ).fetchone()
+        return dict(row)
+
+
+_catalog = None
+_catalog_lock = threading.Lock()
+
+# 실행 중 공유하는 문제 카탈로그 가져오기 (PROBLEM_CATALOG_PATH가 비어 있으면 비활성화)
+def get_problem_catalog():
+    global _catalog
+    with _catalog_lock:
+        if _catalog is None and PROBLEM_CATALOG_PATH:
+            _catalog = ProblemCatalog()
+    return _catalog
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="로컬 문제 카탈로그 조회 (Notion을 조회하지 않음)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    output = argparse.ArgumentParser(add_help=False)
+    output.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+
+    stats = subparsers.add_parser("stats", parents=[output], help="기준별 문제 수")
+    stats.add_argument("--by", choices=list(_GROUP_COLUMNS), default="site", help="집계 기준")
+
+    find = subparsers.add_parser("list", parents=[output], help="조건에 맞는 문제 목록")
+    find.add_argument("--site")
+    find.add_argument("--difficulty")
+    find.add_argument("--month", help="제출 월 (YYYY-MM, 한국 시간)")
+    find.add_argument("--language", help="풀이 언어 (Notion 코드 블록 언어, 예: python)")
+    find.add_argument("--limit", type=int)
+
+    subparsers.add_parser("summary", help="전체 문제 수, 풀이 파일 수/크기, 제출 기간")
+    subparsers.add_parser("rebuild", help="Notion 데이터베이스를 한 번 전체 조회하여 속성 채우기")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    logging.basicConfig(level=LOG_LEVEL, format="%(message)s")
+    catalog = ProblemCatalog()
+
+    if args.command == "rebuild":
+        result = catalog.rebuild()
+    elif args.command == "stats":
+        result = catalog.count_by(args.by)
+    elif args.command == "list":
+        result = catalog.find(args.site, args.difficulty, args.month, args.language, args.limit)
+    else:
+        result = catalog.summary()
+
+    if args.command in ("rebuild", "summary") or args.json:
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+    elif args.command == "stats":
+        for value, count in result:
+            print(f"{value or '-':<20} {count:6d}")
+    else:
+        for problem in result:
+            print(f"{(problem['submission_date'] or '-')[:10]}  {problem['site'] or '-':<10} {problem['difficulty'] or '-':<14} {problem['title']}")
@@ -0,0 +1,39 @@
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    스레드 안전한 토큰 버킷 레이트 리미터
+    - 초당 rate개의 토큰이 채워지고, 최대 capacity개까지 쌓임 (순간 버스트 허용량)
+    - acquire()는 토큰이 생길 때까지 대기
+    """
+
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1)
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self.acquired = 0
+        self.waited_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def acquire(self, tokens=1):
+        """토큰을 꺼낼 수 있을 때까지 대기한 뒤 꺼냄, 대기한 시간(초) 반환"""
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    self.acquired += tokens
+                    self.waited_seconds += waited
+                    return waited
+                delay = (tokens - self.tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
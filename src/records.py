@@ -0,0 +1,66 @@
+from dataclasses import dataclass, replace
+
+
+@dataclass(frozen=True, slots=True)
+class CommitRef:
+    """
+    커밋에서 동기화에 필요한 값만 남긴 기록 (API 응답의 author, verification, parents 등은 버림)
+    - files: 변경 파일 목록 [(경로, status)]을 이미 알고 있는 경우 (웹훅 페이로드), 모르면 None
+    """
+    sha: str
+    date: str
+    message: str
+    files: tuple = None
+
+    @classmethod
+    def from_api(cls, commit):
+        """GitHub REST API의 커밋 JSON에서 SHA, 커밋 시각, 메시지만 꺼냄"""
+        return cls(commit["sha"], commit["commit"]["committer"]["date"], commit["commit"]["message"])
+
+
+@dataclass(frozen=True, slots=True)
+class FileRef:
+    """커밋 시점의 파일 하나 (내용 대신 blob SHA만 유지, language는 코드 파일의 Notion 언어)"""
+    path: str
+    blob_sha: str
+    language: str = None
+
+
+@dataclass(frozen=True, slots=True)
+class ProblemFiles:
+    """커밋 하나에서 바뀐 문제 폴더의 설명 파일과 코드 파일"""
+    site_name: str
+    problem_name: str
+    readme: FileRef
+    code_files: tuple
+
+
+@dataclass(frozen=True, slots=True)
+class ProblemRecord:
+    """
+    업로드할 문제 하나 (문제별로 가장 최신 커밋의 설명 + 과거 커밋의 풀이까지 병합한 결과)
+    - 설명/코드 내용은 업로드 직전에 blob SHA로 캐시에서 읽음 (load_problem_data)
+    """
+    name: str
+    site_name: str
+    difficulty: str
+    commit_date: str
+    readme: FileRef
+    code_files: tuple
+
+    @classmethod
+    def from_files(cls, problem_files, difficulty, commit_date):
+        return cls(
+            problem_files.problem_name, problem_files.site_name, difficulty, commit_date,
+            problem_files.readme, problem_files.code_files,
+        )
+
+    def fingerprint(self):
+        """내용을 읽지 않고 비교할 수 있는 값 (같으면 업로드할 내용도 같음)"""
+        return (self.difficulty, self.site_name, self.readme.blob_sha, self.code_files)
+
+    def merge_older(self, older):
+        """과거 커밋의 풀이 중 같은 경로가 없는 파일만 뒤에 추가한 기록 반환"""
+        known_files = {file.path for file in self.code_files}
+        extra = tuple(file for file in older.code_files if file.path not in known_files)
+        return replace(self, code_files=self.code_files + extra) if extra else self
@@ -0,0 +1,64 @@
+import json
+import logging
+import os
+from datetime import datetime, timedelta, timezone
+from config import SYNC_STATE_PATH, SYNC_SINCE_MARGIN_DAYS
+
+logger = logging.getLogger(__name__)
+
+# 동기화 상태(마지막으로 처리한 커밋) 불러오기
+def load_sync_state(path=SYNC_STATE_PATH):
+    """
+    마지막으로 처리한 커밋 SHA와 커밋 시각을 불러오는 함수
+    - 상태 파일이 없거나 손상된 경우 빈 dict 반환 (전체 동기화)
+    """
+    if not os.path.exists(path):
+        return {}
+
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning("⚠️ 동기화 상태 파일을 읽을 수 없습니다. 전체 동기화를 진행합니다: %s", e)
+        return {}
+
+    if not state.get("last_commit_sha"):
+        return {}
+    return state
+
+
+# 동기화 상태 저장하기
+def save_sync_state(commit_sha, commit_date, path=SYNC_STATE_PATH):
+    """
+    가장 최근에 처리한 커밋 SHA와 커밋 시각을 저장하는 함수
+    - 임시 파일에 쓴 뒤 교체하여 중간에 종료되어도 상태 파일이 깨지지 않도록 함
+    """
+    state = {"last_commit_sha": commit_sha, "last_commit_date": commit_date}
+    tmp_path = f"{path}.tmp"
+
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+    logger.info("💾 동기화 상태 저장 완료: %s (%s)", commit_sha, commit_date)
+
+
+# 커밋 목록 조회 시작 시각
+def since_with_margin(commit_date, margin_days=SYNC_SINCE_MARGIN_DAYS):
+    """
+    마지막 동기화 커밋 시각에서 margin_days만큼 앞당긴 조회 시작 시각을 반환하는 함수 (기준점이 없으면 None)
+    - 리베이스나 늦게 병합된 브랜치처럼 나중에 push된 과거 날짜의 커밋도 목록에 포함되도록 함
+    - 목록은 마지막으로 처리한 커밋 SHA(stop_sha)를 만나면 중단하므로 실제로 더 읽는 커밋은 거의 없음
+    """
+    if not commit_date:
+        return None
+    since = datetime.fromisoformat(commit_date.replace("Z", "+00:00")) - timedelta(days=margin_days)
+    return since.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+# 동기화 상태 초기화 (--full)
+def reset_sync_state(path=SYNC_STATE_PATH):
+    """상태 파일을 삭제하여 다음 실행이 전체 커밋 기록을 다시 읽도록 하는 함수"""
+    if os.path.exists(path):
+        os.remove(path)
+        logger.info("🧹 동기화 상태를 초기화했습니다.")
@@ -0,0 +1,157 @@
+import json
+import logging
+import os
+import threading
+from config import TITLE_INDEX_PATH, TITLE_INDEX_FULL_SYNC_EVERY
+from notion_api import fetch_notion_database
+from problem_catalog import get_problem_catalog
+
+logger = logging.getLogger(__name__)
+
+
+def get_page_title(page):
+    """페이지의 "문제 제목" 속성을 문자열로 반환 (제목이 비어 있으면 None)"""
+    title_property = page.get("properties", {}).get("문제 제목", {}).get("title", [])
+    title = "".join(part.get("plain_text") or part.get("text", {}).get("content", "") for part in title_property)
+    return title or None
+
+
+class TitleIndex:
+    """
+    Notion 페이지 제목 → {페이지 ID, last_edited_time} 로컬 인덱스
+    - 로컬 파일에 저장해 두고, 실행할 때마다 마지막 동기화 이후 수정된 페이지만 조회
+    - 제목 속성만 받아오므로 (filter_properties) 전체 페이지를 받는 것보다 가벼움
+    - 중복 검사는 로컬 dict 조회 (O(1))
+    - 업데이트 모드용으로 페이지별 내용 해시(content_hash)도 함께 저장
+    - 삭제/보관된 페이지는 변경분 조회에 나오지 않으므로 full_sync_every번 실행마다 전체 페이지 ID와 대조해 제거
+    """
+
+    def __init__(self, path=TITLE_INDEX_PATH, full_sync_every=TITLE_INDEX_FULL_SYNC_EVERY):
+        self.path = path
+        self.full_sync_every = full_sync_every
+        self.pages = {}
+        self.synced_at = None
+        self.runs_since_full = 0
+        self._lock = threading.Lock()
+
+    def __contains__(self, title):
+        return title in self.pages
+
+    def __len__(self):
+        return len(self.pages)
+
+    def get(self, title):
+        return self.pages.get(title)
+
+    def snapshot(self):
+        """현재 제목 목록의 고정된 사본 (업로드 중에 추가되는 제목의 영향을 받지 않는 중복 검사용)"""
+        with self._lock:
+            return frozenset(self.pages)
+
+    def record(self, title, page_id, content_hash):
+        """업로드/수정한 페이지의 ID와 내용 해시 기록 (쓰기 워커 여러 개가 동시에 호출)"""
+        with self._lock:
+            entry = self.pages.setdefault(title, {"id": page_id, "last_edited_time": None})
+            entry["id"] = page_id
+            entry["content_hash"] = content_hash
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning("⚠️ 제목 인덱스 파일을 읽을 수 없습니다. 전체를 다시 조회합니다: %s", e)
+            return
+        self.pages = data.get("pages", {})
+        self.synced_at = data.get("synced_at")
+        self.runs_since_full = data.get("runs_since_full", 0)
+
+    def save(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {"synced_at": self.synced_at, "runs_since_full": self.runs_since_full, "pages": self.pages},
+                f, ensure_ascii=False,
+            )
+        os.replace(tmp_path, self.path)
+
+    def refresh(self, full=False):
+        """
+        마지막 동기화 이후 수정된 페이지만 조회하여 인덱스를 갱신하는 함수
+        - full=True 이면 인덱스를 비우고 전체 페이지를 다시 조회
+        - full_sync_every번째 실행마다 전체 페이지를 조회해 대조 (조회되지 않은 페이지 ID는 삭제/보관된 것으로 보고 제거, 내용 해시는 유지)
+        """
+        if full:
+            self.pages = {}
+            self.synced_at = None
+        reconcile = bool(self.pages) and 0 < self.full_sync_every <= self.runs_since_full + 1
+        full_query = reconcile or not self.synced_at
+
+        query_filter = None
+        if not full_query:
+            # ✅ Notion의 last_edited_time은 분 단위이므로 경계 시각을 포함하여 조회
+            query_filter = {"timestamp": "last_edited_time", "last_edited_time": {"on_or_after": self.synced_at}}
+
+        pages = fetch_notion_database(
+            query_filter=query_filter,
+            sorts=[{"timestamp": "last_edited_time", "direction": "ascending"}],
+            filter_properties=["title"],
+        )
+        if pages is None:
+            return False
+
+        titles_by_id = {entry["id"]: title for title, entry in self.pages.items()}
+        for page in pages:
+            # ✅ 제목이 바뀐 페이지는 이전 제목 항목 제거 (내용 해시는 같은 페이지면 유지)
+            old_title = titles_by_id.pop(page["id"], None)
+            old_entry = self.pages.pop(old_title, None) if old_title is not None else None
+
+            if self.synced_at is None or page["last_edited_time"] > self.synced_at:
+                self.synced_at = page["last_edited_time"]
+
+            title = get_page_title(page)
+            if title is None:
+                continue  # 제목이 비어 있는 페이지
+
+            self.pages[title] = {"id": page["id"], "last_edited_time": page["last_edited_time"]}
+            if old_entry and old_entry.get("content_hash"):
+                self.pages[title]["content_hash"] = old_entry["content_hash"]
+            titles_by_id[page["id"]] = title
+
+        if full_query:
+            self.runs_since_full = 0
+        else:
+            self.runs_since_full += 1
+
+        if reconcile:
+            # ✅ 전체 조회에 나오지 않은 페이지 (Notion 조회는 삭제/보관된 페이지를 반환하지 않음)
+            seen_ids = {page["id"] for page in pages}
+            removed = [title for title, entry in self.pages.items() if entry["id"] not in seen_ids]
+            for title in removed:
+                del self.pages[title]
+            logger.info("📌 제목 인덱스 전체 대조: 페이지 %d개, 삭제된 페이지 %d개 제거", len(self.pages), len(removed))
+            return True
+
+        logger.info("📌 제목 인덱스 갱신: 변경된 페이지 %d개, 전체 %d개", len(pages), len(self.pages))
+        return True
+
+
+# 로컬 제목 인덱스 불러오기 + 갱신 (Notion 조회 실패 시 None)
+def load_title_index(full=False):
+    index = TitleIndex()
+    if not full:
+        index.load()
+    if not index.refresh(full=full):
+        return None
+    index.save()
+
+    # ✅ 문제 카탈로그도 Notion 페이지 목록에 맞춰 정리 (이름 변경, 삭제 반영)
+    catalog = get_problem_catalog()
+    if catalog is not None:
+        catalog.sync_with_index(index)
+    return index
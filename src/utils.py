@@ -1,7 +1,6 @@
-from bs4 import BeautifulSoup
 import re
-import markdown
 from datetime import datetime, timedelta
+from metrics import metrics
 
 # 문제 제목이나 커밋 메시지에서 난이도를 추출하는 함수
 def extract_difficulty(text):
@@ -12,163 +11,46 @@ def extract_difficulty(text):
 def split_text_into_blocks(text, max_length=2000):
     return [text[i:i + max_length] for i in range(0, len(text), max_length)]
 
+# ✅ build_code_blocks 결과가 달라지는 수정을 하면 올려야 하는 버전 (변환 결과 캐시 키에 포함)
+CODE_BLOCKS_VERSION = 1
+
+# 긴 코드를 가능한 적은 수의 Notion 코드 블록으로 변환하는 함수
+@metrics.timed("code_blocks")
+def build_code_blocks(text, language, max_length=2000, max_segments=100, max_bytes=None):
+    """
+    코드 블록 하나에 rich_text 조각(2000자 이하)을 최대 100개까지 담아 블록 수를 줄이는 함수
+    - 조각 수가 max_segments를 넘거나 블록 크기(UTF-8)가 max_bytes를 넘을 때만 다음 블록으로 나눔
+    """
+    code_blocks = []
+    segments = []
+    size = 0
+    for chunk in split_text_into_blocks(text, max_length):
+        chunk_size = len(chunk.encode("utf-8"))
+        if segments and (len(segments) >= max_segments or (max_bytes and size + chunk_size > max_bytes)):
+            code_blocks.append(segments)
+            segments = []
+            size = 0
+        segments.append({"text": {"content": chunk}})
+        size += chunk_size
+    if segments:
+        code_blocks.append(segments)
+
+    return [
+        {
+            "object": "block",
+            "type": "code",
+            "code": {
+                "rich_text": rich_text,
+                "language": language
+            }
+        }
+        for rich_text in code_blocks
+    ]
+
 # repo 파일에서 사이트명 추출
 def extract_site_name_from_path(filename):
     return filename.split("/")[0] if "/" in filename else "Unknown"
 
-# markdown text를 Notion 본문에 입력하기위해 변환하는 함수
-def convert_markdown_to_notion_blocks(markdown_text):
-    """Markdown과 HTML을 Notion 블록 형식으로 변환"""
-    # ✅ Markdown을 HTML로 변환
-    html_text = markdown.markdown(markdown_text)
-
-    # ✅ BeautifulSoup으로 HTML 파싱
-    soup = BeautifulSoup(html_text, "html.parser")
-    notion_blocks = []
-
-    for element in soup.children:  # ✅ 모든 최상위 요소만 순회 (중복 방지)
-        if element.name == "h1":  # 제목 (h1)
-            notion_blocks.append({
-                "object": "block",
-                "type": "heading_1",
-                "heading_1": {
-                    "rich_text": [{"text": {"content": element.get_text()}}]
-                }
-            })
-        elif element.name == "h2":  # 제목 (h2)
-            notion_blocks.append({
-                "object": "block",
-                "type": "heading_2",
-                "heading_2": {
-                    "rich_text": [{"text": {"content": element.get_text()}}]
-                }
-            })
-        elif element.name == "h3":  # 제목 (h3)
-            notion_blocks.append({
-                "object": "block",
-                "type": "heading_3",
-                "heading_3": {
-                    "rich_text": [{"text": {"content": element.get_text()}}]
-                }
-            })
-        elif element.name == "p":  # ✅ `<p>` 내부에 `img` 태그가 있는 경우도 포함
-            img_tags = element.find_all("img")
-            text_content = element.get_text(strip=True)
-
-            if img_tags:  # ✅ `<p>` 안에 `img` 태그가 있을 경우
-                if text_content:  # ✅ `<p>` 안에 텍스트가 있는 경우 먼저 텍스트 추가
-                    notion_blocks.append({
-                        "object": "block",
-                        "type": "paragraph",
-                        "paragraph": {
-                            "rich_text": [{"text": {"content": text_content}}]
-                        }
-                    })
-                for img in img_tags:
-                    img_src = img.get("src")
-                    img_alt = img.get("alt", "이미지")  # 대체 텍스트 기본값 설정
-
-                    if img_src.startswith("http"):  # Notion은 URL 이미지만 지원
-                        notion_blocks.append({
-                            "object": "block",
-                            "type": "image",
-                            "image": {
-                                "type": "external",
-                                "external": {"url": img_src}
-                            }
-                        })
-                        if img_alt:
-                            notion_blocks.append({
-                                "object": "block",
-                                "type": "paragraph",
-                                "paragraph": {
-                                    "rich_text": [{"text": {"content": img_alt}}]
-                                }
-                            })
-            else:  # ✅ 일반 단락 처리
-                if text_content:
-                    notion_blocks.append({
-                        "object": "block",
-                        "type": "paragraph",
-                        "paragraph": {
-                            "rich_text": [{"text": {"content": text_content}}]
-                        }
-                    })
-        elif element.name == "ul":  # 불릿 리스트
-            for li in element.find_all("li"):
-                notion_blocks.append({
-                    "object": "block",
-                    "type": "bulleted_list_item",
-                    "bulleted_list_item": {
-                        "rich_text": [{"text": {"content": li.get_text()}}]
-                    }
-                })
-        elif element.name == "ol":  # 번호 매긴 리스트
-            for idx, li in enumerate(element.find_all("li"), start=1):
-                notion_blocks.append({
-                    "object": "block",
-                    "type": "numbered_list_item",
-                    "numbered_list_item": {
-                        "rich_text": [{"text": {"content": f"{idx}. {li.get_text()}"}}]
-                    }
-                })
-        elif element.name == "table":  # 테이블 변환 (Notion API에서 테이블 지원 안 함 → 리스트 형태로 변환)
-            rows = element.find_all("tr")
-            for row in rows:
-                cols = row.find_all("td")
-                row_text = " | ".join([col.get_text() for col in cols])
-                notion_blocks.append({
-                    "object": "block",
-                    "type": "paragraph",
-                    "paragraph": {
-                        "rich_text": [{"text": {"content": row_text}}]
-                    }
-                })
-        elif element.name == "code":  # 코드 블록
-            code_content = element.get_text()
-            notion_blocks.append({
-                "object": "block",
-                "type": "code",
-                "code": {
-                    "rich_text": [{"text": {"content": code_content}}],
-                    "language": "java"  # 언어 감지 추가 가능
-                }
-            })
-        elif element.name == "img":  # ✅ 단독 이미지 변환
-            img_src = element.get("src")
-            img_alt = element.get("alt", "이미지")  # 대체 텍스트 기본값 설정
-
-            if img_src.startswith("http"):  # Notion은 URL 이미지만 지원
-                notion_blocks.append({
-                    "object": "block",
-                    "type": "image",
-                    "image": {
-                        "type": "external",
-                        "external": {"url": img_src}
-                    }
-                })
-                if img_alt:
-                    notion_blocks.append({
-                        "object": "block",
-                        "type": "paragraph",
-                        "paragraph": {
-                            "rich_text": [{"text": {"content": img_alt}}]
-                        }
-                    })
-        elif element.name is None:  # ✅ 일반 텍스트 처리
-            text = element.strip()
-            if text:
-                notion_blocks.append({
-                    "object": "block",
-                    "type": "paragraph",
-                    "paragraph": {
-                        "rich_text": [{"text": {"content": text}}]
-                    }
-                })
-
-    return notion_blocks
-
-
 # content 에서 추출한 markdown text에서 문제 링크 추출하는 함수
 def extract_problem_link(markdown_text):
     """
@@ -0,0 +1,242 @@
+import argparse
+import hashlib
+import hmac
+import itertools
+import json
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from commit_source import iter_commits
+from main import configure_logging, iter_latest_problems, resume_unfinished_jobs, upload_to_notion, write_run_report
+from records import CommitRef
+from sync_state import load_sync_state, save_sync_state, since_with_margin
+from title_index import load_title_index
+from config import WEBHOOK_SECRET, WEBHOOK_HOST, WEBHOOK_PORT, WEBHOOK_BRANCH, WEBHOOK_DEBOUNCE_SECONDS, LOG_LEVEL
+
+logger = logging.getLogger(__name__)
+
+
+def verify_signature(secret, body, signature_header):
+    """X-Hub-Signature-256 헤더("sha256=<hex>")가 본문의 HMAC-SHA256과 일치하는지 확인"""
+    if not signature_header or not signature_header.startswith("sha256="):
+        return False
+    expected = hmac.new(secret.encode("utf-8"), body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, signature_header[len("sha256="):])
+
+
+def _to_utc(timestamp):
+    """웹훅의 커밋 시각(예: 2025-01-31T21:15:03+09:00)을 REST API와 같은 UTC 형식으로 변환"""
+    return datetime.fromisoformat(timestamp.replace("Z", "+00:00")).astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def commits_from_push(payload):
+    """
+    push 이벤트의 commits[]를 CommitRef로 변환하는 함수
+    - 변경 파일 목록(added + modified)을 페이로드에서 바로 담아 두므로 get_commit_files를 호출하지 않음 (삭제된 파일은 제외)
+    """
+    commits = []
+    for commit in payload.get("commits", []):
+        files = [(path, "added") for path in commit.get("added", [])] + [(path, "modified") for path in commit.get("modified", [])]
+        commits.append(CommitRef(commit["id"], _to_utc(commit["timestamp"]), commit["message"], tuple(files)))
+    return commits
+
+
+def chain_head(last_sha, pushes):
+    """
+    저장된 기준점부터 push들의 before → after가 끊김 없이 이어지면 마지막 after를 반환하는 함수 (아니면 None)
+    - pushes: [(before, after)] (도착 순서와 상관없이 이어 붙임)
+    """
+    head = last_sha
+    remaining = list(pushes)
+    while remaining:
+        push = next((push for push in remaining if push[0] == head), None)
+        if push is None:
+            return None
+        remaining.remove(push)
+        head = push[1]
+    return head
+
+
+def process_push_commits(commits, pushes=(), update=False):
+    """
+    모아 둔 push 커밋을 배치 동기화와 같은 흐름으로 처리하는 함수
+    - commits: 최신순 커밋 목록, pushes: 배치에 포함된 push의 (before, after) 목록
+    - push가 저장된 기준점(last_commit_sha)에서 이어지지 않으면 (서버가 멈춘 동안의 push, 처리에 실패한 배치, 강제 push)
+      기준점부터 커밋 목록을 다시 조회해 처리 (놓친 커밋을 건너뛰고 기준점을 옮기지 않음)
+    - 조회나 업로드에 실패한 내용이 있으면 기준점을 옮기지 않음 (다음 push나 배치 실행에서 기준점부터 다시 처리)
+    """
+    existing_titles = load_title_index()
+    if existing_titles is None:
+        logger.error("❌ Notion 문제 목록을 가져오지 못해 이번 push 처리를 건너뜁니다.")
+        return False
+
+    resume_unfinished_jobs(existing_titles)
+
+    sync_state = load_sync_state()
+    last_sha = sync_state.get("last_commit_sha")
+    head = chain_head(last_sha, pushes)
+    newest_commit = next((commit for commit in commits if commit.sha == head), None) if head else None
+    errors = []
+    if last_sha is None:
+        # ✅ 기준점이 없으면 이전 커밋은 배치 실행(main.py)이 처리하도록 push 커밋만 처리하고 기준점은 저장하지 않음
+        logger.warning("⚠️ 동기화 기준점이 없어 push 커밋만 처리합니다. 전체 동기화는 main.py로 실행하세요.")
+    elif newest_commit is None:
+        logger.warning("⚠️ push가 마지막 동기화 커밋(%s)에서 이어지지 않아 그 이후 커밋을 다시 조회합니다.", last_sha)
+        fetched = iter_commits(
+            since=since_with_margin(sync_state.get("last_commit_date")), stop_sha=last_sha, errors=errors,
+        )
+        newest_commit = next(fetched, None)
+        if newest_commit is None:
+            if errors:
+                logger.error("❌ GitHub에서 커밋 목록을 가져오지 못했습니다.")
+                return False
+            logger.info("⚠️ GitHub에서 가져올 커밋이 없습니다.")
+            return True
+        commits = itertools.chain([newest_commit], fetched)
+
+    skip_titles = frozenset() if update else existing_titles.snapshot()
+    problems = iter_latest_problems(commits, skip_titles, errors=errors, whole_folder=update)
+    stats = upload_to_notion(problems, existing_titles, update=update)
+
+    # ✅ 이후 배치 실행(main.py)이 같은 커밋을 다시 처리하지 않도록 기준점 갱신
+    if errors or stats["failed"]:
+        logger.warning(
+            "⚠️ 조회 실패 %d건, 업로드 실패 %d건이 있어 동기화 기준점을 옮기지 않습니다.", len(errors), stats["failed"],
+        )
+    elif newest_commit is not None:
+        save_sync_state(newest_commit.sha, newest_commit.date)
+
+    # ✅ 서버 실행 이후 누적된 지표로 실행 보고서 갱신
+    write_run_report()
+    return True
+
+
+class PushBatcher:
+    """
+    연속으로 들어오는 push를 모아서 한 번에 처리하는 디바운서
+    - 마지막 push 이후 debounce초 동안 새 push가 없으면 모인 커밋을 처리
+    - 처리는 스레드 하나에서 순서대로 실행 (배치끼리 동시에 같은 페이지를 수정하지 않음)
+    - process(커밋 목록, [(before, after)])로 push별 이전/이후 커밋도 함께 전달 (기준점에서 이어지는지 확인용)
+    """
+
+    def __init__(self, process, debounce=WEBHOOK_DEBOUNCE_SECONDS):
+        self.process = process
+        self.debounce = debounce
+        self._pending = {}
+        self._pushes = []
+        self._last_event_at = None
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(target=self._worker, name="push-batcher", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def add(self, commits, before=None, after=None):
+        """push 하나의 커밋 추가 (같은 커밋이 여러 push에 포함되어도 한 번만 처리)"""
+        with self._condition:
+            for commit in commits:
+                self._pending[commit.sha] = commit
+            self._pushes.append((before, after))
+            self._last_event_at = time.monotonic()
+            self._condition.notify()
+
+    def _take_batch(self):
+        with self._condition:
+            while True:
+                if self._pending:
+                    remaining = self._last_event_at + self.debounce - time.monotonic()
+                    if remaining <= 0:
+                        batch = sorted(self._pending.values(), key=lambda c: c.date, reverse=True)
+                        pushes = self._pushes
+                        self._pending = {}
+                        self._pushes = []
+                        return batch, pushes
+                    self._condition.wait(remaining)
+                else:
+                    self._condition.wait()
+
+    def _worker(self):
+        while True:
+            batch, pushes = self._take_batch()
+            logger.info("📬 push 커밋 %d개를 처리합니다.", len(batch))
+            try:
+                self.process(batch, pushes)
+            except Exception as e:  # 배치 하나의 실패로 서버가 멈추지 않도록 함
+                logger.exception("❌ push 처리 실패: %s", e)
+
+
+def make_handler(batcher, secret=WEBHOOK_SECRET, branch=WEBHOOK_BRANCH):
+    class WebhookHandler(BaseHTTPRequestHandler):
+        def _reply(self, status, message):
+            body = message.encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "text/plain; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            if not verify_signature(secret, body, self.headers.get("X-Hub-Signature-256")):
+                logger.warning("⚠️ 서명이 올바르지 않은 웹훅 요청을 거부했습니다.")
+                return self._reply(401, "invalid signature")
+
+            event = self.headers.get("X-GitHub-Event")
+            if event == "ping":
+                return self._reply(200, "pong")
+            if event != "push":
+                return self._reply(202, f"ignored event: {event}")
+
+            try:
+                payload = json.loads(body)
+            except ValueError:
+                return self._reply(400, "invalid json")
+            if payload.get("ref") != f"refs/heads/{branch}" or payload.get("deleted"):
+                return self._reply(202, f"ignored ref: {payload.get('ref')}")
+
+            commits = commits_from_push(payload)
+            batcher.add(commits, before=payload.get("before"), after=payload.get("after"))
+            logger.info("📥 push 수신: 커밋 %d개 (대기 후 처리)", len(commits))
+            return self._reply(202, "queued")
+
+        def log_message(self, format, *args):
+            pass  # 요청마다 기본 로그를 출력하지 않음
+
+    return WebhookHandler
+
+
+def serve(update=False, host=WEBHOOK_HOST, port=WEBHOOK_PORT):
+    """
+    GitHub push 웹훅을 받아 변경된 문제만 동기화하는 HTTP 서버 실행
+    - 로컬 테스트: 저장해 둔 push 페이로드에 서명 헤더를 붙여 POST
+      (X-GitHub-Event: push, X-Hub-Signature-256: sha256=<WEBHOOK_SECRET으로 만든 HMAC>)
+    """
+    if not WEBHOOK_SECRET:
+        logger.error("❌ WEBHOOK_SECRET이 설정되지 않아 웹훅 서버를 시작하지 않습니다.")
+        return
+
+    batcher = PushBatcher(lambda commits, pushes: process_push_commits(commits, pushes, update=update))
+    batcher.start()
+    server = ThreadingHTTPServer((host, port), make_handler(batcher))
+    logger.info("🌐 웹훅 서버 시작: http://%s:%s (브랜치 %s, 대기 %.0f초)", host, port, WEBHOOK_BRANCH, batcher.debounce)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("🛑 웹훅 서버를 종료합니다.")
+    finally:
+        server.server_close()
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="GitHub push 웹훅으로 알고리즘 풀이를 Notion에 동기화")
+    parser.add_argument("--update", action="store_true", help="이미 있는 문제도 내용이 바뀌었으면 해당 부분만 수정")
+    parser.add_argument("--log-level", default=LOG_LEVEL, choices=["DEBUG", "INFO", "WARNING", "ERROR"], help="출력할 로그 레벨")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    configure_logging(args.log_level)
+    serve(update=args.update)